@@ -1,34 +1,90 @@
 # app paketi başlatma dosyası
-from flask import Flask, jsonify, request, redirect
+from flask import Flask, Request, Response, g, jsonify, request, redirect, stream_with_context
 from flask_cors import CORS
 import os
-import json
+import re
+import hmac
+import uuid
+import hashlib
 import logging
+import tempfile
 import traceback
 from app.utils.transcript_processor import TranscriptProcessor
-from app.utils.ai_analyzer import AIAnalyzer
+from app.utils.ai_analyzer import get_analyzer
 from app.utils.test_generator import TestGenerator
-from app.utils.flalingo_service import FlalingoService
+from app.utils.exercise_pipeline import (
+    get_or_generate_exercise, generate_exercises, stream_exercise, pregenerate_exercise, combined_mode_enabled,
+    exercise_store_enabled, PipelineError, STAGES
+)
+from app.utils.job_queue import JobManager, JobQueueFull
+from app.utils.exercise_store import ExerciseStore
+from app.utils.gemini_governor import BACKGROUND, request_priority
+from app.utils.json_provider import FastJSONProvider
+from app.utils.metrics import REGISTRY, StageTimer
+from app.utils.logging_config import configure_logging, request_id_var
 from dotenv import load_dotenv
 
 # .env dosyasını yükle
 load_dotenv()
 
-# Loglama yapılandırması
-logging.basicConfig(level=logging.DEBUG)
+# Loglama yapılandırması (LOG_LEVEL, LOG_FORMAT, LOG_MAX_MESSAGE_CHARS, LOG_DEBUG_SAMPLE_RATE)
+configure_logging()
 logger = logging.getLogger(__name__)
 
+class SpooledUploadRequest(Request):
+    """
+    Yüklenen dosyaları eşik değerine kadar bellekte, üzerindeyse anonim geçici dosyada tutar.
+    """
+    spool_max_size = int(os.getenv("UPLOAD_SPOOL_MAX_SIZE", str(1024 * 1024)))
+    
+    def _get_file_stream(self, total_content_length, content_type, filename=None, content_length=None):
+        return tempfile.SpooledTemporaryFile(max_size=self.spool_max_size, mode='rb+')
+
 # Flask uygulamasını oluştur
 app = Flask(__name__)
+app.request_class = SpooledUploadRequest
+app.json = FastJSONProvider(app)
 app.secret_key = os.getenv("SECRET_KEY", "default_secret_key")
 app.config['MAX_CONTENT_LENGTH'] = 50 * 1024 * 1024
 
+# Arka plan egzersiz işleri için sınırlı iş havuzu; EXERCISE_STORE_PATH verilmişse iş
+# durumları depoda tutulur ve durum sorgusu her worker'dan yanıtlanır
+job_manager = JobManager(stages=STAGES, store=ExerciseStore.from_env())
+
+# Dışarıdan gelen X-Request-ID yalnızca güvenli karakterlerden oluşuyorsa kullanılır
+_REQUEST_ID_RE = re.compile(r'^[A-Za-z0-9._-]{1,64}$')
+
+@app.before_request
+def assign_request_id():
+    """Her isteğe loglarda görünecek bir istek kimliği atar."""
+    incoming = request.headers.get('X-Request-ID', '')
+    request_id = incoming if _REQUEST_ID_RE.match(incoming) else uuid.uuid4().hex
+    g.request_id = request_id
+    g.request_id_token = request_id_var.set(request_id)
+
+@app.after_request
+def add_request_id_header(response):
+    if 'request_id' in g:
+        response.headers['X-Request-ID'] = g.request_id
+    return response
+
+@app.teardown_request
+def reset_request_id(error=None):
+    token = g.pop('request_id_token', None)
+    if token is not None:
+        try:
+            request_id_var.reset(token)
+        except ValueError:
+            # Akış yanıtlarında teardown farklı bir bağlamda çalışabilir
+            request_id_var.set('-')
+
 # Configure CORS
 CORS(app, resources={
     r"/api/*": {
         "origins": ["https://exercise.flalingo.com"],
         "methods": ["GET", "POST", "OPTIONS"],
-        "allow_headers": ["Content-Type", "Authorization"]
+        "allow_headers": ["Content-Type", "Authorization", "X-Request-ID"],
+        "expose_headers": ["X-Request-ID"]
     }
 })
 
@@ -42,7 +98,14 @@ def index():
         'endpoints': {
             'GET /': 'This information',
             'GET /api/health': 'Health check endpoint',
-            'POST /api/upload': 'Upload and process transcript file'
+            'POST /api/upload': 'Upload and process transcript file',
+            'GET /api/flai-exercise': 'Generate exercise synchronously',
+            'POST /api/flai-exercise/jobs': 'Submit asynchronous exercise generation job',
+            'GET /api/flai-exercise/jobs/<job_id>': 'Poll exercise generation job status',
+            'GET /api/flai-exercise/stream': 'Stream exercise generation progress (Server-Sent Events)',
+            'POST /api/flai-exercise/batch': 'Generate exercises for many reports, streamed as NDJSON',
+            'POST /api/webhooks/lesson-ended': 'Pre-generate exercise when a lesson ends (Flalingo webhook)',
+            'GET /metrics': 'Prometheus metrics (per worker process)'
         },
         'documentation': {
             'upload_endpoint': {
@@ -50,7 +113,7 @@ def index():
                 'method': 'POST',
                 'content_type': 'multipart/form-data',
                 'parameters': {
-                    'transcript_file': 'File (txt or csv)'
+                    'transcript_file': 'File (txt, vtt or csv)'
                 },
                 'responses': {
                     'success': {
@@ -60,7 +123,7 @@ def index():
                             'data': {
                                 'analysis': 'Analysis result',
                                 'tests': 'Generated tests',
-                                'file_type': 'txt or csv'
+                                'file_type': 'txt, vtt or csv'
                             }
                         }
                     },
@@ -87,6 +150,8 @@ def health_check():
 @app.route('/api/upload', methods=['POST'])
 def upload_transcript():
     """Handle transcript file upload and processing."""
+    # Aşama süreleri flai_pipeline_stage_seconds{pipeline="upload"} metriğine yazılır
+    timer = StageTimer('upload')
     try:
         if 'transcript_file' not in request.files:
             return jsonify({
@@ -101,27 +166,35 @@ def upload_transcript():
                 'error': 'No file selected'
             }), 400
         
-        # Dosyayı geçici olarak kaydet
-        temp_file_path = os.path.join('temp', file.filename)
-        os.makedirs('temp', exist_ok=True)
-        file.save(temp_file_path)
+        # Transkripti diske yazmadan doğrudan yükleme akışından işle
+        timer.start('reading_upload')
+        processor = TranscriptProcessor.from_stream(file.stream, file.filename)
+        if processor.file_type is None:
+            return jsonify({
+                'success': False,
+                'error': 'Unsupported file type, expected .txt, .vtt or .csv'
+            }), 400
         
-        # Transkripti işle
-        processor = TranscriptProcessor(temp_file_path)
         if not processor.load_transcript():
             return jsonify({
                 'success': False,
                 'error': 'Failed to load transcript'
             }), 400
         
+        timer.start('processing_transcript')
         processed_data = processor.process_transcript()
         
         # Dosya uzantısına göre analiz metodu belirleme
-        analyzer = AIAnalyzer()
+        timer.start('analyzing')
+        analyzer = get_analyzer()
         
-        if temp_file_path.endswith('.txt'):
-            # Text dosyası için Zoom analizi yap
-            analysis_result = analyzer.analyze_zoom_transcript(processed_data)
+        if processor.file_type in ('txt', 'vtt'):
+            # Zoom metin/VTT dosyası için Zoom analizi yap
+            if combined_mode_enabled():
+                analysis_result, tests_result = analyzer.analyze_and_generate_zoom_tests(processed_data)
+            else:
+                analysis_result = analyzer.analyze_zoom_transcript(processed_data)
+                tests_result = None
             
             if not analysis_result.get('success', False):
                 return jsonify({
@@ -130,7 +203,9 @@ def upload_transcript():
                 }), 500
             
             # Zoom testleri oluştur
-            tests_result = analyzer.generate_zoom_tests(analysis_result, processed_data)
+            if tests_result is None:
+                timer.start('generating_tests')
+                tests_result = analyzer.generate_zoom_tests(analysis_result, processed_data)
         else:
             # CSV dosyası için normal analiz yap
             analysis_result = analyzer.analyze_transcript(processed_data)
@@ -143,9 +218,10 @@ def upload_transcript():
             
             # Test oluştur
             logger.debug("Testler oluşturuluyor...")
+            timer.start('generating_tests')
             tests_result = analyzer.generate_tests(analysis_result, processed_data)
         
-        logger.debug(f"Test sonucu: {tests_result}")
+        logger.debug("Test sonucu: %s", tests_result)
         
         if not tests_result.get('success', False):
             return jsonify({
@@ -154,10 +230,11 @@ def upload_transcript():
             }), 500
         
         # Test verilerini işle
+        timer.start('parsing_tests')
         test_generator = TestGenerator(tests_result.get('raw_tests', ''))
         test_generator.process_tests()  # Önce process_tests çağrılmalı
         processed_tests = test_generator.get_tests_as_json()  # Sonra JSON alınmalı
-        logger.debug(f"İşlenmiş testler (JSON): {processed_tests}")
+        logger.debug("İşlenmiş testler (JSON): %s", processed_tests)
         
         # Return results
         return jsonify({
@@ -165,12 +242,13 @@ def upload_transcript():
             'data': {
                 'analysis': analysis_result.get('raw_analysis', ''),
                 'tests': processed_tests,
-                'file_type': 'txt' if temp_file_path.endswith('.txt') else 'csv'
+                'file_type': processor.file_type,
+                'fallback': bool(tests_result.get('fallback', False))
             }
         })
     except Exception as e:
         # Hata detaylarını logla
-        logger.error(f"Error during upload process: {str(e)}")
+        logger.error("Error during upload process: %s", e)
         logger.error(traceback.format_exc())
         
         # Hata mesajını JSON olarak döndür
@@ -179,12 +257,12 @@ def upload_transcript():
             'error': f'Processing error: {str(e)}'
         }), 500
     finally:
-        # Cleanup temporary file
-        if 'temp_file_path' in locals() and os.path.exists(temp_file_path):
-            try:
-                os.remove(temp_file_path)
-            except Exception as e:
-                logger.error(f"Error removing temporary file: {str(e)}")
+        timer.stop()
+
+@app.route('/metrics', methods=['GET'])
+def metrics():
+    """Prometheus metin biçiminde uygulama metriklerini döndürür."""
+    return Response(REGISTRY.render(), content_type='text/plain; version=0.0.4; charset=utf-8')
 
 # Error handlers
 @app.errorhandler(400)
@@ -228,61 +306,223 @@ def get_exercise():
                 'error': 'auth_token ve flai_report parametreleri gerekli'
             }), 400
             
-        # Flalingo'dan transkript al
-        flalingo_service = FlalingoService()
-        transcript_response = flalingo_service.get_transcript(auth_token, flai_report)
-        
-        if not transcript_response.get('success', False):
-            return jsonify({
-                'success': False,
-                'error': transcript_response.get('error', 'Transkript alınamadı')
-            }), 500
-            
-        # Transkript verisini işle
-        transcript_data = transcript_response['data']
-        processor = TranscriptProcessor(transcript_data)
-        processed_data = processor.process_transcript()
-        
-        # AI analizi yap
-        analyzer = AIAnalyzer()
-        analysis_result = analyzer.analyze_zoom_transcript(processed_data)
-        
-        if not analysis_result.get('success', False):
-            return jsonify({
-                'success': False,
-                'error': 'Transkript analizi başarısız'
-            }), 500
-            
-        # Test oluştur
-        tests_result = analyzer.generate_zoom_tests(analysis_result, processed_data)
-        
-        if not tests_result.get('success', False):
-            return jsonify({
-                'success': False,
-                'error': 'Test oluşturma başarısız'
-            }), 500
-            
-        # Test verilerini işle (JSON formatı için)
-        test_generator = TestGenerator(tests_result.get('raw_tests', ''))
-        test_generator.process_tests()
-        processed_tests = test_generator.get_tests_as_json()  # Maksimum 10 soru
+        exercise = get_or_generate_exercise(auth_token, flai_report)
         
         return jsonify({
             'success': True,
-            'data': {
-                'analysis': analysis_result.get('raw_analysis', ''),
-                'tests': processed_tests
-            }
+            'data': exercise
         })
         
+    except PipelineError as e:
+        return jsonify({
+            'success': False,
+            'error': e.message
+        }), e.status_code
     except Exception as e:
-        logger.error(f"Exercise oluşturma sırasında hata: {str(e)}")
+        logger.error("Exercise oluşturma sırasında hata: %s", e)
         logger.error(traceback.format_exc())
         return jsonify({
             'success': False,
             'error': f'İşlem hatası: {str(e)}'
         }), 500
 
+def _format_sse(event: str, data) -> str:
+    """Server-Sent Events formatında tek bir olay oluşturur."""
+    return f"event: {event}\ndata: {app.json.dumps(data)}\n\n"
+
+@app.route('/api/flai-exercise/stream', methods=['GET'])
+def stream_exercise_events():
+    """
+    Egzersiz üretimini Server-Sent Events olarak akışa verir.
+    Her aşama bittiğinde ve her soru hazır olduğunda bir olay gönderilir.
+    """
+    auth_token = request.args.get('auth_token')
+    flai_report = request.args.get('flai_report')
+    
+    if not auth_token or not flai_report:
+        return jsonify({
+            'success': False,
+            'error': 'auth_token ve flai_report parametreleri gerekli'
+        }), 400
+    
+    def events():
+        try:
+            for event, data in stream_exercise(auth_token, flai_report):
+                yield _format_sse(event, data)
+        except PipelineError as e:
+            yield _format_sse('error', {'success': False, 'error': e.message})
+        except Exception as e:
+            logger.error("Exercise akışı sırasında hata: %s", e)
+            logger.error(traceback.format_exc())
+            yield _format_sse('error', {'success': False, 'error': f'İşlem hatası: {str(e)}'})
+    
+    return Response(stream_with_context(events()), mimetype='text/event-stream', headers={
+        'Cache-Control': 'no-cache',
+        'X-Accel-Buffering': 'no'
+    })
+
+@app.route('/api/flai-exercise/jobs', methods=['POST'])
+def submit_exercise_job():
+    """
+    Egzersiz üretimini arka plana alır ve hemen bir iş ID'si döndürür.
+    """
+    data = request.get_json(silent=True) or request.form
+    auth_token = data.get('auth_token')
+    flai_report = data.get('flai_report')
+    
+    if not auth_token or not flai_report:
+        return jsonify({
+            'success': False,
+            'error': 'auth_token ve flai_report parametreleri gerekli'
+        }), 400
+    
+    try:
+        # Arka plan işleri Gemini kuyruğunda etkileşimli isteklerin arkasında bekler
+        with request_priority(BACKGROUND):
+            job_id = job_manager.submit(get_or_generate_exercise, auth_token, flai_report)
+    except JobQueueFull as e:
+        logger.warning("Egzersiz işi reddedildi: %s", e)
+        return jsonify({
+            'success': False,
+            'error': 'Sunucu meşgul, lütfen daha sonra tekrar deneyin'
+        }), 503
+    
+    status_url = f'/api/flai-exercise/jobs/{job_id}'
+    return jsonify({
+        'success': True,
+        'data': {
+            'job_id': job_id,
+            'status': 'queued',
+            'status_url': status_url
+        }
+    }), 202, {'Location': status_url}
+
+@app.route('/api/flai-exercise/batch', methods=['POST'])
+def batch_exercises():
+    """
+    Birden fazla rapor için egzersiz üretir; her rapor bittiği anda sonucunu
+    NDJSON (satır başına bir JSON nesnesi) olarak akışa verir. Son satır özet içerir.
+    """
+    data = request.get_json(silent=True) or {}
+    auth_token = data.get('auth_token')
+    flai_reports = data.get('flai_reports')
+    
+    if not auth_token or not isinstance(flai_reports, list) or not flai_reports \
+            or not all(isinstance(report, str) and report for report in flai_reports):
+        return jsonify({
+            'success': False,
+            'error': 'auth_token ve flai_reports (rapor ID listesi) gerekli'
+        }), 400
+    
+    max_reports = int(os.getenv("BATCH_EXERCISE_MAX_REPORTS", "500"))
+    if len(flai_reports) > max_reports:
+        return jsonify({
+            'success': False,
+            'error': f'En fazla {max_reports} rapor gönderilebilir'
+        }), 413
+    
+    def lines():
+        succeeded = failed = 0
+        for result in generate_exercises(auth_token, flai_reports):
+            if result['success']:
+                succeeded += 1
+            else:
+                failed += 1
+            yield app.json.dumps(result) + "\n"
+        yield app.json.dumps({'summary': {'total': succeeded + failed, 'succeeded': succeeded,
+                                          'failed': failed}}) + "\n"
+    
+    return Response(stream_with_context(lines()), mimetype='application/x-ndjson', headers={
+        'Cache-Control': 'no-cache',
+        'X-Accel-Buffering': 'no'
+    })
+
+@app.route('/api/flai-exercise/jobs/<job_id>', methods=['GET'])
+def get_exercise_job(job_id):
+    """
+    Arka plandaki egzersiz işinin durumunu ve tamamlandıysa sonucunu döndürür.
+    """
+    job = job_manager.get(job_id)
+    if job is None:
+        return jsonify({
+            'success': False,
+            'error': 'İş bulunamadı'
+        }), 404
+    
+    return jsonify({
+        'success': True,
+        'data': job
+    })
+
+def _valid_webhook_signature(body: bytes, signature: str) -> bool:
+    """
+    Gövdenin LESSON_WEBHOOK_SECRET ile HMAC-SHA256 imzasını doğrular; gizli anahtar yoksa False döner.
+    
+    İmza X-Flalingo-Signature başlığında hex olarak ("sha256=" önekiyle veya öneksiz) gönderilir.
+    """
+    secret = os.getenv("LESSON_WEBHOOK_SECRET", "")
+    if not secret:
+        return False
+    expected = hmac.new(secret.encode('utf-8'), body, hashlib.sha256).hexdigest()
+    if signature.startswith('sha256='):
+        signature = signature[len('sha256='):]
+    return hmac.compare_digest(expected, signature)
+
+@app.route('/api/webhooks/lesson-ended', methods=['POST'])
+def lesson_ended_webhook():
+    """
+    Flalingo ders bittiğinde çağırır; egzersiz arka planda önceden üretilip saklanır.
+    Öğrenci egzersizi açtığında GET /api/flai-exercise sonucu depodan döndürür.
+    
+    Ücretli Gemini üretimini tetiklediğinden LESSON_WEBHOOK_SECRET ve EXERCISE_STORE_PATH
+    ayarlanmadıkça istekler reddedilir.
+    """
+    if not os.getenv("LESSON_WEBHOOK_SECRET") or not exercise_store_enabled():
+        logger.error("Ders bitiş bildirimi reddedildi: LESSON_WEBHOOK_SECRET ve EXERCISE_STORE_PATH "
+                     "ayarlanmalıdır")
+        return jsonify({
+            'success': False,
+            'error': 'Ders bitiş bildirimi yapılandırılmamış'
+        }), 503
+    
+    if not _valid_webhook_signature(request.get_data(), request.headers.get('X-Flalingo-Signature', '')):
+        logger.warning("Geçersiz imzalı ders bitiş bildirimi reddedildi")
+        return jsonify({
+            'success': False,
+            'error': 'Geçersiz imza'
+        }), 401
+    
+    data = request.get_json(silent=True) or {}
+    auth_token = data.get('auth_token')
+    flai_report = data.get('flai_report')
+    
+    if not auth_token or not flai_report:
+        return jsonify({
+            'success': False,
+            'error': 'auth_token ve flai_report parametreleri gerekli'
+        }), 400
+    
+    try:
+        with request_priority(BACKGROUND):
+            job_id = job_manager.submit(pregenerate_exercise, auth_token, flai_report)
+    except JobQueueFull as e:
+        logger.warning("Ders bitiş bildirimi kuyruğa alınamadı: %s", e)
+        return jsonify({
+            'success': False,
+            'error': 'Sunucu meşgul, lütfen daha sonra tekrar deneyin'
+        }), 503
+    
+    logger.info("Egzersiz ön üretimi kuyruğa alındı: %s", flai_report)
+    status_url = f'/api/flai-exercise/jobs/{job_id}'
+    return jsonify({
+        'success': True,
+        'data': {
+            'job_id': job_id,
+            'status': 'queued',
+            'status_url': status_url
+        }
+    }), 202
+
 @app.route('/api/flai-exercise-completion', methods=['POST'])
 def completion():
     """
@@ -328,7 +568,7 @@ def completion():
         })
         
     except Exception as e:
-        logger.error(f"Completion değerlendirme sırasında hata: {str(e)}")
+        logger.error("Completion değerlendirme sırasında hata: %s", e)
         return jsonify({
             'success': False,
             'error': str(e)
@@ -1,9 +1,18 @@
 import os
+import time
+import asyncio
 import logging
-import google.generativeai as genai
-from typing import Dict, List, Any
+import threading
+import contextvars
+from typing import Callable, Dict, List, Any, Iterator, Optional, Tuple
+from concurrent.futures import ThreadPoolExecutor
 from dotenv import load_dotenv
 import json
+from .llm_cache import LLMCache, get_llm_cache
+from .fake_gemini import FakeGenerativeModel, fake_model_enabled
+from .gemini_governor import GeminiGovernor, get_governor
+from .prompt_budget import compress_transcript, prompt_budget_tokens, select_speaker_samples
+from .metrics import GEMINI_CALLS, GEMINI_CALL_SECONDS, LLM_CACHE_HITS, SAMPLE_TEST_FALLBACKS
 
 # .env dosyasından API anahtarını yükle
 load_dotenv()
@@ -11,27 +20,213 @@ load_dotenv()
 # Loglama yapılandırması
 logger = logging.getLogger(__name__)
 
+# İstem şablonları değiştiğinde artırılmalıdır; eski önbellek kayıtlarını geçersiz kılar
+PROMPT_VERSION = "1"
+
+# Kullanılan Gemini modeli
+MODEL_NAME = 'gemini-1.5-flash'
+
+# Parçalı analizde parça başına karakter bütçesi ve en fazla parça sayısı
+ANALYSIS_CHUNK_CHARS = int(os.getenv("GEMINI_CHUNK_CHARS", "8000"))
+ANALYSIS_MAX_CHUNKS = int(os.getenv("GEMINI_MAX_CHUNKS", "8"))
+
+# Parça sonuçları birleştirilirken seviye olarak ele alınan alanlar
+LEVEL_KEYS = ('level', 'seviye')
+CEFR_LEVELS = ['A1', 'A2', 'B1', 'B2', 'C1', 'C2']
+
+def __getattr__(name: str) -> Any:
+    # ai_analyzer.genai erişimi, modülü açılışta yüklemeden korunur
+    if name == 'genai':
+        import google.generativeai as genai
+        return genai
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+# Parçaları eş zamanlı analiz eden iş parçacığı havuzu
+_chunk_executor = None
+_chunk_executor_lock = threading.Lock()
+
+def chunked_analysis_enabled() -> bool:
+    """
+    GEMINI_CHUNKED_ANALYSIS=1 ise uzun transkriptler kesilmek yerine parçalar halinde analiz edilir.
+    """
+    return os.getenv("GEMINI_CHUNKED_ANALYSIS", "0").lower() in ("1", "true", "yes")
+
+def _get_chunk_executor() -> ThreadPoolExecutor:
+    global _chunk_executor
+    if _chunk_executor is None:
+        with _chunk_executor_lock:
+            if _chunk_executor is None:
+                _chunk_executor = ThreadPoolExecutor(
+                    max_workers=int(os.getenv("GEMINI_CHUNK_WORKERS", str(ANALYSIS_MAX_CHUNKS))),
+                    thread_name_prefix='gemini-chunk'
+                )
+    return _chunk_executor
+
 class AIAnalyzer:
     """
     Transkriptleri analiz etmek ve testler oluşturmak için yapay zeka kullanır.
     """
     
-    def __init__(self):
+    def __init__(self, cache: Optional[LLMCache] = None, model: Any = None,
+                 governor: Optional[GeminiGovernor] = None):
         """
         AIAnalyzer sınıfını başlatır ve Gemini API'yi yapılandırır.
+        
+        İstek başına yeni bir nesne oluşturmak yerine süreç genelinde paylaşılan
+        get_analyzer() kullanılmalıdır.
+        
+        Args:
+            cache (LLMCache, optional): Yanıt önbelleği; verilmezse paylaşılan önbellek kullanılır
+            model (Any, optional): Hazır model nesnesi; verilirse Gemini yapılandırılmaz.
+                Verilmezse ve GEMINI_FAKE=1 ise FakeGenerativeModel kullanılır
+            governor (GeminiGovernor, optional): Çağrı sınırlayıcı; verilmezse paylaşılan düzenleyici kullanılır
+        """
+        self.model_name = MODEL_NAME
+        
+        if model is not None:
+            self.model = model
+        elif fake_model_enabled():
+            # Yerel yük testleri için ağ erişimi olmayan sahte model
+            self.model = FakeGenerativeModel.from_env()
+        else:
+            api_key = os.getenv("GEMINI_API_KEY")
+            if not api_key:
+                logger.error("GEMINI_API_KEY bulunamadı. Lütfen .env dosyasını kontrol edin.")
+                raise ValueError("GEMINI_API_KEY bulunamadı. Lütfen .env dosyasını kontrol edin.")
+            
+            # google.generativeai ağır bir modüldür (~300 ms); yalnızca gerçek model gerektiğinde yüklenir
+            import google.generativeai as genai
+            
+            # Gemini API'yi yapılandır
+            logger.debug("Gemini API yapılandırılıyor. API anahtarı: %s...", api_key[:5])
+            genai.configure(api_key=api_key)
+            
+            # Gemini modeli
+            self.model = genai.GenerativeModel(self.model_name)
+            logger.debug("Gemini modeli oluşturuldu: %s", self.model_name)
+        
+        # Aynı istemler için yanıt önbelleği
+        self.cache = cache if cache is not None else get_llm_cache()
+        
+        # Gemini çağrılarının hızını ve eş zamanlılığını sınırlayan düzenleyici
+        self.governor = governor if governor is not None else get_governor()
+    
+    def _generate_text(self, prompt: str, validate: Optional[Callable[[str], Any]] = None) -> str:
+        """
+        İstemi modele gönderir ve yanıt metnini döndürür.
+        
+        Aynı istem (boşluk farkları hariç), model ve şablon sürümü için önbellekteki
+        yanıt kullanılır; model hiç çağrılmaz.
+        
+        Args:
+            prompt (str): Modele gönderilecek istem.
+            validate (Callable[[str], Any], optional): Yanıtı doğrular; hata fırlatır veya
+                yanlış değer döndürürse yanıt önbelleğe alınmaz.
+            
+        Returns:
+            str: Model yanıtı.
         """
-        api_key = os.getenv("GEMINI_API_KEY")
-        if not api_key:
-            logger.error("GEMINI_API_KEY bulunamadı. Lütfen .env dosyasını kontrol edin.")
-            raise ValueError("GEMINI_API_KEY bulunamadı. Lütfen .env dosyasını kontrol edin.")
+        key, cached_text = self._lookup_cache(prompt)
+        if cached_text is not None:
+            return cached_text
+        
+        permit = self.governor.acquire() if self.governor is not None else None
+        try:
+            with GEMINI_CALL_SECONDS.time(mode='generate'):
+                response = self.model.generate_content(prompt)
+                text = response.text
+        except Exception:
+            GEMINI_CALLS.inc(mode='generate', status='error')
+            raise
+        finally:
+            if self.governor is not None:
+                self.governor.release(permit)
+        GEMINI_CALLS.inc(mode='generate', status='ok')
+        
+        self._store_cache(key, text, validate)
+        return text
+    
+    async def _generate_text_async(self, prompt: str, validate: Optional[Callable[[str], Any]] = None) -> str:
+        """
+        _generate_text'in eş yordam (asyncio) sürümü.
+        
+        Model generate_content_async sunuyorsa (genai) yanıt olay döngüsü bloklanmadan
+        beklenir; sunmuyorsa çağrı bir thread'e aktarılır. Düzenleyici izni olay döngüsünde
+        beklenir (acquire_async); kuyrukta bekleyen çağrılar thread havuzunu doldurmaz.
         
-        # Gemini API'yi yapılandır
-        logger.debug(f"Gemini API yapılandırılıyor. API anahtarı: {api_key[:5]}...")
-        genai.configure(api_key=api_key)
+        Args:
+            prompt (str): Modele gönderilecek istem.
+            validate (Callable[[str], Any], optional): Yanıtı doğrular; bkz. _generate_text.
+            
+        Returns:
+            str: Model yanıtı.
+        """
+        key, cached_text = self._lookup_cache(prompt)
+        if cached_text is not None:
+            return cached_text
+        
+        permit = await self.governor.acquire_async() if self.governor is not None else None
+        try:
+            with GEMINI_CALL_SECONDS.time(mode='generate'):
+                if hasattr(self.model, 'generate_content_async'):
+                    response = await self.model.generate_content_async(prompt)
+                else:
+                    response = await asyncio.to_thread(self.model.generate_content, prompt)
+                text = response.text
+        except Exception:
+            GEMINI_CALLS.inc(mode='generate', status='error')
+            raise
+        finally:
+            if self.governor is not None:
+                self.governor.release(permit)
+        GEMINI_CALLS.inc(mode='generate', status='ok')
         
-        # Gemini modeli
-        self.model = genai.GenerativeModel('gemini-1.5-flash')
-        logger.debug("Gemini modeli oluşturuldu: gemini-1.5-flash")
+        self._store_cache(key, text, validate)
+        return text
+    
+    def _lookup_cache(self, prompt: str) -> Tuple[Optional[str], Optional[str]]:
+        """
+        İstemin önbellek anahtarını ve (varsa) önbellekteki yanıtı döndürür.
+        """
+        if self.cache is None:
+            return None, None
+        key = self.cache.make_key(prompt, self.model_name, PROMPT_VERSION)
+        cached_text = self.cache.get(key)
+        if cached_text is not None:
+            logger.debug("Yapay zeka yanıtı önbellekten alındı.")
+            LLM_CACHE_HITS.inc()
+        return key, cached_text
+    
+    def _store_cache(self, key: Optional[str], text: str,
+                     validate: Optional[Callable[[str], Any]] = None) -> None:
+        # Yalnızca boş olmayan ve doğrulanan yanıtları önbelleğe al; bozuk bir yanıt
+        # önbellekte kalırsa yeniden denemeler LLM_CACHE_TTL boyunca aynı yanıtı alır
+        if key is None or not text:
+            return
+        if validate is not None:
+            try:
+                valid = validate(text)
+            except Exception:
+                valid = False
+            if not valid:
+                logger.debug("Geçersiz yapay zeka yanıtı önbelleğe alınmadı.")
+                return
+        self.cache.set(key, text)
+    
+    @classmethod
+    def _is_json(cls, text: str) -> bool:
+        """
+        Yanıt (kod bloğu kaldırıldıktan sonra) geçerli JSON ise True döndürür.
+        """
+        json.loads(cls._strip_code_fence(text))
+        return True
+    
+    @staticmethod
+    def _has_tests(text: str) -> bool:
+        """
+        Test yanıtı kullanılabilir biçimdeyse (kod bloğu içeriyorsa) True döndürür.
+        """
+        return bool(text) and "```" in text
     
     def analyze_transcript(self, transcript_data: Dict[str, Any]) -> Dict[str, Any]:
         """
@@ -44,20 +239,67 @@ class AIAnalyzer:
             Dict[str, Any]: Analiz sonuçları.
         """
         # Gladia verisinden metni al
-        all_text = ""
-        for utterance in transcript_data.get('gladia_response', []):
-            if 'text' in utterance:
-                all_text += utterance['text'] + "\n"
+        all_text = "".join(
+            utterance['text'] + "\n"
+            for utterance in transcript_data.get('gladia_response', [])
+            if 'text' in utterance
+        )
                 
-        logger.debug(f"Analiz edilecek metin uzunluğu: {len(all_text)} karakter")
+        logger.debug("Analiz edilecek metin uzunluğu: %s karakter", len(all_text))
         
-        # Metin çok uzunsa, ilk 8000 karakteri al (Gemini API sınırlamaları nedeniyle)
-        if len(all_text) > 8000:
-            all_text = all_text[:8000]
-            logger.debug("Metin çok uzun, ilk 8000 karakter alındı.")
+        if chunked_analysis_enabled() and len(all_text) > ANALYSIS_CHUNK_CHARS:
+            # Uzun derste metin kesilmez; parçalar eş zamanlı analiz edilip birleştirilir
+            analysis_data = self._analyze_in_chunks(all_text, self._build_transcript_analysis_prompt)
+            if analysis_data is not None:
+                return {
+                    'success': True,
+                    'openai': analysis_data
+                }
+        
+        # Metni istem bütçesine sığdır
+        all_text = self._fit_to_budget(all_text)
         
         # Yapay zekaya gönderilecek istek
-        prompt = f"""
+        prompt = self._build_transcript_analysis_prompt(all_text)
+        
+        try:
+            analysis_text = self._generate_text(prompt, validate=self._is_json)
+            
+            # JSON formatını temizle
+            analysis_text = analysis_text.strip()
+            if analysis_text.startswith('```json'):
+                analysis_text = analysis_text[7:]
+            if analysis_text.endswith('```'):
+                analysis_text = analysis_text[:-3]
+            analysis_text = analysis_text.strip()
+            
+            # JSON'ı parse et
+            analysis_data = json.loads(analysis_text)
+            
+            return {
+                'success': True,
+                'openai': analysis_data
+            }
+            
+        except Exception as e:
+            logger.error("Yapay zeka analizi sırasında hata oluştu: %s", e)
+            return {
+                'success': False,
+                'error': str(e)
+            }
+    
+    @staticmethod
+    def _build_transcript_analysis_prompt(all_text: str) -> str:
+        """
+        Gladia transkripti analizi için istemi oluşturur.
+        
+        Args:
+            all_text (str): Analiz edilecek transkript metni.
+            
+        Returns:
+            str: Yapay zekaya gönderilecek istem.
+        """
+        return f"""
         Analyze the following English lesson transcript and extract this information:
         
         1. Student's English level (A1, A2, B1, B2, C1, C2)
@@ -96,33 +338,6 @@ class AIAnalyzer:
             }}
         }}
         """
-        
-        try:
-            response = self.model.generate_content(prompt)
-            analysis_text = response.text
-            
-            # JSON formatını temizle
-            analysis_text = analysis_text.strip()
-            if analysis_text.startswith('```json'):
-                analysis_text = analysis_text[7:]
-            if analysis_text.endswith('```'):
-                analysis_text = analysis_text[:-3]
-            analysis_text = analysis_text.strip()
-            
-            # JSON'ı parse et
-            analysis_data = json.loads(analysis_text)
-            
-            return {
-                'success': True,
-                'openai': analysis_data
-            }
-            
-        except Exception as e:
-            logger.error(f"Yapay zeka analizi sırasında hata oluştu: {str(e)}")
-            return {
-                'success': False,
-                'error': str(e)
-            }
     
     def generate_questions(self, transcript_data: Dict[str, Any]) -> Dict[str, Any]:
         """
@@ -196,8 +411,7 @@ class AIAnalyzer:
         """
         
         try:
-            response = self.model.generate_content(prompt)
-            questions_text = response.text
+            questions_text = self._generate_text(prompt, validate=self._is_json)
             
             # JSON formatını temizle
             questions_text = questions_text.strip()
@@ -216,7 +430,7 @@ class AIAnalyzer:
             }
             
         except Exception as e:
-            logger.error(f"Soru üretimi sırasında hata oluştu: {str(e)}")
+            logger.error("Soru üretimi sırasında hata oluştu: %s", e)
             return {
                 'success': False,
                 'error': str(e)
@@ -289,24 +503,101 @@ class AIAnalyzer:
         speaker_counts = transcript_data.get('speaker_counts', {})
         all_text = transcript_data.get('all_text', '')
         
-        logger.debug(f"Zoom analizi için konuşmacı sayısı: {len(speakers)}")
-        logger.debug(f"Zoom analizi için metin uzunluğu: {len(all_text)} karakter")
-        
-        # Metin çok uzunsa, ilk 8000 karakteri al
-        if len(all_text) > 8000:
-            all_text = all_text[:8000]
-            logger.debug("Metin çok uzun, ilk 8000 karakter alındı.")
+        logger.debug("Zoom analizi için konuşmacı sayısı: %s", len(speakers))
+        logger.debug("Zoom analizi için metin uzunluğu: %s karakter", len(all_text))
         
         # Konuşmacı bilgilerini hazırla
-        speaker_data = []
-        for speaker, texts in speakers.items():
-            speaker_text = "\n".join(texts[:20])  # Her konuşmacı için en fazla 20 konuşma örneği
-            speaker_data.append(f"Konuşmacı: {speaker}\nKonuşma Sayısı: {speaker_counts.get(speaker, 0)}\nKonuşma Örnekleri:\n{speaker_text}\n")
+        speakers_info = self._build_speakers_info(speakers, speaker_counts)
+        
+        if chunked_analysis_enabled() and len(all_text) > ANALYSIS_CHUNK_CHARS:
+            # Uzun derste metin kesilmez; parçalar eş zamanlı analiz edilip birleştirilir
+            analysis = self._analyze_in_chunks(
+                all_text, lambda chunk: self._build_zoom_analysis_prompt(speakers_info, chunk))
+            if analysis is not None:
+                return {
+                    'raw_analysis': json.dumps(analysis, ensure_ascii=False, indent=2),
+                    'success': True
+                }
         
-        speakers_info = "\n".join(speaker_data)
+        # Metni istem bütçesine sığdır
+        all_text = self._fit_to_budget(all_text)
         
         # Yapay zekaya gönderilecek istek
-        prompt = f"""
+        prompt = self._build_zoom_analysis_prompt(speakers_info, all_text)
+        
+        try:
+            # Yapay zekadan yanıt al
+            logger.debug("Yapay zekadan Zoom analiz yanıtı isteniyor...")
+            analysis_text = self._generate_text(prompt)
+            
+            # Yanıtı işle
+            logger.debug("Yapay zeka Zoom analiz yanıtı alındı. Uzunluk: %s karakter", len(analysis_text))
+            
+            # Basit bir analiz sonucu oluştur
+            analysis_result = {
+                'raw_analysis': analysis_text,
+                'success': True
+            }
+            
+            return analysis_result
+        except Exception as e:
+            logger.error("Zoom transkripti analizi sırasında hata oluştu: %s", e)
+            return {
+                'success': False,
+                'error': str(e)
+            }
+    
+    async def analyze_zoom_transcript_async(self, transcript_data: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        analyze_zoom_transcript'in eş yordam sürümü; parçalı analizde parçalar asyncio ile eş zamanlı gönderilir.
+        
+        Args:
+            transcript_data (Dict[str, Any]): İşlenmiş transkript verileri.
+            
+        Returns:
+            Dict[str, Any]: analyze_zoom_transcript ile aynı yapıda analiz sonuçları.
+        """
+        all_text = transcript_data.get('all_text', '')
+        speakers_info = self._build_speakers_info(transcript_data.get('speakers', {}),
+                                                  transcript_data.get('speaker_counts', {}))
+        
+        if chunked_analysis_enabled() and len(all_text) > ANALYSIS_CHUNK_CHARS:
+            analysis = await self._analyze_in_chunks_async(
+                all_text, lambda chunk: self._build_zoom_analysis_prompt(speakers_info, chunk))
+            if analysis is not None:
+                return {
+                    'raw_analysis': json.dumps(analysis, ensure_ascii=False, indent=2),
+                    'success': True
+                }
+        
+        prompt = self._build_zoom_analysis_prompt(speakers_info, self._fit_to_budget(all_text))
+        try:
+            analysis_text = await self._generate_text_async(prompt)
+            logger.debug("Yapay zeka Zoom analiz yanıtı alındı. Uzunluk: %s karakter", len(analysis_text))
+            return {
+                'raw_analysis': analysis_text,
+                'success': True
+            }
+        except Exception as e:
+            logger.error("Zoom transkripti analizi sırasında hata oluştu: %s", e)
+            return {
+                'success': False,
+                'error': str(e)
+            }
+    
+    @staticmethod
+    def _build_zoom_analysis_prompt(speakers_info: str, all_text: str) -> str:
+        """
+        Zoom transkripti analizi için istemi oluşturur.
+        
+        Args:
+            speakers_info (str): Konuşmacı bilgileri metni.
+            all_text (str): Analiz edilecek transkript metni.
+            
+        Returns:
+            str: Yapay zekaya gönderilecek istem.
+        """
+        return f"""
         Aşağıdaki Zoom ders transkriptini analiz et. Bu transkript, bir eğitmen ile bir öğrenci arasındaki diyaloğu içeriyor.
         
         1. Konuşmacıları analiz ederek hangisinin öğretmen, hangisinin öğrenci olduğunu belirle.
@@ -333,29 +624,149 @@ class AIAnalyzer:
           "ana_konular": ["konu 1", "konu 2", ...]
         }}
         """
+    
+    def _analyze_in_chunks(self, text: str, build_prompt: Callable[[str], str]) -> Optional[Dict[str, Any]]:
+        """
+        Uzun transkripti konuşma sınırlarından parçalara böler, parçaları eş zamanlı
+        analiz eder ve kısmi sonuçları tek bir analizde birleştirir.
         
-        try:
-            # Yapay zekadan yanıt al
-            logger.debug("Yapay zekadan Zoom analiz yanıtı isteniyor...")
-            response = self.model.generate_content(prompt)
+        Parça sayısı GEMINI_MAX_CHUNKS ile sınırlıdır; metin daha uzunsa parçalar
+        büyütülür, böylece dersin tamamı yine analiz edilir.
+        
+        Args:
+            text (str): Satır başına bir konuşma içeren transkript metni.
+            build_prompt (Callable[[str], str]): Parça metninden istem oluşturan işlev.
             
-            # Yanıtı işle
-            analysis_text = response.text
-            logger.debug(f"Yapay zeka Zoom analiz yanıtı alındı. Uzunluk: {len(analysis_text)} karakter")
+        Returns:
+            Optional[Dict[str, Any]]: Birleştirilmiş analiz; hiçbir parça ayrıştırılamazsa None.
+        """
+        chunks = self._plan_chunks(text)
+        
+        def analyze_chunk(chunk: str) -> Optional[Dict[str, Any]]:
+            try:
+                return self._parse_partial(self._generate_text(build_prompt(chunk), validate=self._parse_partial))
+            except Exception as e:
+                logger.warning("Transkript parçası analiz edilemedi: %s", e)
+                return None
+        
+        # Parçalar çağıranın bağlamında (istek kimliği, Gemini önceliği) çalışır
+        contexts = [contextvars.copy_context() for _ in chunks]
+        results = _get_chunk_executor().map(lambda context, chunk: context.run(analyze_chunk, chunk), contexts, chunks)
+        partials = [p for p in results if p is not None]
+        if not partials:
+            logger.error("Hiçbir transkript parçası analiz edilemedi.")
+            return None
+        return self._merge_analyses(partials)
+    
+    async def _analyze_in_chunks_async(self, text: str, build_prompt: Callable[[str], str]) -> Optional[Dict[str, Any]]:
+        """
+        _analyze_in_chunks'ın eş yordam sürümü; parçalar thread havuzu yerine asyncio.gather ile gönderilir.
+        """
+        async def analyze_chunk(chunk: str) -> Optional[Dict[str, Any]]:
+            try:
+                return self._parse_partial(
+                    await self._generate_text_async(build_prompt(chunk), validate=self._parse_partial))
+            except Exception as e:
+                logger.warning("Transkript parçası analiz edilemedi: %s", e)
+                return None
+        
+        results = await asyncio.gather(*(analyze_chunk(chunk) for chunk in self._plan_chunks(text)))
+        partials = [p for p in results if p is not None]
+        if not partials:
+            logger.error("Hiçbir transkript parçası analiz edilemedi.")
+            return None
+        return self._merge_analyses(partials)
+    
+    def _plan_chunks(self, text: str) -> List[str]:
+        # Parça sayısı GEMINI_MAX_CHUNKS'ı aşmayacak şekilde bütçe büyütülür
+        budget = max(ANALYSIS_CHUNK_CHARS, -(-len(text) // ANALYSIS_MAX_CHUNKS))
+        chunks = self._split_into_chunks(text, budget)
+        logger.debug("Transkript %s parça halinde analiz ediliyor (%s karakter).", len(chunks), len(text))
+        return chunks
+    
+    def _parse_partial(self, text: str) -> Optional[Dict[str, Any]]:
+        partial = json.loads(self._strip_code_fence(text))
+        return partial if isinstance(partial, dict) else None
+    
+    @staticmethod
+    def _split_into_chunks(text: str, budget: int) -> List[str]:
+        """
+        Metni satır (konuşma) sınırlarından en fazla budget karakterlik parçalara böler.
+        
+        Tek başına bütçeyi aşan bir konuşma kendi parçasında bütçe kadar kesilir.
+        
+        Args:
+            text (str): Satır başına bir konuşma içeren metin.
+            budget (int): Parça başına en fazla karakter sayısı.
             
-            # Basit bir analiz sonucu oluştur
-            analysis_result = {
-                'raw_analysis': analysis_text,
-                'success': True
-            }
+        Returns:
+            List[str]: Parçalar.
+        """
+        chunks = []
+        current = []
+        size = 0  # "\n".join(current) uzunluğu
+        for line in text.splitlines():
+            if not line:
+                continue
+            line = line[:budget]
+            if current and size + 1 + len(line) > budget:
+                chunks.append("\n".join(current))
+                current = []
+            size = size + 1 + len(line) if current else len(line)
+            current.append(line)
+        if current:
+            chunks.append("\n".join(current))
+        return chunks
+    
+    @staticmethod
+    def _merge_analyses(partials: List[Dict[str, Any]]) -> Dict[str, Any]:
+        """
+        Parça analizlerini birleştirir.
+        
+        Seviye alanları (level, seviye) için parçaların medyan CEFR seviyesi,
+        listeler için sırası korunmuş tekrarsız birleşim, iç içe sözlükler için
+        aynı kurallar, diğer değerler için en sık verilen yanıt kullanılır.
+        
+        Args:
+            partials (List[Dict[str, Any]]): Parça başına analiz sonuçları.
             
-            return analysis_result
-        except Exception as e:
-            logger.error(f"Zoom transkripti analizi sırasında hata oluştu: {str(e)}")
-            return {
-                'success': False,
-                'error': str(e)
-            }
+        Returns:
+            Dict[str, Any]: Birleştirilmiş analiz.
+        """
+        merged = {}
+        keys = []
+        for partial in partials:
+            keys.extend(key for key in partial if key not in keys)
+        
+        for key in keys:
+            values = [partial[key] for partial in partials if partial.get(key) not in (None, '', [], {})]
+            if not values:
+                merged[key] = partials[0].get(key)
+            elif all(isinstance(value, list) for value in values):
+                seen = set()
+                merged[key] = []
+                for value in values:
+                    for item in value:
+                        marker = item.strip().lower() if isinstance(item, str) else json.dumps(item, sort_keys=True)
+                        if marker not in seen:
+                            seen.add(marker)
+                            merged[key].append(item)
+            elif all(isinstance(value, dict) for value in values):
+                merged[key] = AIAnalyzer._merge_analyses(values)
+            elif key in LEVEL_KEYS:
+                levels = sorted(
+                    (str(value).strip().upper() for value in values if str(value).strip().upper() in CEFR_LEVELS),
+                    key=CEFR_LEVELS.index
+                )
+                merged[key] = levels[(len(levels) - 1) // 2] if levels else values[0]
+            else:
+                counts = {}
+                for value in values:
+                    marker = json.dumps(value, sort_keys=True, ensure_ascii=False)
+                    counts.setdefault(marker, [0, value])[0] += 1
+                # Eşitlikte ilk parçadaki değer korunur
+                merged[key] = max(counts.values(), key=lambda entry: entry[0])[1]
+        return merged
     
     def generate_tests(self, analysis_result: Dict[str, Any], transcript_data: Dict[str, Any]) -> Dict[str, Any]:
         """
@@ -366,7 +777,7 @@ class AIAnalyzer:
             transcript_data (Dict[str, Any]): İşlenmiş transkript verileri.
             
         Returns:
-            Dict[str, Any]: Oluşturulan testler.
+            Dict[str, Any]: Oluşturulan testler; örnek test verileri kullanıldıysa 'fallback' True olur.
         """
         if not analysis_result.get('success', False):
             logger.error("Analiz sonuçları bulunamadı.")
@@ -377,16 +788,14 @@ class AIAnalyzer:
         
         # Analiz sonuçlarını al
         raw_analysis = analysis_result.get('raw_analysis', '')
-        logger.debug(f"Test oluşturmak için analiz sonucu uzunluğu: {len(raw_analysis)} karakter")
+        logger.debug("Test oluşturmak için analiz sonucu uzunluğu: %s karakter", len(raw_analysis))
         
         # Tüm konuşma metinlerini al
         all_text = transcript_data.get('all_text', '')
-        logger.debug(f"Test oluşturmak için metin uzunluğu: {len(all_text)} karakter")
+        logger.debug("Test oluşturmak için metin uzunluğu: %s karakter", len(all_text))
         
-        # Metin çok uzunsa, ilk 8000 karakteri al
-        if len(all_text) > 8000:
-            all_text = all_text[:8000]
-            logger.debug("Metin çok uzun, ilk 8000 karakter alındı.")
+        # Metni istem bütçesine sığdır
+        all_text = self._fit_to_budget(all_text)
         
         # Yapay zekaya gönderilecek istek
         prompt = f"""
@@ -440,30 +849,34 @@ class AIAnalyzer:
         try:
             # Yapay zekadan yanıt al
             logger.debug("Yapay zekadan test yanıtı isteniyor...")
-            response = self.model.generate_content(prompt)
+            tests_text = self._generate_text(prompt, validate=self._has_tests)
             
             # Yanıtı işle
-            tests_text = response.text
-            logger.debug(f"Yapay zeka test yanıtı alındı. Uzunluk: {len(tests_text)} karakter")
-            logger.debug(f"Test yanıtı: {tests_text[:200]}...")
+            logger.debug("Yapay zeka test yanıtı alındı. Uzunluk: %s karakter", len(tests_text))
+            logger.debug("Test yanıtı: %.200s...", tests_text)
             
-            # API yanıtı boş veya geçersizse örnek test verileri kullan
-            if not tests_text or "```" not in tests_text:
+            # API yanıtı boş veya geçersizse örnek test verileri kullan (_has_tests ile
+            # doğrulanmayan yanıt önbelleğe de yazılmaz)
+            fallback = False
+            if not self._has_tests(tests_text):
                 logger.warning("Geçerli test yanıtı alınamadı, örnek test verileri kullanılıyor.")
                 tests_text = self._get_sample_tests()
+                fallback = True
             
             # Test sonuçlarını döndür
             return {
                 'raw_tests': tests_text,
-                'success': True
+                'success': True,
+                'fallback': fallback
             }
         except Exception as e:
-            logger.error(f"Test oluşturma sırasında hata oluştu: {str(e)}")
+            logger.error("Test oluşturma sırasında hata oluştu: %s", e)
             # Hata durumunda örnek test verileri kullan
             logger.warning("Hata nedeniyle örnek test verileri kullanılıyor.")
             return {
                 'raw_tests': self._get_sample_tests(),
-                'success': True
+                'success': True,
+                'fallback': True
             }
 
     def generate_zoom_tests(self, analysis_result: Dict[str, Any], transcript_data: Dict[str, Any]) -> Dict[str, Any]:
@@ -484,18 +897,169 @@ class AIAnalyzer:
                 'error': 'Analiz sonuçları bulunamadı.'
             }
         
+        prompt = self._build_zoom_tests_prompt(analysis_result, transcript_data)
+        
+        try:
+            # Yapay zekadan yanıt al
+            logger.debug("Yapay zekadan Zoom test yanıtı isteniyor...")
+            tests_text = self._generate_text(prompt, validate=self._has_tests)
+        except Exception as e:
+            logger.error("Zoom test oluşturma sırasında hata oluştu: %s", e)
+            tests_text = None
+        return self.zoom_tests_result(tests_text)
+    
+    async def generate_zoom_tests_async(self, analysis_result: Dict[str, Any],
+                                        transcript_data: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        generate_zoom_tests'in eş yordam sürümü.
+        
+        Args:
+            analysis_result (Dict[str, Any]): Analiz sonuçları.
+            transcript_data (Dict[str, Any]): İşlenmiş transkript verileri.
+            
+        Returns:
+            Dict[str, Any]: generate_zoom_tests ile aynı yapıda testler.
+        """
+        if not analysis_result.get('success', False):
+            logger.error("Analiz sonuçları bulunamadı.")
+            return {
+                'success': False,
+                'error': 'Analiz sonuçları bulunamadı.'
+            }
+        
+        prompt = self._build_zoom_tests_prompt(analysis_result, transcript_data)
+        try:
+            tests_text = await self._generate_text_async(prompt, validate=self._has_tests)
+        except Exception as e:
+            logger.error("Zoom test oluşturma sırasında hata oluştu: %s", e)
+            tests_text = None
+        return self.zoom_tests_result(tests_text)
+    
+    def zoom_tests_result(self, tests_text: Optional[str]) -> Dict[str, Any]:
+        """
+        Model yanıtından test sonucunu oluşturur; yanıt yoksa (hata) veya geçersizse örnek test verileri kullanılır.
+        
+        Örnek test verileri kullanıldığında sonuçtaki 'fallback' True olur; bu sonuçlar
+        derse özel olmadığından önbelleğe alınmamalıdır.
+        
+        Args:
+            tests_text (Optional[str]): Model yanıtı; çağrı başarısız olduysa None.
+            
+        Returns:
+            Dict[str, Any]: 'raw_tests', 'success' ve 'fallback' anahtarlarını içeren test sonucu.
+        """
+        fallback = False
+        if tests_text is None:
+            logger.warning("Hata nedeniyle örnek Zoom test verileri kullanılıyor.")
+            tests_text = self._get_sample_tests()
+            fallback = True
+        else:
+            logger.debug("Yapay zeka Zoom test yanıtı alındı. Uzunluk: %s karakter", len(tests_text))
+            # API yanıtı boş veya geçersizse örnek test verileri kullan
+            if not self._has_tests(tests_text):
+                logger.warning("Geçerli Zoom test yanıtı alınamadı, örnek test verileri kullanılıyor.")
+                tests_text = self._get_sample_tests()
+                fallback = True
+        
+        return {
+            'raw_tests': tests_text,
+            'success': True,
+            'fallback': fallback
+        }
+
+    def stream_zoom_tests(self, analysis_result: Dict[str, Any], transcript_data: Dict[str, Any],
+                          fallback: bool = True) -> Iterator[str]:
+        """
+        generate_zoom_tests ile aynı istemi akış (stream) modunda gönderir ve yanıt parçalarını üretir.
+        
+        Model hata verirse veya hiç metin üretmezse örnek test verileri tek parça olarak döner.
+        
+        Args:
+            analysis_result (Dict[str, Any]): Analiz sonuçları.
+            transcript_data (Dict[str, Any]): İşlenmiş transkript verileri.
+            fallback (bool): False ise örnek test verileri döndürülmez; yanıtı çağıran işler.
+            
+        Yields:
+            str: Model yanıtının gelen parçaları.
+        """
+        prompt = self._build_zoom_tests_prompt(analysis_result, transcript_data)
+        produced = False
+        try:
+            logger.debug("Yapay zekadan Zoom test yanıtı akış modunda isteniyor...")
+            for chunk in self._stream_text(prompt, validate=self._has_tests):
+                produced = True
+                yield chunk
+        except Exception as e:
+            logger.error("Zoom test akışı sırasında hata oluştu: %s", e)
+        
+        if not produced and fallback:
+            logger.warning("Akıştan test verisi alınamadı, örnek test verileri kullanılıyor.")
+            yield self._get_sample_tests()
+
+    def _stream_text(self, prompt: str, validate: Optional[Callable[[str], Any]] = None) -> Iterator[str]:
+        """
+        İstemi akış modunda modele gönderir; önbellekte varsa yanıtı tek parça döndürür.
+        
+        Args:
+            prompt (str): Modele gönderilecek istem.
+            validate (Callable[[str], Any], optional): Tam yanıtı doğrular; bkz. _generate_text.
+            
+        Yields:
+            str: Yanıt parçaları.
+        """
+        key = None
+        if self.cache is not None:
+            key = self.cache.make_key(prompt, self.model_name, PROMPT_VERSION)
+            cached_text = self.cache.get(key)
+            if cached_text is not None:
+                logger.debug("Yapay zeka yanıtı önbellekten alındı.")
+                LLM_CACHE_HITS.inc()
+                yield cached_text
+                return
+        
+        parts = []
+        # İzin akış bitene (veya tüketici bırakana) kadar tutulur
+        permit = self.governor.acquire() if self.governor is not None else None
+        started = time.perf_counter()
+        try:
+            for chunk in self.model.generate_content(prompt, stream=True):
+                text = chunk.text
+                if text:
+                    parts.append(text)
+                    yield text
+        except Exception:
+            GEMINI_CALLS.inc(mode='stream', status='error')
+            raise
+        finally:
+            if self.governor is not None:
+                self.governor.release(permit)
+        GEMINI_CALLS.inc(mode='stream', status='ok')
+        GEMINI_CALL_SECONDS.observe(time.perf_counter() - started, mode='stream')
+        
+        # Akış tamamlandıysa tam yanıtı önbelleğe al
+        self._store_cache(key, "".join(parts), validate)
+
+    def _build_zoom_tests_prompt(self, analysis_result: Dict[str, Any], transcript_data: Dict[str, Any]) -> str:
+        """
+        Zoom test üretimi için istemi oluşturur.
+        
+        Args:
+            analysis_result (Dict[str, Any]): Analiz sonuçları.
+            transcript_data (Dict[str, Any]): İşlenmiş transkript verileri.
+            
+        Returns:
+            str: Modele gönderilecek istem.
+        """
         # Analiz sonuçlarını al
         raw_analysis = analysis_result.get('raw_analysis', '')
-        logger.debug(f"Zoom testi oluşturmak için analiz sonucu uzunluğu: {len(raw_analysis)} karakter")
+        logger.debug("Zoom testi oluşturmak için analiz sonucu uzunluğu: %s karakter", len(raw_analysis))
         
         # Tüm konuşma metinlerini al
         all_text = transcript_data.get('all_text', '')
-        logger.debug(f"Zoom testi oluşturmak için metin uzunluğu: {len(all_text)} karakter")
+        logger.debug("Zoom testi oluşturmak için metin uzunluğu: %s karakter", len(all_text))
         
-        # Metin çok uzunsa, ilk 8000 karakteri al
-        if len(all_text) > 8000:
-            all_text = all_text[:8000]
-            logger.debug("Metin çok uzun, ilk 8000 karakter alındı.")
+        # Metni istem bütçesine sığdır
+        all_text = self._fit_to_budget(all_text)
         
         # Yapay zekaya gönderilecek istek
         prompt = f"""
@@ -546,33 +1110,235 @@ class AIAnalyzer:
         ```
         """
         
+        return prompt
+
+    def analyze_and_generate_zoom_tests(self, transcript_data: Dict[str, Any]) -> Tuple[Dict[str, Any], Dict[str, Any]]:
+        """
+        Zoom transkriptini tek bir yapay zeka isteğiyle analiz eder ve test sorularını oluşturur.
+        
+        analyze_zoom_transcript + generate_zoom_tests ikilisine göre transkript
+        yalnızca bir kez gönderilir; giriş token'ları ve toplam gecikme yaklaşık yarıya iner.
+        Yanıt ayrıştırılamazsa iki ayrı çağrıya geri dönülür.
+        
+        Args:
+            transcript_data (Dict[str, Any]): İşlenmiş transkript verileri.
+            
+        Returns:
+            Tuple[Dict[str, Any], Dict[str, Any]]: analyze_zoom_transcript ve
+            generate_zoom_tests ile aynı yapıda analiz ve test sonuçları.
+        """
+        speakers = transcript_data.get('speakers', {})
+        speaker_counts = transcript_data.get('speaker_counts', {})
+        all_text = transcript_data.get('all_text', '')
+        
+        logger.debug("Birleşik analiz için metin uzunluğu: %s karakter", len(all_text))
+        
+        if chunked_analysis_enabled() and len(all_text) > ANALYSIS_CHUNK_CHARS:
+            # Uzun ders tek istemde kesilmez; parçalı analizden sonra testler ayrıca istenir
+            analysis_result = self.analyze_zoom_transcript(transcript_data)
+            if not analysis_result.get('success', False):
+                return analysis_result, {'success': False, 'error': 'Analiz sonuçları bulunamadı.'}
+            return analysis_result, self.generate_zoom_tests(analysis_result, transcript_data)
+        
+        # Metni istem bütçesine sığdır
+        all_text = self._fit_to_budget(all_text)
+        
+        speakers_info = self._build_speakers_info(speakers, speaker_counts)
+        
+        # Yapay zekaya gönderilecek istek
+        prompt = self._build_combined_prompt(speakers_info, all_text)
+        
         try:
-            # Yapay zekadan yanıt al
-            logger.debug("Yapay zekadan Zoom test yanıtı isteniyor...")
-            response = self.model.generate_content(prompt)
+            logger.debug("Yapay zekadan birleşik analiz ve test yanıtı isteniyor...")
+            response_text = self._generate_text(prompt, validate=self._split_combined_response)
+            return self._split_combined_response(response_text)
+        except Exception as e:
+            logger.warning("Birleşik yanıt işlenemedi, iki ayrı çağrıya dönülüyor: %s", e)
+            analysis_result = self.analyze_zoom_transcript(transcript_data)
+            if not analysis_result.get('success', False):
+                return analysis_result, {'success': False, 'error': 'Analiz sonuçları bulunamadı.'}
+            return analysis_result, self.generate_zoom_tests(analysis_result, transcript_data)
+    
+    async def analyze_and_generate_zoom_tests_async(
+            self, transcript_data: Dict[str, Any]) -> Tuple[Dict[str, Any], Dict[str, Any]]:
+        """
+        analyze_and_generate_zoom_tests'in eş yordam sürümü.
+        
+        Args:
+            transcript_data (Dict[str, Any]): İşlenmiş transkript verileri.
             
-            # Yanıtı işle
-            tests_text = response.text
-            logger.debug(f"Yapay zeka Zoom test yanıtı alındı. Uzunluk: {len(tests_text)} karakter")
+        Returns:
+            Tuple[Dict[str, Any], Dict[str, Any]]: Analiz ve test sonuçları.
+        """
+        all_text = transcript_data.get('all_text', '')
+        
+        if not (chunked_analysis_enabled() and len(all_text) > ANALYSIS_CHUNK_CHARS):
+            speakers_info = self._build_speakers_info(transcript_data.get('speakers', {}),
+                                                      transcript_data.get('speaker_counts', {}))
+            prompt = self._build_combined_prompt(speakers_info, self._fit_to_budget(all_text))
+            try:
+                return self._split_combined_response(
+                    await self._generate_text_async(prompt, validate=self._split_combined_response))
+            except Exception as e:
+                logger.warning("Birleşik yanıt işlenemedi, iki ayrı çağrıya dönülüyor: %s", e)
+        
+        analysis_result = await self.analyze_zoom_transcript_async(transcript_data)
+        if not analysis_result.get('success', False):
+            return analysis_result, {'success': False, 'error': 'Analiz sonuçları bulunamadı.'}
+        return analysis_result, await self.generate_zoom_tests_async(analysis_result, transcript_data)
+    
+    @staticmethod
+    def _build_combined_prompt(speakers_info: str, all_text: str) -> str:
+        """
+        Birleşik analiz ve test üretimi için istemi oluşturur.
+        
+        Args:
+            speakers_info (str): Konuşmacı bilgileri metni.
+            all_text (str): Analiz edilecek transkript metni.
             
-            # API yanıtı boş veya geçersizse örnek test verileri kullan
-            if not tests_text or "```" not in tests_text:
-                logger.warning("Geçerli Zoom test yanıtı alınamadı, örnek test verileri kullanılıyor.")
-                tests_text = self._get_sample_tests()
+        Returns:
+            str: Yapay zekaya gönderilecek istem.
+        """
+        return f"""
+        Aşağıdaki Zoom ders transkriptini analiz et ve ardından analiz sonucuna göre test soruları oluştur.
+        Bu transkript, bir eğitmen ile bir öğrenci arasındaki diyaloğu içeriyor.
+        
+        ANALİZ:
+        1. Konuşmacıları analiz ederek hangisinin öğretmen, hangisinin öğrenci olduğunu belirle.
+        2. Öğrencinin İngilizce seviyesini tespit et (A1, A2, B1, B2, C1, C2).
+        3. Öğrencinin güçlü yönlerini belirle.
+        4. Öğrencinin geliştirmesi gereken alanları belirle.
+        5. Derste öğrenilen yeni kelimeler ve deyimleri listele.
+        6. Derste tartışılan ana konuları özetle.
+        
+        TEST:
+        Analiz sonucunu kullanarak öğrencinin seviyesine uygun 5 adet kısa, interaktif ve eğlenceli test sorusu oluştur.
+        Test soruları, öğrencinin analiz edilen seviyesine ve geliştirmesi gereken alanlara odaklanmalıdır.
+        
+        DİKKAT: Öğrencinin seviyesine göre soru dili değişiklik gösterecek:
+        - Eğer seviyesi A1 veya A2 ise sorular Türkçe, cevap seçenekleri İngilizce olacak
+        - Eğer seviyesi B1, B2, C1 veya C2 ise hem sorular hem de cevap seçenekleri İngilizce olacak
+        
+        Her soru şunları içermeli: soru metni, 4 seçenek (A, B, C, D), doğru cevap ve kısa bir açıklama.
+        Sorular şu türlerde olabilir: kelime bilgisi, dilbilgisi, dinleme anlama, okuma anlama, deyimler ve kalıplar.
+        
+        Konuşmacı Bilgileri:
+        {speakers_info}
+        
+        Transkript:
+        {all_text}
+        
+        Lütfen SADECE aşağıdaki yapıda tek bir JSON nesnesi döndür:
+        {{
+          "analysis": {{
+            "ogretmen": "Konuşmacının adı",
+            "ogrenci": "Konuşmacının adı",
+            "seviye": "B1",
+            "guclu_yonler": ["güçlü yön 1", "güçlü yön 2"],
+            "gelistirilmesi_gerekenler": ["alan 1", "alan 2"],
+            "yeni_kelimeler": ["kelime 1", "kelime 2"],
+            "ana_konular": ["konu 1", "konu 2"]
+          }},
+          "questions": [
+            {{
+              "question": "Soru metni",
+              "options": [
+                {{"letter": "A", "text": "Seçenek A"}},
+                {{"letter": "B", "text": "Seçenek B"}},
+                {{"letter": "C", "text": "Seçenek C"}},
+                {{"letter": "D", "text": "Seçenek D"}}
+              ],
+              "correct_answer": "A",
+              "explanation": "Açıklama"
+            }}
+          ]
+        }}
+        """
+    
+    def _split_combined_response(self, response_text: str) -> Tuple[Dict[str, Any], Dict[str, Any]]:
+        """
+        Birleşik yanıtı analyze_zoom_transcript / generate_zoom_tests yapısına böler.
+        
+        Raises:
+            ValueError: Yanıt JSON değilse veya analiz/soru listesi eksikse
+        """
+        logger.debug("Birleşik yanıt alındı. Uzunluk: %s karakter", len(response_text))
+        
+        combined = json.loads(self._strip_code_fence(response_text))
+        analysis = combined['analysis']
+        questions = combined['questions']
+        if not isinstance(analysis, dict) or not isinstance(questions, list) or not questions:
+            raise ValueError("Birleşik yanıtta analiz veya soru listesi eksik")
+        
+        # Mevcut raw_analysis / raw_tests yapısına böl
+        analysis_result = {
+            'raw_analysis': json.dumps(analysis, ensure_ascii=False, indent=2),
+            'success': True
+        }
+        tests_result = {
+            'raw_tests': "```json\n" + json.dumps(questions, ensure_ascii=False, indent=2) + "\n```",
+            'success': True,
+            'fallback': False
+        }
+        return analysis_result, tests_result
+
+    @staticmethod
+    def _fit_to_budget(all_text: str) -> str:
+        """
+        Transkript metnini istem bütçesine sığdırır.
+        
+        GEMINI_PROMPT_BUDGET_TOKENS verilmişse en bilgilendirici konuşmalar seçilir;
+        verilmemişse metnin ilk 8000 karakteri alınır (Gemini API sınırlamaları nedeniyle).
+        
+        Args:
+            all_text (str): Transkript metni.
             
-            # Test sonuçlarını döndür
-            return {
-                'raw_tests': tests_text,
-                'success': True
-            }
-        except Exception as e:
-            logger.error(f"Zoom test oluşturma sırasında hata oluştu: {str(e)}")
-            # Hata durumunda örnek test verileri kullan
-            logger.warning("Hata nedeniyle örnek Zoom test verileri kullanılıyor.")
-            return {
-                'raw_tests': self._get_sample_tests(),
-                'success': True
-            }
+        Returns:
+            str: İsteme eklenecek metin.
+        """
+        budget = prompt_budget_tokens()
+        if budget > 0:
+            compressed, _ = compress_transcript(all_text, budget)
+            return compressed
+        if len(all_text) > 8000:
+            logger.debug("Metin çok uzun, ilk 8000 karakter alındı.")
+            return all_text[:8000]
+        return all_text
+
+    @staticmethod
+    def _build_speakers_info(speakers: Dict[str, List[str]], speaker_counts: Dict[str, int]) -> str:
+        """
+        İstem için konuşmacı özetini oluşturur.
+        
+        Args:
+            speakers (Dict[str, List[str]]): Konuşmacı başına konuşma metinleri.
+            speaker_counts (Dict[str, int]): Konuşmacı başına konuşma sayısı.
+            
+        Returns:
+            str: Konuşmacı bilgileri metni.
+        """
+        speaker_data = []
+        for speaker, texts in speakers.items():
+            # Her konuşmacı için en fazla 20 konuşma örneği; bütçe verilmişse en bilgilendirici olanlar
+            samples = select_speaker_samples(texts, 20) if prompt_budget_tokens() > 0 else texts[:20]
+            speaker_text = "\n".join(samples)
+            speaker_data.append(f"Konuşmacı: {speaker}\nKonuşma Sayısı: {speaker_counts.get(speaker, 0)}\nKonuşma Örnekleri:\n{speaker_text}\n")
+        
+        return "\n".join(speaker_data)
+
+    @staticmethod
+    def _strip_code_fence(text: str) -> str:
+        """
+        Yanıtı saran ``` / ```json kod bloğunu kaldırır.
+        """
+        text = text.strip()
+        if text.startswith('```json'):
+            text = text[7:]
+        elif text.startswith('```'):
+            text = text[3:]
+        if text.endswith('```'):
+            text = text[:-3]
+        return text.strip()
 
     def _get_sample_tests(self) -> str:
         """
@@ -582,6 +1348,7 @@ class AIAnalyzer:
             str: Örnek test verileri.
         """
         logger.debug("Örnek test verileri oluşturuluyor.")
+        SAMPLE_TEST_FALLBACKS.inc()
         return """```
 [
   {
@@ -629,4 +1396,64 @@ class AIAnalyzer:
     "explanation": "The correct word is 'went', which is the past tense of 'go'. The sentence is in the past tense as indicated by 'yesterday'."
   }
 ]
-```""" 
\ No newline at end of file
+```""" 
+
+# Süreç genelinde paylaşılan analiz nesnesi
+_shared_analyzer = None
+_shared_analyzer_pid = None
+_shared_analyzer_lock = threading.Lock()
+
+def get_analyzer() -> AIAnalyzer:
+    """
+    Worker süreci başına bir kez oluşturulan, thread'ler arasında paylaşılan AIAnalyzer'ı döndürür.
+    
+    Gemini istemcisi fork sonrası paylaşılamadığından, nesne fork edilmiş bir
+    süreçte ilk kullanımda yeniden oluşturulur.
+    
+    Returns:
+        AIAnalyzer: Paylaşılan analiz nesnesi
+    """
+    global _shared_analyzer, _shared_analyzer_pid
+    pid = os.getpid()
+    analyzer = _shared_analyzer
+    if analyzer is not None and _shared_analyzer_pid == pid:
+        return analyzer
+    
+    with _shared_analyzer_lock:
+        if _shared_analyzer is None or _shared_analyzer_pid != pid:
+            _shared_analyzer = AIAnalyzer()
+            _shared_analyzer_pid = pid
+            logger.debug("Paylaşılan AIAnalyzer oluşturuldu (pid=%s)", pid)
+        return _shared_analyzer
+
+def set_analyzer(analyzer: Optional[AIAnalyzer]) -> None:
+    """
+    Paylaşılan analiz nesnesini değiştirir; None verilirse bir sonraki kullanımda yeniden oluşturulur.
+    
+    Args:
+        analyzer (AIAnalyzer, optional): Yeni paylaşılan nesne
+    """
+    global _shared_analyzer, _shared_analyzer_pid
+    with _shared_analyzer_lock:
+        _shared_analyzer = analyzer
+        _shared_analyzer_pid = os.getpid() if analyzer is not None else None
+
+def warm_up_analyzer() -> bool:
+    """
+    Paylaşılan analiz nesnesini oluşturur ve Gemini bağlantısını önceden açar.
+    
+    Gunicorn'un post_fork kancasından çağrılması önerilir; böylece ilk istek
+    bağlantı kurulum maliyetini ödemez.
+    
+    Returns:
+        bool: Isınma başarılıysa True
+    """
+    try:
+        analyzer = get_analyzer()
+        # Ucuz bir çağrı ile kanalı ve kimlik doğrulamayı hazırla
+        analyzer.model.count_tokens("ping")
+        logger.info("Gemini istemcisi ısıtıldı (pid=%s)", os.getpid())
+        return True
+    except Exception as e:
+        logger.warning("Gemini istemcisi ısıtılamadı: %s", e)
+        return False
@@ -0,0 +1,93 @@
+import os
+import asyncio
+import logging
+import threading
+import contextvars
+from concurrent.futures import Future
+from typing import Any, Callable, Coroutine
+
+# Loglama yapılandırması
+logger = logging.getLogger(__name__)
+
+# Worker süreci başına bir olay döngüsü ve onu çalıştıran thread
+_loop = None
+_loop_pid = None
+_loop_lock = threading.Lock()
+
+def get_loop() -> asyncio.AbstractEventLoop:
+    """
+    Worker süreci başına bir kez başlatılan, arka plan thread'inde çalışan olay döngüsünü döndürür.
+
+    Döngü ilk kullanımda başlatılır; böylece gunicorn fork'undan önce thread açılmaz.
+    Fork edilmiş süreçte yeni bir döngü başlatılır.
+
+    Returns:
+        asyncio.AbstractEventLoop: Paylaşılan olay döngüsü
+    """
+    global _loop, _loop_pid
+    pid = os.getpid()
+    loop = _loop
+    if loop is not None and _loop_pid == pid:
+        return loop
+
+    with _loop_lock:
+        if _loop is None or _loop_pid != pid:
+            loop = asyncio.new_event_loop()
+            thread = threading.Thread(target=loop.run_forever, name='async-pipeline', daemon=True)
+            thread.start()
+            _loop = loop
+            _loop_pid = pid
+            logger.debug("Asenkron pipeline olay döngüsü başlatıldı (pid=%s)", pid)
+        return _loop
+
+def submit(coroutine_function: Callable[..., Coroutine[Any, Any, Any]], *args: Any) -> Future:
+    """
+    Eş yordamı paylaşılan olay döngüsünde, çağıranın bağlamında (istek kimliği,
+    Gemini önceliği) çalıştırır.
+
+    Dönen Future thread havuzu sonuçları gibi kullanılabilir (as_completed, result);
+    Future iptal edilirse görev de iptal edilir.
+
+    Args:
+        coroutine_function (Callable): Eş yordam işlevi
+        *args: İşleve verilecek argümanlar
+
+    Returns:
+        Future: Görevin sonucu
+    """
+    loop = get_loop()
+    context = contextvars.copy_context()
+    future = Future()
+
+    def start() -> None:
+        if future.cancelled():
+            # as_completed/wait bekleyenlerine iptal bildirilir
+            future.set_running_or_notify_cancel()
+            return
+        task = loop.create_task(coroutine_function(*args), context=context)
+
+        def finish(task: asyncio.Task) -> None:
+            # Sonuç yazılmadan önce Future çalışıyor durumuna geçer; iptal edilmişse
+            # set_running_or_notify_cancel bekleyenlere bildirir ve False döner
+            if task.cancelled():
+                future.cancel()
+            if not future.set_running_or_notify_cancel():
+                return
+            if task.exception() is not None:
+                future.set_exception(task.exception())
+            else:
+                future.set_result(task.result())
+
+        task.add_done_callback(finish)
+        future.add_done_callback(lambda f: f.cancelled() and loop.call_soon_threadsafe(task.cancel))
+
+    loop.call_soon_threadsafe(start)
+    return future
+
+def run(coroutine_function: Callable[..., Coroutine[Any, Any, Any]], *args: Any) -> Any:
+    """
+    Eş yordamı paylaşılan olay döngüsünde çalıştırır ve sonucunu bekler.
+
+    Olay döngüsü thread'inin içinden çağrılmamalıdır.
+    """
+    return submit(coroutine_function, *args).result()
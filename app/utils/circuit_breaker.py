@@ -0,0 +1,83 @@
+import time
+import logging
+import threading
+
+# Loglama yapılandırması
+logger = logging.getLogger(__name__)
+
+class CircuitBreaker:
+    """
+    Art arda başarısız olan bir servise yapılan çağrıları bir süre hemen reddeden devre kesici.
+
+    Durumlar:
+        closed: Çağrılara izin verilir, hatalar sayılır.
+        open: failure_threshold kadar art arda hatadan sonra reset_timeout süresince çağrılar reddedilir.
+        half_open: Süre dolunca tek bir deneme çağrısına izin verilir; başarılıysa devre kapanır.
+    """
+
+    def __init__(self, name: str, failure_threshold: int = 5, reset_timeout: float = 30.0):
+        """
+        CircuitBreaker sınıfını başlatır.
+
+        Args:
+            name (str): Loglarda kullanılacak servis adı
+            failure_threshold (int): Devreyi açan art arda hata sayısı
+            reset_timeout (float): Devrenin açık kalacağı süre (saniye)
+        """
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self._failures = 0
+        self._opened_at = None
+        self._trial_in_progress = False
+        self._lock = threading.Lock()
+
+    @property
+    def state(self) -> str:
+        with self._lock:
+            return self._state()
+
+    def _state(self) -> str:
+        # Kilit tutulurken çağrılmalıdır
+        if self._opened_at is None:
+            return 'closed'
+        if time.monotonic() - self._opened_at >= self.reset_timeout:
+            return 'half_open'
+        return 'open'
+
+    def allow(self) -> bool:
+        """
+        Yeni bir çağrıya izin verilip verilmediğini döndürür.
+        """
+        with self._lock:
+            state = self._state()
+            if state == 'closed':
+                return True
+            if state == 'half_open' and not self._trial_in_progress:
+                self._trial_in_progress = True
+                return True
+            return False
+
+    def record_success(self) -> None:
+        with self._lock:
+            if self._opened_at is not None:
+                logger.info("%s devresi kapandı.", self.name)
+            self._failures = 0
+            self._opened_at = None
+            self._trial_in_progress = False
+
+    def cancel_trial(self) -> None:
+        """
+        Sonuçlanmadan bırakılan (ör. iptal edilen) deneme çağrısının yerine yeni bir denemeye izin verir.
+        """
+        with self._lock:
+            self._trial_in_progress = False
+
+    def record_failure(self) -> None:
+        with self._lock:
+            self._failures += 1
+            self._trial_in_progress = False
+            if self._opened_at is not None or self._failures >= self.failure_threshold:
+                if self._state() != 'open':
+                    logger.warning("%s devresi açıldı (%s art arda hata).", self.name, self._failures)
+                self._opened_at = time.monotonic()
@@ -0,0 +1,657 @@
+import os
+import queue
+import asyncio
+import hashlib
+import logging
+import threading
+import contextvars
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Dict, Any, Callable, Iterator, List, Optional, Tuple
+from .transcript_processor import TranscriptProcessor
+from .ai_analyzer import get_analyzer
+from .test_generator import MAX_QUESTIONS, TestGenerator, iter_streamed_questions
+from .flalingo_service import FlalingoService, FlalingoError
+from .llm_cache import MemoryCache
+from .exercise_store import ExerciseStore
+from .single_flight import SingleFlight, SingleFlightTimeout
+from .metrics import StageTimer
+from .gemini_governor import BACKGROUND, request_priority
+from . import async_runtime
+
+# Loglama yapılandırması
+logger = logging.getLogger(__name__)
+
+# Pipeline aşamaları ve yaklaşık ilerleme yüzdeleri
+STAGES = {
+    'fetching_transcript': 10,
+    'processing_transcript': 25,
+    'analyzing': 40,
+    'generating_tests': 70,
+    'parsing_tests': 90,
+    'completed': 100
+}
+
+# Flalingo hata kodlarının HTTP karşılıkları
+FLALINGO_STATUS_CODES = {
+    'AUTH_ERROR': 401,
+    'REPORT_NOT_FOUND': 404,
+    'SERVICE_ERROR': 503
+}
+
+# Aynı rapor için kısa süreli egzersiz önbelleği (sayfa yenilemeleri için)
+_exercise_cache = MemoryCache(
+    max_entries=int(os.getenv("EXERCISE_CACHE_MAX_ENTRIES", "512")),
+    ttl=float(os.getenv("EXERCISE_CACHE_TTL", "300"))
+)
+
+# Worker'lar arasında paylaşılan kalıcı egzersiz deposu (EXERCISE_STORE_PATH verilmişse)
+_exercise_store = ExerciseStore.from_env()
+
+# Aynı rapor için eş zamanlı gelen istekleri (senkron, akış ve asenkron yollar) birleştirir.
+# Bekleyenler, üreten istek takılırsa süresiz beklememek için en fazla istek bütçesi kadar
+# bekler (Flalingo okuması + iki Gemini çağrısının kuyruk süresi)
+_in_flight = SingleFlight(wait_timeout=float(os.getenv("EXERCISE_INFLIGHT_WAIT_TIMEOUT", "90")))
+
+# Asenkron pipeline'da aynı anda üretilen rapor sayısını sınırlar (olay döngüsü, semafor)
+_async_limit = None
+
+# Toplu egzersiz isteklerinin paylaştığı sınırlı iş parçacığı havuzu
+_batch_executor = None
+_batch_executor_lock = threading.Lock()
+
+def _get_batch_executor() -> ThreadPoolExecutor:
+    # Havuz ilk toplu istekte oluşturulur; böylece fork öncesi thread açılmaz
+    global _batch_executor
+    if _batch_executor is None:
+        with _batch_executor_lock:
+            if _batch_executor is None:
+                _batch_executor = ThreadPoolExecutor(
+                    max_workers=int(os.getenv("BATCH_EXERCISE_WORKERS", "8")),
+                    thread_name_prefix='exercise-batch'
+                )
+    return _batch_executor
+
+def combined_mode_enabled() -> bool:
+    """
+    GEMINI_COMBINED_MODE=1 ise analiz ve test üretimi tek istekte yapılır.
+    """
+    return os.getenv("GEMINI_COMBINED_MODE", "0").lower() in ("1", "true", "yes")
+
+def async_pipeline_enabled() -> bool:
+    """
+    EXERCISE_ASYNC_PIPELINE=1 ise toplu egzersiz istekleri asenkron pipeline ile üretilir.
+    """
+    return os.getenv("EXERCISE_ASYNC_PIPELINE", "0").lower() in ("1", "true", "yes")
+
+def exercise_store_enabled() -> bool:
+    """
+    Kalıcı egzersiz deposu (EXERCISE_STORE_PATH) yapılandırılmışsa True döndürür.
+    """
+    return _exercise_store is not None
+
+class PipelineError(Exception):
+    """Egzersiz pipeline'ı için özel hata sınıfı"""
+    def __init__(self, message: str, status_code: int = 500):
+        self.message = message
+        self.status_code = status_code
+        super().__init__(message)
+
+def _fetch_transcript(auth_token: str, flai_report: str) -> Dict[str, Any]:
+    """
+    Flalingo'dan transkript verisini alır.
+
+    Raises:
+        PipelineError: Transkript alınamadığında
+    """
+    flalingo_service = FlalingoService()
+    try:
+        transcript_response = flalingo_service.get_transcript(auth_token, flai_report)
+    except FlalingoError as e:
+        raise PipelineError(e.message, FLALINGO_STATUS_CODES.get(e.code, 500))
+
+    if not transcript_response.get('success', False):
+        raise PipelineError(transcript_response.get('error', 'Transkript alınamadı'))
+
+    return transcript_response['data']
+
+def generate_exercise(auth_token: str, flai_report: str,
+                      progress: Optional[Callable[[str], None]] = None) -> Dict[str, Any]:
+    """
+    Flalingo'dan transkripti alır, analiz eder ve test sorularını oluşturur.
+
+    Aşama süreleri flai_pipeline_stage_seconds{pipeline="exercise"} metriğine yazılır.
+
+    Args:
+        auth_token (str): API token
+        flai_report (str): Flai report ID
+        progress (Callable[[str], None], optional): Her aşama başladığında çağrılır
+
+    Returns:
+        Dict[str, Any]: 'analysis', 'tests' ve 'fallback' (örnek sorular kullanıldıysa True)
+            anahtarlarını içeren egzersiz verisi
+
+    Raises:
+        PipelineError: Herhangi bir aşama başarısız olduğunda
+    """
+    timer = StageTimer('exercise')
+
+    def report(stage: str) -> None:
+        if stage == 'completed':
+            timer.stop()
+        else:
+            timer.start(stage)
+        if progress:
+            progress(stage)
+
+    try:
+        return _run_pipeline(auth_token, flai_report, report)
+    finally:
+        # Hata durumunda yarım kalan aşama da ölçülür
+        timer.stop()
+
+def _run_pipeline(auth_token: str, flai_report: str, report: Callable[[str], None]) -> Dict[str, Any]:
+    """
+    generate_exercise aşamalarını sırayla çalıştırır; her aşamanın başında report() çağrılır.
+    """
+    # Flalingo'dan transkript al
+    report('fetching_transcript')
+    transcript_data = _fetch_transcript(auth_token, flai_report)
+
+    # Transkript verisini işle
+    report('processing_transcript')
+    processed_data = TranscriptProcessor(transcript_data).process_transcript()
+
+    # AI analizi yap
+    report('analyzing')
+    analyzer = get_analyzer()
+    if combined_mode_enabled():
+        # Analiz ve testler tek bir Gemini isteğiyle üretilir
+        analysis_result, tests_result = analyzer.analyze_and_generate_zoom_tests(processed_data)
+    else:
+        analysis_result = analyzer.analyze_zoom_transcript(processed_data)
+        tests_result = None
+
+    if not analysis_result.get('success', False):
+        raise PipelineError('Transkript analizi başarısız')
+
+    # Test oluştur
+    if tests_result is None:
+        report('generating_tests')
+        tests_result = analyzer.generate_zoom_tests(analysis_result, processed_data)
+
+    if not tests_result.get('success', False):
+        raise PipelineError('Test oluşturma başarısız')
+
+    # Test verilerini işle (JSON formatı için)
+    report('parsing_tests')
+    processed_tests = _parse_tests(tests_result.get('raw_tests', ''))
+
+    report('completed')
+    return {
+        'analysis': analysis_result.get('raw_analysis', ''),
+        'tests': processed_tests,
+        'fallback': bool(tests_result.get('fallback', False))
+    }
+
+def _parse_tests(raw_tests: str) -> List[Dict[str, Any]]:
+    test_generator = TestGenerator(raw_tests)
+    test_generator.process_tests()
+    return test_generator.get_tests_as_json()  # En fazla MAX_QUESTIONS soru
+
+async def _fetch_transcript_async(auth_token: str, flai_report: str) -> Dict[str, Any]:
+    """
+    _fetch_transcript'in eş yordam sürümü.
+
+    Raises:
+        PipelineError: Transkript alınamadığında
+    """
+    try:
+        transcript_response = await FlalingoService().get_transcript_async(auth_token, flai_report)
+    except FlalingoError as e:
+        raise PipelineError(e.message, FLALINGO_STATUS_CODES.get(e.code, 500))
+
+    if not transcript_response.get('success', False):
+        raise PipelineError(transcript_response.get('error', 'Transkript alınamadı'))
+
+    return transcript_response['data']
+
+async def generate_exercise_async(auth_token: str, flai_report: str,
+                                  progress: Optional[Callable[[str], None]] = None) -> Dict[str, Any]:
+    """
+    generate_exercise'in eş yordam sürümü.
+
+    Flalingo ve Gemini çağrıları olay döngüsünde beklenir; transkript işleme ve test
+    ayrıştırma gibi CPU aşamaları thread'lere aktarılır. Böylece tek bir thread
+    yüzlerce dersin analizini aynı anda sürdürebilir.
+
+    Args:
+        auth_token (str): API token
+        flai_report (str): Flai report ID
+        progress (Callable[[str], None], optional): Her aşama başladığında çağrılır
+
+    Returns:
+        Dict[str, Any]: generate_exercise ile aynı yapıda egzersiz verisi
+
+    Raises:
+        PipelineError: Herhangi bir aşama başarısız olduğunda
+    """
+    timer = StageTimer('exercise')
+
+    def report(stage: str) -> None:
+        if stage == 'completed':
+            timer.stop()
+        else:
+            timer.start(stage)
+        if progress:
+            progress(stage)
+
+    try:
+        return await _run_pipeline_async(auth_token, flai_report, report)
+    finally:
+        timer.stop()
+
+async def _run_pipeline_async(auth_token: str, flai_report: str, report: Callable[[str], None]) -> Dict[str, Any]:
+    """
+    _run_pipeline aşamalarının eş yordam sürümü.
+    """
+    report('fetching_transcript')
+    transcript_data = await _fetch_transcript_async(auth_token, flai_report)
+
+    report('processing_transcript')
+    processed_data = await asyncio.to_thread(TranscriptProcessor(transcript_data).process_transcript)
+
+    report('analyzing')
+    analyzer = get_analyzer()
+    if combined_mode_enabled():
+        analysis_result, tests_result = await analyzer.analyze_and_generate_zoom_tests_async(processed_data)
+    else:
+        analysis_result = await analyzer.analyze_zoom_transcript_async(processed_data)
+        tests_result = None
+
+    if not analysis_result.get('success', False):
+        raise PipelineError('Transkript analizi başarısız')
+
+    if tests_result is None:
+        report('generating_tests')
+        tests_result = await analyzer.generate_zoom_tests_async(analysis_result, processed_data)
+
+    if not tests_result.get('success', False):
+        raise PipelineError('Test oluşturma başarısız')
+
+    report('parsing_tests')
+    processed_tests = await asyncio.to_thread(_parse_tests, tests_result.get('raw_tests', ''))
+
+    report('completed')
+    return {
+        'analysis': analysis_result.get('raw_analysis', ''),
+        'tests': processed_tests,
+        'fallback': bool(tests_result.get('fallback', False))
+    }
+
+def _exercise_key(auth_token: str, flai_report: str) -> str:
+    # Token'ın özeti anahtara eklenir; böylece önbellek, raporu Flalingo'dan
+    # hiç almamış bir token'a sonuç sunmaz
+    token_hash = hashlib.sha256(auth_token.encode('utf-8')).hexdigest()[:16]
+    return f"{flai_report}:{token_hash}"
+
+def _lookup_exercise(key: str) -> Optional[Dict[str, Any]]:
+    """
+    Egzersizi önce bellek önbelleğinde, sonra kalıcı depoda arar.
+    """
+    exercise = _exercise_cache.get(key)
+    if exercise is None and _exercise_store is not None:
+        exercise = _exercise_store.get(key)
+        if exercise is not None:
+            # Sonraki istekler için bu worker'ın belleğine al
+            _exercise_cache.set(key, exercise)
+    return exercise
+
+def _save_exercise(key: str, flai_report: str, exercise: Dict[str, Any]) -> None:
+    """
+    Egzersizi bellek önbelleğine ve (yapılandırılmışsa) kalıcı depoya yazar.
+
+    Örnek sorularla tamamlanmış sonuçlar (fallback) saklanmaz; geçici bir Gemini
+    hatasından sonraki istekler yeniden üretim dener.
+    """
+    if exercise.get('fallback'):
+        logger.warning("Örnek sorular içeren egzersiz saklanmadı: %s", flai_report)
+        return
+    _exercise_cache.set(key, exercise)
+    if _exercise_store is not None:
+        _exercise_store.set(key, flai_report, exercise)
+
+def get_or_generate_exercise(auth_token: str, flai_report: str,
+                             progress: Optional[Callable[[str], None]] = None) -> Dict[str, Any]:
+    """
+    Egzersizi önbellekten döndürür; yoksa üretir.
+
+    Aynı rapor için eş zamanlı gelen istekler tek bir üretimi paylaşır.
+    Başarılı sonuçlar EXERCISE_CACHE_TTL saniye bellekte, depo yapılandırılmışsa
+    EXERCISE_STORE_TTL saniye depoda saklanır; hatalar ve örnek sorularla
+    tamamlanmış sonuçlar ('fallback': True) saklanmaz.
+
+    Args:
+        auth_token (str): API token
+        flai_report (str): Flai report ID
+        progress (Callable[[str], None], optional): Her aşama başladığında çağrılır
+
+    Returns:
+        Dict[str, Any]: 'analysis' ve 'tests' anahtarlarını içeren egzersiz verisi
+
+    Raises:
+        PipelineError: Herhangi bir aşama başarısız olduğunda
+    """
+    key = _exercise_key(auth_token, flai_report)
+    exercise = _lookup_exercise(key)
+    if exercise is not None:
+        logger.debug("Egzersiz önbellekten alındı: %s", flai_report)
+        if progress:
+            progress('completed')
+        return exercise
+
+    def produce() -> Dict[str, Any]:
+        # Önceki üretim, önbellek kontrolünden hemen sonra bitmiş olabilir
+        cached = _lookup_exercise(key)
+        if cached is not None:
+            return cached
+        result = generate_exercise(auth_token, flai_report, progress=progress)
+        _save_exercise(key, flai_report, result)
+        return result
+
+    exercise, shared = _coalesce(key, produce)
+    if shared and progress:
+        progress('completed')
+    return exercise
+
+def _coalesce(key: str, produce: Callable[[], Dict[str, Any]]) -> Tuple[Dict[str, Any], bool]:
+    """
+    Üretimi aynı rapor için devam eden üretimle birleştirir.
+
+    Raises:
+        PipelineError: Devam eden üretim bekleme süresi içinde bitmezse (504)
+    """
+    try:
+        return _in_flight.do(key, produce)
+    except SingleFlightTimeout as e:
+        logger.warning("%s", e)
+        raise PipelineError('Egzersiz üretimi zaman aşımına uğradı', 504)
+
+def pregenerate_exercise(auth_token: str, flai_report: str,
+                         progress: Optional[Callable[[str], None]] = None) -> Dict[str, Any]:
+    """
+    Egzersizi daha sonraki GET isteği için önceden üretip saklar (ders bitiş bildirimi).
+
+    Sonuç _exercise_key(auth_token, flai_report) anahtarıyla saklanır; anahtar token'ın
+    özetini içerdiğinden öğrencinin egzersizi açarken kullanacağı token ile çağrılmalıdır.
+
+    Args:
+        auth_token (str): Öğrencinin API token'ı
+        flai_report (str): Flai report ID
+        progress (Callable[[str], None], optional): Her aşama başladığında çağrılır
+
+    Returns:
+        Dict[str, Any]: Saklanan egzersiz verisi
+
+    Raises:
+        PipelineError: Üretim başarısız olduğunda veya yalnızca örnek sorular üretilebildiğinde
+    """
+    exercise = get_or_generate_exercise(auth_token, flai_report, progress=progress)
+    if exercise.get('fallback'):
+        # Örnek sorular saklanmadı; öğrenci açtığında egzersiz yeniden üretilir
+        raise PipelineError('Gemini yanıtı alınamadı, egzersiz önceden üretilemedi', 503)
+    return exercise
+
+async def get_or_generate_exercise_async(auth_token: str, flai_report: str) -> Dict[str, Any]:
+    """
+    get_or_generate_exercise'ın eş yordam sürümü.
+
+    Önbellek, depo ve eş zamanlı istek birleştirme senkron yol ile paylaşılır: aynı rapor
+    senkron veya asenkron yoldan üretilmekteyse onun sonucu beklenir. Çağıranlardan biri
+    iptal edilirse üretim diğerleri için sürer.
+
+    Args:
+        auth_token (str): API token
+        flai_report (str): Flai report ID
+
+    Returns:
+        Dict[str, Any]: 'analysis' ve 'tests' anahtarlarını içeren egzersiz verisi
+
+    Raises:
+        PipelineError: Herhangi bir aşama başarısız olduğunda
+    """
+    key = _exercise_key(auth_token, flai_report)
+    exercise = _exercise_cache.get(key)
+    if exercise is None and _exercise_store is not None:
+        exercise = await asyncio.to_thread(_lookup_exercise, key)
+    if exercise is not None:
+        logger.debug("Egzersiz önbellekten alındı: %s", flai_report)
+        return exercise
+
+    async def produce() -> Dict[str, Any]:
+        result = await generate_exercise_async(auth_token, flai_report)
+        if _exercise_store is not None:
+            await asyncio.to_thread(_save_exercise, key, flai_report, result)
+        else:
+            _save_exercise(key, flai_report, result)
+        return result
+
+    try:
+        exercise, _ = await _in_flight.do_async(key, produce)
+    except SingleFlightTimeout as e:
+        logger.warning("%s", e)
+        raise PipelineError('Egzersiz üretimi zaman aşımına uğradı', 504)
+    return exercise
+
+def _get_async_limit() -> asyncio.Semaphore:
+    # Semafor çalışan olay döngüsüne bağlıdır
+    global _async_limit
+    loop = asyncio.get_running_loop()
+    if _async_limit is None or _async_limit[0] is not loop:
+        _async_limit = (loop, asyncio.Semaphore(int(os.getenv("EXERCISE_ASYNC_CONCURRENCY", "256"))))
+    return _async_limit[1]
+
+def stream_exercise(auth_token: str, flai_report: str) -> Iterator[Tuple[str, Dict[str, Any]]]:
+    """
+    Egzersizi üretirken her aşamanın sonucunu olay olarak üretir.
+
+    Test soruları, Gemini yanıtı akış halinde gelirken her soru tamamlandığı anda
+    gönderilir. Olaylar sırasıyla: transcript_fetched, statistics, analysis,
+    question (soru başına), completed.
+
+    Önbellek ve eş zamanlı istek birleştirme get_or_generate_exercise ile paylaşılır:
+    aynı rapor başka bir istekte üretiliyorsa onun sonucu beklenir ve analysis,
+    question ve completed olayları sonuçtan gönderilir.
+
+    Args:
+        auth_token (str): API token
+        flai_report (str): Flai report ID
+
+    Yields:
+        Tuple[str, Dict[str, Any]]: Olay adı ve verisi
+
+    Raises:
+        PipelineError: Herhangi bir aşama başarısız olduğunda
+    """
+    key = _exercise_key(auth_token, flai_report)
+    exercise = _lookup_exercise(key)
+    if exercise is not None:
+        logger.debug("Egzersiz önbellekten akışa verildi: %s", flai_report)
+    else:
+        events = queue.Queue()
+
+        def produce() -> Dict[str, Any]:
+            cached = _lookup_exercise(key)
+            if cached is not None:
+                return cached
+            result = None
+            for event, data in _stream_pipeline(auth_token, flai_report):
+                if event == 'completed':
+                    result = data
+                else:
+                    events.put((event, data))
+            _save_exercise(key, flai_report, result)
+            return result
+
+        def run() -> None:
+            # Üretim ayrı thread'de sürer; istemci bağlantıyı kesse de sonuç bekleyenlere ve önbelleğe ulaşır
+            try:
+                events.put((None, _coalesce(key, produce)))
+            except Exception as e:
+                events.put((None, e))
+
+        threading.Thread(target=contextvars.copy_context().run, args=(run,),
+                         name='exercise-stream', daemon=True).start()
+        streamed = False
+        while True:
+            event, data = events.get()
+            if event is not None:
+                streamed = True
+                yield event, data
+                continue
+            if isinstance(data, Exception):
+                raise data
+            exercise, shared = data
+            break
+        if streamed:
+            yield 'completed', exercise
+            return
+        logger.debug("Egzersiz eş zamanlı üretimden akışa verildi: %s (paylaşıldı: %s)", flai_report, shared)
+
+    yield 'analysis', {'analysis': exercise['analysis']}
+    for index, question in enumerate(exercise['tests']):
+        yield 'question', {'index': index, 'question': question}
+    yield 'completed', exercise
+
+def _stream_pipeline(auth_token: str, flai_report: str) -> Iterator[Tuple[str, Dict[str, Any]]]:
+    """
+    stream_exercise olaylarını üretir; son olay ('completed') egzersiz verisini taşır.
+
+    Akıştan hiç soru ayrıştırılamazsa tam yanıt senkron yoldaki gibi işlenir: kod bloğu
+    içeren yanıt TestGenerator ile (gerekirse manuel) ayrıştırılır, aksi halde örnek
+    sorular kullanılır ve sonuç 'fallback' olarak işaretlenir.
+
+    Birleşik modda (GEMINI_COMBINED_MODE) analiz ve testler _run_pipeline'daki gibi tek
+    Gemini isteğiyle üretilir; sorular yanıt geldikten sonra gönderilir.
+    """
+    transcript_data = _fetch_transcript(auth_token, flai_report)
+    yield 'transcript_fetched', {'flai_report': flai_report}
+
+    processed_data = TranscriptProcessor(transcript_data).process_transcript()
+    yield 'statistics', {
+        'statistics': processed_data.get('calculations', {}).get('statistics', {})
+    }
+
+    analyzer = get_analyzer()
+    if combined_mode_enabled():
+        analysis_result, tests_result = analyzer.analyze_and_generate_zoom_tests(processed_data)
+    else:
+        analysis_result = analyzer.analyze_zoom_transcript(processed_data)
+        tests_result = None
+    if not analysis_result.get('success', False):
+        raise PipelineError('Transkript analizi başarısız')
+    yield 'analysis', {'analysis': analysis_result.get('raw_analysis', '')}
+
+    if tests_result is not None:
+        if not tests_result.get('success', False):
+            raise PipelineError('Test oluşturma başarısız')
+        tests = _parse_tests(tests_result.get('raw_tests', ''))
+        for index, question in enumerate(tests):
+            yield 'question', {'index': index, 'question': question}
+        yield 'completed', {
+            'analysis': analysis_result.get('raw_analysis', ''),
+            'tests': tests,
+            'fallback': bool(tests_result.get('fallback', False))
+        }
+        return
+
+    parts = []
+
+    def collect(chunks: Iterator[str]) -> Iterator[str]:
+        for chunk in chunks:
+            parts.append(chunk)
+            yield chunk
+
+    tests = []
+    chunks = analyzer.stream_zoom_tests(analysis_result, processed_data, fallback=False)
+    for question in iter_streamed_questions(collect(chunks)):
+        yield 'question', {'index': len(tests), 'question': question}
+        tests.append(question)
+        if len(tests) >= MAX_QUESTIONS:
+            # Kalan yanıt okunmaz; senkron yol da en fazla MAX_QUESTIONS soru döndürür
+            logger.debug("Soru sınırına (%s) ulaşıldı, akış kapatılıyor: %s", MAX_QUESTIONS, flai_report)
+            break
+
+    fallback = False
+    if not tests:
+        tests_result = analyzer.zoom_tests_result("".join(parts) if parts else None)
+        fallback = tests_result['fallback']
+        tests = _parse_tests(tests_result['raw_tests'])
+        for index, question in enumerate(tests):
+            yield 'question', {'index': index, 'question': question}
+
+    yield 'completed', {
+        'analysis': analysis_result.get('raw_analysis', ''),
+        'tests': tests,
+        'fallback': fallback
+    }
+
+def generate_exercises(auth_token: str, flai_reports: List[str],
+                       priority: str = BACKGROUND) -> Iterator[Dict[str, Any]]:
+    """
+    Birden fazla rapor için egzersizleri sınırlı bir havuzda eş zamanlı üretir ve her
+    rapor bittiği anda sonucunu döndürür (tamamlanma sırasıyla).
+
+    Tüm işler süreç genelindeki Flalingo oturumunu ve Gemini istemcisini paylaşır;
+    Gemini çağrıları düzenleyicinin hız sınırlarına tabidir. Her iş çağıranın bağlamında
+    (ör. istek kimliği) ve verilen Gemini önceliğiyle çalışır. Üreteç erken kapatılırsa
+    henüz başlamamış işler iptal edilir.
+
+    EXERCISE_ASYNC_PIPELINE=1 ise raporlar thread havuzu yerine paylaşılan olay döngüsünde
+    asenkron pipeline ile üretilir (aynı anda en fazla EXERCISE_ASYNC_CONCURRENCY rapor).
+
+    Args:
+        auth_token (str): API token
+        flai_reports (List[str]): Flai report ID'leri (tekrarlananlar bir kez üretilir)
+        priority (str): Gemini kuyruğundaki öncelik (varsayılan: arka plan)
+
+    Yields:
+        Dict[str, Any]: Rapor başına {'flai_report', 'success', 'data'} veya
+            {'flai_report', 'success': False, 'error', 'status_code'}
+    """
+    def run(flai_report: str) -> Dict[str, Any]:
+        try:
+            with request_priority(priority):
+                exercise = get_or_generate_exercise(auth_token, flai_report)
+            return {'flai_report': flai_report, 'success': True, 'data': exercise}
+        except Exception as e:
+            return _batch_error(flai_report, e)
+
+    async def run_async(flai_report: str) -> Dict[str, Any]:
+        try:
+            async with _get_async_limit():
+                with request_priority(priority):
+                    exercise = await get_or_generate_exercise_async(auth_token, flai_report)
+            return {'flai_report': flai_report, 'success': True, 'data': exercise}
+        except Exception as e:
+            return _batch_error(flai_report, e)
+
+    if async_pipeline_enabled():
+        futures = [async_runtime.submit(run_async, flai_report) for flai_report in dict.fromkeys(flai_reports)]
+    else:
+        executor = _get_batch_executor()
+        futures = [executor.submit(contextvars.copy_context().run, run, flai_report)
+                   for flai_report in dict.fromkeys(flai_reports)]
+    try:
+        for future in as_completed(futures):
+            yield future.result()
+    finally:
+        for future in futures:
+            future.cancel()
+
+def _batch_error(flai_report: str, error: Exception) -> Dict[str, Any]:
+    if isinstance(error, PipelineError):
+        return {'flai_report': flai_report, 'success': False, 'error': error.message,
+                'status_code': error.status_code}
+    logger.error("Toplu egzersiz üretiminde hata (%s): %s", flai_report, error)
+    return {'flai_report': flai_report, 'success': False, 'error': f'İşlem hatası: {str(error)}',
+            'status_code': 500}
@@ -0,0 +1,165 @@
+import os
+import json
+import time
+import sqlite3
+import logging
+import itertools
+import threading
+from typing import Any, Dict, Optional
+
+# Loglama yapılandırması
+logger = logging.getLogger(__name__)
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS exercises (
+    key TEXT PRIMARY KEY,
+    flai_report TEXT NOT NULL,
+    created_at REAL NOT NULL,
+    expires_at REAL,
+    payload TEXT NOT NULL
+)
+"""
+
+# Arka plan egzersiz işlerinin durumları (JobManager); işi hangi worker çalıştırırsa
+# çalıştırsın durum sorgusu her worker'dan yanıtlanabilir
+_JOBS_SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    job_id TEXT PRIMARY KEY,
+    expires_at REAL NOT NULL,
+    payload TEXT NOT NULL
+)
+"""
+
+class ExerciseStore:
+    """
+    Üretilmiş egzersizleri SQLite dosyasında saklar.
+
+    Dosya aynı makinedeki tüm worker süreçleri tarafından paylaşılır; böylece ders
+    bitiminde arka planda üretilen bir egzersiz, isteği hangi worker karşılarsa
+    karşılasın milisaniyeler içinde döndürülür. Bağlantılar thread ve süreç başına açılır.
+    """
+
+    def __init__(self, path: str, ttl: Optional[float] = None):
+        """
+        ExerciseStore sınıfını başlatır.
+
+        Args:
+            path (str): SQLite dosyasının yolu
+            ttl (float, optional): Kayıtların geçerlilik süresi (saniye); None ise süresiz
+        """
+        self.path = path
+        self.ttl = ttl
+        self._local = threading.local()
+        # Yazma sayacı birçok thread'den artırılır; next() atomiktir
+        self._writes = itertools.count(1)
+
+    @classmethod
+    def from_env(cls) -> Optional['ExerciseStore']:
+        """
+        EXERCISE_STORE_PATH verilmişse yapılandırılmış bir depo döndürür, verilmemişse None.
+        """
+        path = os.getenv("EXERCISE_STORE_PATH", "")
+        if not path:
+            return None
+        ttl = float(os.getenv("EXERCISE_STORE_TTL", str(7 * 24 * 3600)))
+        return cls(path, ttl=ttl or None)
+
+    def _connection(self) -> sqlite3.Connection:
+        # Fork edilmiş süreçte üst sürecin bağlantısı kullanılmaz
+        connection = getattr(self._local, 'connection', None)
+        if connection is None or self._local.pid != os.getpid():
+            directory = os.path.dirname(self.path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            connection = sqlite3.connect(self.path, timeout=5.0, isolation_level=None)
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.execute("PRAGMA synchronous=NORMAL")
+            connection.execute(_SCHEMA)
+            connection.execute(_JOBS_SCHEMA)
+            self._local.connection = connection
+            self._local.pid = os.getpid()
+        return connection
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        """
+        Anahtara karşılık gelen egzersizi döndürür; yoksa, süresi dolduysa veya okunamazsa None.
+        """
+        try:
+            row = self._connection().execute(
+                "SELECT payload, expires_at FROM exercises WHERE key = ?", (key,)).fetchone()
+        except sqlite3.Error as e:
+            logger.warning("Egzersiz deposundan okunamadı: %s", e)
+            return None
+        if row is None:
+            return None
+        payload, expires_at = row
+        if expires_at is not None and expires_at < time.time():
+            self.delete(key)
+            return None
+        return json.loads(payload)
+
+    def set(self, key: str, flai_report: str, exercise: Dict[str, Any]) -> None:
+        """
+        Egzersizi yazar; aynı anahtardaki önceki kaydın yerine geçer.
+        """
+        now = time.time()
+        expires_at = now + self.ttl if self.ttl else None
+        try:
+            self._connection().execute(
+                "INSERT OR REPLACE INTO exercises (key, flai_report, created_at, expires_at, payload) "
+                "VALUES (?, ?, ?, ?, ?)",
+                (key, flai_report, now, expires_at, json.dumps(exercise, ensure_ascii=False)))
+        except sqlite3.Error as e:
+            logger.warning("Egzersiz depoya yazılamadı: %s", e)
+            return
+        # Hiç okunmayan eski kayıtlar da arada bir temizlenir
+        if next(self._writes) % 100 == 0 and self.ttl:
+            self.purge_expired()
+
+    def delete(self, key: str) -> None:
+        try:
+            self._connection().execute("DELETE FROM exercises WHERE key = ?", (key,))
+        except sqlite3.Error as e:
+            logger.warning("Egzersiz depodan silinemedi: %s", e)
+
+    def set_job(self, job: Dict[str, Any], ttl: float) -> None:
+        """
+        İş kaydını yazar; kayıt her güncellemeden sonra ttl saniye geçerlidir.
+        """
+        try:
+            self._connection().execute(
+                "INSERT OR REPLACE INTO jobs (job_id, expires_at, payload) VALUES (?, ?, ?)",
+                (job['job_id'], time.time() + ttl, json.dumps(job, ensure_ascii=False)))
+        except sqlite3.Error as e:
+            logger.warning("İş durumu depoya yazılamadı: %s", e)
+
+    def get_job(self, job_id: str) -> Optional[Dict[str, Any]]:
+        """
+        İş kaydını döndürür; yoksa, süresi dolduysa veya okunamazsa None.
+        """
+        try:
+            row = self._connection().execute(
+                "SELECT payload FROM jobs WHERE job_id = ? AND expires_at >= ?", (job_id, time.time())).fetchone()
+        except sqlite3.Error as e:
+            logger.warning("İş durumu depodan okunamadı: %s", e)
+            return None
+        return json.loads(row[0]) if row is not None else None
+
+    def purge_expired(self) -> int:
+        """
+        Süresi dolmuş egzersiz ve iş kayıtlarını siler.
+
+        Returns:
+            int: Silinen kayıt sayısı
+        """
+        now = time.time()
+        try:
+            connection = self._connection()
+            cursor = connection.execute(
+                "DELETE FROM exercises WHERE expires_at IS NOT NULL AND expires_at < ?", (now,))
+            deleted = cursor.rowcount
+            deleted += connection.execute("DELETE FROM jobs WHERE expires_at < ?", (now,)).rowcount
+            return deleted
+        except sqlite3.Error as e:
+            logger.warning("Egzersiz deposu temizlenemedi: %s", e)
+            return 0
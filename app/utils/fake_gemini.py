@@ -0,0 +1,260 @@
+import os
+import re
+import json
+import math
+import time
+import random
+import asyncio
+import logging
+import threading
+from typing import Any, Dict, Iterator, List, Optional, Union
+
+# Loglama yapılandırması
+logger = logging.getLogger(__name__)
+
+# Hazır profiller; GEMINI_FAKE_* değişkenleriyle tek tek ezilebilir
+PROFILES = {
+    'instant': {'latency': 0.0, 'latency_distribution': 'fixed', 'chunk_delay': 0.0,
+                'malformed_rate': 0.0, 'error_rate': 0.0},
+    'realistic': {'latency': 2.5, 'latency_distribution': 'lognormal', 'latency_sigma': 0.35,
+                  'chunk_delay': 0.08, 'malformed_rate': 0.02, 'error_rate': 0.01},
+    'slow': {'latency': 8.0, 'latency_distribution': 'lognormal', 'latency_sigma': 0.5,
+             'chunk_delay': 0.25, 'malformed_rate': 0.02, 'error_rate': 0.01},
+    'flaky': {'latency': 2.5, 'latency_distribution': 'uniform', 'chunk_delay': 0.08,
+              'malformed_rate': 0.15, 'error_rate': 0.1}
+}
+
+_WORD_RE = re.compile(r"\b[A-Za-z]{6,}\b")
+
+class FakeGeminiError(Exception):
+    """google.api_core yoksa sahte modelin fırlattığı hata"""
+
+class FakeResponse:
+    """genai yanıtı yerine kullanılan nesne (yalnızca .text)"""
+    def __init__(self, text: str):
+        self.text = text
+
+class FakeGenerativeModel:
+    """
+    genai.GenerativeModel yerine kullanılabilen, ağ erişimi olmayan sahte Gemini modeli.
+
+    İstemin türüne göre (analiz, test, birleşik, soru türleri) şablondan geçerli JSON
+    üretir. Gecikme dağılımı, akış parçalarının aralığı, bozuk çıktı ve hata oranları
+    ayarlanabilir; böylece zaman aşımı ve verim çalışmaları kota harcamadan yapılabilir.
+    """
+
+    def __init__(self, latency: float = 0.0, latency_distribution: str = 'fixed',
+                 latency_sigma: float = 0.35, chunk_size: int = 80, chunk_delay: float = 0.0,
+                 malformed_rate: float = 0.0, error_rate: float = 0.0, seed: Optional[int] = None):
+        """
+        FakeGenerativeModel sınıfını başlatır.
+
+        Args:
+            latency (float): İlk yanıta kadar ortalama gecikme (saniye)
+            latency_distribution (str): 'fixed', 'uniform' (0 - 2*latency) veya 'lognormal'
+            latency_sigma (float): lognormal dağılımın yayılımı
+            chunk_size (int): Akış modunda parça başına karakter sayısı
+            chunk_delay (float): Akış modunda parçalar arasındaki gecikme (saniye)
+            malformed_rate (float): Yarıda kesilmiş/JSON olmayan yanıt oranı (0-1)
+            error_rate (float): Hata fırlatılan istek oranı (0-1)
+            seed (int, optional): Tekrarlanabilir çalıştırmalar için rastgele sayı tohumu
+        """
+        if latency_distribution not in ('fixed', 'uniform', 'lognormal'):
+            raise ValueError(f"Bilinmeyen gecikme dağılımı: {latency_distribution}")
+        self.latency = latency
+        self.latency_distribution = latency_distribution
+        self.latency_sigma = latency_sigma
+        self.chunk_size = max(1, chunk_size)
+        self.chunk_delay = chunk_delay
+        self.malformed_rate = malformed_rate
+        self.error_rate = error_rate
+        self.random = random.Random(seed)
+        self._lock = threading.Lock()
+        self.calls = 0
+
+    @classmethod
+    def from_env(cls) -> 'FakeGenerativeModel':
+        """
+        GEMINI_FAKE_PROFILE ve GEMINI_FAKE_* ortam değişkenlerinden model oluşturur.
+
+        Returns:
+            FakeGenerativeModel: Yapılandırılmış sahte model
+        """
+        profile = os.getenv("GEMINI_FAKE_PROFILE", "instant")
+        if profile not in PROFILES:
+            raise ValueError(f"Bilinmeyen sahte Gemini profili: {profile}")
+        options = dict(PROFILES[profile])
+        for name, cast in (('latency', float), ('latency_distribution', str), ('latency_sigma', float),
+                           ('chunk_size', int), ('chunk_delay', float), ('malformed_rate', float),
+                           ('error_rate', float), ('seed', int)):
+            value = os.getenv(f"GEMINI_FAKE_{name.upper()}")
+            if value not in (None, ''):
+                options[name] = cast(value)
+        logger.info("Sahte Gemini modeli kullanılıyor (profil=%s): %s", profile, options)
+        return cls(**options)
+
+    def _sample(self) -> Dict[str, Any]:
+        # Rastgele kararlar tek kilit altında alınır (thread'ler arası tekrarlanabilirlik)
+        with self._lock:
+            self.calls += 1
+            if self.latency_distribution == 'uniform':
+                delay = self.random.uniform(0, 2 * self.latency)
+            elif self.latency_distribution == 'lognormal' and self.latency > 0:
+                # Ortalaması latency olacak şekilde
+                mu = math.log(self.latency) - self.latency_sigma ** 2 / 2
+                delay = self.random.lognormvariate(mu, self.latency_sigma)
+            else:
+                delay = self.latency
+            return {
+                'delay': delay,
+                'error': self.random.random() < self.error_rate,
+                'malformed': self.random.random() < self.malformed_rate,
+                'seed': self.random.random()
+            }
+
+    def _raise_error(self, seed: float) -> None:
+        # google.api_core yalnızca hata üretilirken yüklenir (açılış süresi)
+        try:
+            from google.api_core import exceptions as google_exceptions
+        except ImportError:  # google-generativeai kurulu değilse genel hata sınıfı kullanılır
+            raise FakeGeminiError("Sahte Gemini hatası")
+        if seed < 0.5:
+            raise google_exceptions.ServiceUnavailable("Sahte Gemini hatası: servis kullanılamıyor")
+        raise google_exceptions.ResourceExhausted("Sahte Gemini hatası: kota aşıldı")
+
+    def generate_content(self, prompt: str, stream: bool = False, **kwargs) -> Union[FakeResponse, Iterator[FakeResponse]]:
+        """
+        İstemin türüne göre şablon yanıt üretir.
+
+        Args:
+            prompt (str): İstem
+            stream (bool): True ise yanıt parçalar halinde üretilir
+
+        Returns:
+            Union[FakeResponse, Iterator[FakeResponse]]: Yanıt veya yanıt parçaları
+        """
+        sample = self._sample()
+        text = render_response(prompt, sample['seed'])
+        if sample['malformed']:
+            text = _malform(text, sample['seed'])
+
+        if not stream:
+            time.sleep(sample['delay'])
+            if sample['error']:
+                self._raise_error(sample['seed'])
+            return FakeResponse(text)
+        return self._stream(text, sample)
+
+    async def generate_content_async(self, prompt: str, **kwargs) -> FakeResponse:
+        """
+        generate_content'in eş yordam sürümü; gecikme olay döngüsünü bloklamadan beklenir.
+        """
+        sample = self._sample()
+        text = render_response(prompt, sample['seed'])
+        if sample['malformed']:
+            text = _malform(text, sample['seed'])
+        await asyncio.sleep(sample['delay'])
+        if sample['error']:
+            self._raise_error(sample['seed'])
+        return FakeResponse(text)
+
+    def _stream(self, text: str, sample: Dict[str, Any]) -> Iterator[FakeResponse]:
+        time.sleep(sample['delay'])
+        # Hatalı akışlar birkaç parçadan sonra kesilir
+        fail_at = len(text) // 2 if sample['error'] else None
+        for start in range(0, len(text), self.chunk_size):
+            if fail_at is not None and start >= fail_at:
+                self._raise_error(sample['seed'])
+            if start and self.chunk_delay:
+                time.sleep(self.chunk_delay)
+            yield FakeResponse(text[start:start + self.chunk_size])
+
+    def count_tokens(self, contents: str) -> Dict[str, int]:
+        return {'total_tokens': max(1, len(str(contents)) // 4)}
+
+def _malform(text: str, seed: float) -> str:
+    # Yarısı yarıda kesilmiş JSON, yarısı JSON olmayan açıklama metni
+    if seed < 0.5:
+        return text[:max(1, int(len(text) * 0.6))]
+    return "Üzgünüm, bu transkript için şu an yapılandırılmış bir yanıt oluşturamıyorum."
+
+def _prompt_words(prompt: str, rng: random.Random, count: int) -> List[str]:
+    words = list(dict.fromkeys(word.lower() for word in _WORD_RE.findall(prompt)))
+    if not words:
+        words = ['lesson', 'travel', 'holiday', 'weekend', 'family', 'museum']
+    return [rng.choice(words) for _ in range(count)]
+
+def _questions(rng: random.Random, words: List[str], count: int) -> List[Dict[str, Any]]:
+    return [
+        {
+            'question': f"What does '{words[i % len(words)]}' mean in the lesson?",
+            'options': [{'letter': letter, 'text': f"{words[(i + j) % len(words)]} ({letter})"}
+                        for j, letter in enumerate("ABCD")],
+            'correct_answer': rng.choice("ABCD"),
+            'explanation': f"'{words[i % len(words)]}' was used in the lesson in this sense."
+        }
+        for i in range(count)
+    ]
+
+def render_response(prompt: str, seed: float = 0.0) -> str:
+    """
+    AIAnalyzer istemlerinin türüne göre geçerli bir şablon yanıt oluşturur.
+
+    Args:
+        prompt (str): AIAnalyzer'ın oluşturduğu istem
+        seed (float): Yanıt içeriğini belirleyen tohum
+
+    Returns:
+        str: Model yanıtı
+    """
+    rng = random.Random(seed)
+    words = _prompt_words(prompt, rng, 12)
+    level = rng.choice(['A2', 'B1', 'B2', 'C1'])
+    zoom_analysis = {
+        'ogretmen': 'Teacher',
+        'ogrenci': 'Student',
+        'seviye': level,
+        'guclu_yonler': ['akıcılık', 'kelime bilgisi'],
+        'gelistirilmesi_gerekenler': ['geçmiş zaman', 'edatlar'],
+        'yeni_kelimeler': words[:5],
+        'ana_konular': words[5:8]
+    }
+
+    if '"questions"' in prompt and '"analysis"' in prompt:
+        body = {'analysis': zoom_analysis, 'questions': _questions(rng, words, 5)}
+        return "```json\n" + json.dumps(body, ensure_ascii=False, indent=2) + "\n```"
+    if 'three types of questions' in prompt:
+        body = {
+            'multiple_choice': [dict(q, type='multiple_choice') for q in _questions(rng, words, 10)],
+            'true_false': [{'type': 'true_false', 'question': f"The student used '{word}'.",
+                            'options': [{'id': 'T', 'text': 'True'}, {'id': 'F', 'text': 'False'}],
+                            'correct_answer': 'T', 'explanation': 'It appears in the transcript.'}
+                           for word in words[:5]],
+            'fill_in_blank': [{'type': 'fill_in_blank', 'question': f"We talked about _____ ({word[0]}...).",
+                               'correct_answer': word, 'explanation': 'It appears in the transcript.'}
+                              for word in words[5:10]]
+        }
+        return "```json\n" + json.dumps(body, ensure_ascii=False, indent=2) + "\n```"
+    if 'test sorusu oluştur' in prompt:
+        return "```json\n" + json.dumps(_questions(rng, words, 5), ensure_ascii=False, indent=2) + "\n```"
+    if 'Zoom ders transkriptini analiz et' in prompt:
+        return "```json\n" + json.dumps(zoom_analysis, ensure_ascii=False, indent=2) + "\n```"
+    if 'Analyze the following English lesson transcript' in prompt:
+        body = {
+            'level': level,
+            'strengths': ['fluency', 'vocabulary'],
+            'areas_for_improvement': ['past tense', 'prepositions'],
+            'vocabulary': {'new_words': words[:5], 'expressions': words[5:7]},
+            'topics': words[7:10],
+            'grammar': {'points_covered': ['Past Simple'], 'errors': []},
+            'pronunciation': {'strengths': ['clear vowels'], 'issues': []},
+            'fluency': {'rating': '3/5', 'comments': ['Good flow']}
+        }
+        return "```json\n" + json.dumps(body, ensure_ascii=False, indent=2) + "\n```"
+    return "OK"
+
+def fake_model_enabled() -> bool:
+    """
+    GEMINI_FAKE=1 ise AIAnalyzer gerçek Gemini yerine FakeGenerativeModel kullanır.
+    """
+    return os.getenv("GEMINI_FAKE", "0").lower() in ("1", "true", "yes")
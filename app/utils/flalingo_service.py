@@ -1,6 +1,15 @@
-import requests
+import os
+import time
+import random
+import asyncio
 import logging
-from typing import Dict, Any, List
+import threading
+import requests
+from email.utils import parsedate_to_datetime
+from requests.adapters import HTTPAdapter
+from typing import Dict, Any, List, Optional, Tuple
+from .circuit_breaker import CircuitBreaker
+from .metrics import FLALINGO_ERRORS
 
 logger = logging.getLogger(__name__)
 
@@ -10,6 +19,8 @@ class FlalingoError(Exception):
         self.code = code
         self.message = message
         super().__init__(message)
+        # Her hata kodu oluştuğu anda sayılır
+        FLALINGO_ERRORS.inc(code=code)
 
 ERROR_CODES = {
     'AUTH_ERROR': 'Authentication failed',
@@ -19,16 +30,258 @@ ERROR_CODES = {
     'EVALUATION_ERROR': 'Failed to evaluate answers'
 }
 
+# Yeniden denenecek HTTP durum kodları
+RETRYABLE_STATUS_CODES = {429, 502, 503, 504}
+
+def _retry_after(value: Optional[str]) -> Optional[float]:
+    """
+    Retry-After başlığını (saniye veya HTTP tarihi) bekleme süresine çevirir; yoksa veya okunamazsa None.
+    """
+    if not isinstance(value, str) or not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+
+# Worker süreci başına paylaşılan bağlantı havuzu
+_session = None
+_session_pid = None
+_session_lock = threading.Lock()
+
+# Olay döngüsü başına paylaşılan aiohttp oturumu (asenkron pipeline için)
+_async_session = None
+_async_session_loop = None
+
+# Flalingo servisi bozulduğunda çağrıları hemen reddeden devre kesici
+_breaker = CircuitBreaker(
+    'flalingo',
+    failure_threshold=int(os.getenv("FLALINGO_BREAKER_THRESHOLD", "5")),
+    reset_timeout=float(os.getenv("FLALINGO_BREAKER_RESET", "30"))
+)
+
+def get_session() -> requests.Session:
+    """
+    Worker süreci başına bir kez oluşturulan, bağlantı havuzlu HTTP oturumunu döndürür.
+    
+    Fork sonrası soketler paylaşılmasın diye yeni süreçte oturum yeniden oluşturulur.
+    
+    Returns:
+        requests.Session: Paylaşılan oturum
+    """
+    global _session, _session_pid
+    pid = os.getpid()
+    if _session is not None and _session_pid == pid:
+        return _session
+    
+    with _session_lock:
+        if _session is None or _session_pid != pid:
+            pool_size = int(os.getenv("FLALINGO_POOL_SIZE", "10"))
+            session = requests.Session()
+            # Yeniden denemeler FlalingoService içinde yapılır
+            adapter = HTTPAdapter(pool_connections=1, pool_maxsize=pool_size, max_retries=0)
+            session.mount('https://', adapter)
+            session.mount('http://', adapter)
+            _session = session
+            _session_pid = pid
+        return _session
+
+def get_async_session() -> Any:
+    """
+    Çalışan olay döngüsüne bağlı, bağlantı havuzlu aiohttp oturumunu döndürür.
+    
+    Oturum döngü başına bir kez oluşturulur; eş yordam içinden çağrılmalıdır.
+    aiohttp yalnızca asenkron yol kullanıldığında yüklenir.
+    
+    Returns:
+        aiohttp.ClientSession: Paylaşılan oturum
+    """
+    import aiohttp
+    global _async_session, _async_session_loop
+    loop = asyncio.get_running_loop()
+    if _async_session is None or _async_session_loop is not loop or _async_session.closed:
+        connector = aiohttp.TCPConnector(limit=int(os.getenv("FLALINGO_ASYNC_POOL_SIZE", "100")))
+        _async_session = aiohttp.ClientSession(connector=connector)
+        _async_session_loop = loop
+    return _async_session
+
 class FlalingoService:
     """
     Flalingo API ile iletişim kuran servis sınıfı.
     """
     
-    def __init__(self):
+    def __init__(self, base_url: Optional[str] = None, session: Optional[requests.Session] = None,
+                 breaker: Optional[CircuitBreaker] = None):
         """
         FlalingoService sınıfını başlatır.
+        
+        Args:
+            base_url (str, optional): API adresi; verilmezse FLALINGO_BASE_URL veya varsayılan adres
+            session (requests.Session, optional): HTTP oturumu; verilmezse paylaşılan oturum
+            breaker (CircuitBreaker, optional): Devre kesici; verilmezse paylaşılan devre kesici
+        """
+        self.base_url = base_url or os.getenv("FLALINGO_BASE_URL", "https://exercise.flalingo.com/api")
+        self.session = session or get_session()
+        self.breaker = breaker or _breaker
+        self.timeout = (
+            float(os.getenv("FLALINGO_CONNECT_TIMEOUT", "3.05")),
+            float(os.getenv("FLALINGO_READ_TIMEOUT", "20"))
+        )
+        self.max_retries = int(os.getenv("FLALINGO_MAX_RETRIES", "2"))
+        self.backoff_base = float(os.getenv("FLALINGO_BACKOFF_BASE", "0.25"))
+        self.backoff_max = float(os.getenv("FLALINGO_BACKOFF_MAX", "2"))
+        self.retry_after_max = float(os.getenv("FLALINGO_RETRY_AFTER_MAX", "10"))
+    
+    def _retry_delay(self, attempt: int, retry_after: Optional[float]) -> Optional[float]:
+        """
+        Yeniden denemeden önce beklenecek süreyi döndürür; Retry-After sınırı aşıyorsa None (yeniden deneme).
+        """
+        if retry_after is not None:
+            return retry_after if retry_after <= self.retry_after_max else None
+        return random.uniform(0, min(self.backoff_max, self.backoff_base * 2 ** attempt))
+    
+    def _get(self, url: str, **kwargs) -> requests.Response:
+        """
+        İdempotent GET isteğini zaman aşımı, yeniden deneme ve devre kesici ile yapar.
+        
+        Bağlantı hataları, zaman aşımları ve 429/502/503/504 yanıtları rastgele
+        gecikmeli üstel bekleme (full jitter) ile yeniden denenir; yanıt Retry-After
+        içeriyorsa o kadar beklenir (FLALINGO_RETRY_AFTER_MAX'ı aşarsa yeniden denenmez).
+        Servis yanıt vermeden biten her çağrı, beklenmeyen hatalar dahil, devre kesicide
+        hata olarak sayılır.
+        
+        Args:
+            url (str): İstek adresi
+            
+        Returns:
+            requests.Response: Başarılı (2xx) yanıt
+            
+        Raises:
+            FlalingoError: Devre açıksa, kimlik doğrulama/rapor hatası alınırsa veya denemeler tükenirse
+            requests.exceptions.HTTPError: Diğer istemci hatalarında (4xx)
+        """
+        if not self.breaker.allow():
+            raise FlalingoError('SERVICE_ERROR', 'Flalingo servisi geçici olarak kullanılamıyor')
+        
+        last_error = None
+        retry_after = None
+        settled = False
+        try:
+            for attempt in range(self.max_retries + 1):
+                if attempt:
+                    delay = self._retry_delay(attempt, retry_after)
+                    if delay is None:
+                        break
+                    logger.debug("Flalingo isteği %.2f sn sonra yeniden deneniyor (%s/%s)", delay, attempt, self.max_retries)
+                    time.sleep(delay)
+                retry_after = None
+                try:
+                    response = self.session.get(url, timeout=self.timeout, **kwargs)
+                except (requests.exceptions.ConnectionError, requests.exceptions.Timeout,
+                        requests.exceptions.ChunkedEncodingError) as e:
+                    last_error = e
+                    continue
+                
+                if response.status_code in RETRYABLE_STATUS_CODES:
+                    last_error = requests.exceptions.HTTPError(f"{response.status_code} Server Error", response=response)
+                    retry_after = _retry_after(response.headers.get('Retry-After'))
+                    continue
+                
+                if response.status_code >= 500:
+                    # Yeniden denenmeyen sunucu hatası
+                    last_error = requests.exceptions.HTTPError(f"{response.status_code} Server Error", response=response)
+                    break
+                
+                # Servis yanıt veriyor; istemci hataları devreyi etkilemez
+                settled = True
+                self.breaker.record_success()
+                if response.status_code in (401, 403):
+                    raise FlalingoError('AUTH_ERROR', ERROR_CODES['AUTH_ERROR'])
+                if response.status_code == 404:
+                    raise FlalingoError('REPORT_NOT_FOUND', ERROR_CODES['REPORT_NOT_FOUND'])
+                response.raise_for_status()
+                return response
+        finally:
+            # Beklenmeyen hatalarda da (ör. InvalidURL) sonuç kaydedilir; aksi halde yarı açık
+            # devrenin deneme çağrısı hiç bitmez ve devre süreç yeniden başlayana kadar kapalı kalmaz
+            if not settled:
+                self.breaker.record_failure()
+        
+        logger.error("Flalingo isteği %s denemede başarısız: %s", self.max_retries + 1, last_error)
+        raise FlalingoError('SERVICE_ERROR', str(last_error))
+    
+    async def _get_json_async(self, url: str, **kwargs) -> Any:
         """
-        self.base_url = "https://exercise.flalingo.com/api"
+        _get'in eş yordam sürümü; aynı zaman aşımı, yeniden deneme ve devre kesici
+        kurallarıyla isteği aiohttp üzerinden yapar ve JSON gövdesini döndürür.
+        
+        Args:
+            url (str): İstek adresi
+            
+        Returns:
+            Any: Başarılı (2xx) yanıtın JSON gövdesi
+            
+        Raises:
+            FlalingoError: Devre açıksa, kimlik doğrulama/rapor hatası alınırsa veya denemeler tükenirse
+            aiohttp.ClientResponseError: Diğer istemci hatalarında (4xx)
+        """
+        import aiohttp
+        if not self.breaker.allow():
+            raise FlalingoError('SERVICE_ERROR', 'Flalingo servisi geçici olarak kullanılamıyor')
+        
+        last_error = None
+        retry_after = None
+        settled = False
+        try:
+            session = get_async_session()
+            timeout = aiohttp.ClientTimeout(sock_connect=self.timeout[0], sock_read=self.timeout[1])
+            for attempt in range(self.max_retries + 1):
+                if attempt:
+                    delay = self._retry_delay(attempt, retry_after)
+                    if delay is None:
+                        break
+                    logger.debug("Flalingo isteği %.2f sn sonra yeniden deneniyor (%s/%s)", delay, attempt, self.max_retries)
+                    await asyncio.sleep(delay)
+                retry_after = None
+                try:
+                    async with session.get(url, timeout=timeout, **kwargs) as response:
+                        if response.status in RETRYABLE_STATUS_CODES or response.status >= 500:
+                            last_error = aiohttp.ClientResponseError(
+                                response.request_info, response.history, status=response.status,
+                                message=f"{response.status} Server Error")
+                            if response.status in RETRYABLE_STATUS_CODES:
+                                retry_after = _retry_after(response.headers.get('Retry-After'))
+                                continue
+                            # Yeniden denenmeyen sunucu hatası
+                            break
+                        
+                        # Servis yanıt veriyor; istemci hataları devreyi etkilemez
+                        settled = True
+                        self.breaker.record_success()
+                        if response.status in (401, 403):
+                            raise FlalingoError('AUTH_ERROR', ERROR_CODES['AUTH_ERROR'])
+                        if response.status == 404:
+                            raise FlalingoError('REPORT_NOT_FOUND', ERROR_CODES['REPORT_NOT_FOUND'])
+                        response.raise_for_status()
+                        return await response.json(content_type=None)
+                except (aiohttp.ClientConnectionError, aiohttp.ClientPayloadError, asyncio.TimeoutError) as e:
+                    last_error = e
+        except asyncio.CancelledError:
+            # İptal servis hatası sayılmaz; yalnızca deneme hakkı bırakılır
+            if not settled:
+                settled = True
+                self.breaker.cancel_trial()
+            raise
+        finally:
+            if not settled:
+                self.breaker.record_failure()
+        
+        logger.error("Flalingo isteği %s denemede başarısız: %s", self.max_retries + 1, last_error)
+        raise FlalingoError('SERVICE_ERROR', str(last_error))
         
     def get_transcript(self, auth_token: str, flai_report: str) -> Dict[str, Any]:
         """
@@ -45,33 +298,10 @@ class FlalingoService:
             FlalingoError: API isteği başarısız olduğunda
         """
         try:
-            headers = {
-                "Authorization": f"Bearer {auth_token}",
-                "Content-Type": "application/json"
-            }
-            
             # Gladia'dan transkript verisi al
-            response = requests.get(
-                f"{self.base_url}/flai-transcript",
-                params={
-                    'auth_token': auth_token,
-                    'flai_report': flai_report
-                },
-                headers=headers
-            )
-            
-            response.raise_for_status()
-            data = response.json()
-            
-            if not data.get('success'):
-                raise FlalingoError('SERVICE_ERROR', data.get('error', 'Failed to get transcript'))
-            
-            # Soru üretimi için veriyi hazırla
-            transcript_data = {
-                'openai': data.get('data', {}).get('openai', {}),
-                'gladia_response': data.get('data', {}).get('gladia_response', []),
-                'calculations': data.get('data', {}).get('calculations', {})
-            }
+            url, params, headers = self._transcript_request(auth_token, flai_report)
+            response = self._get(url, params=params, headers=headers)
+            transcript_data = self._transcript_data(response.json())
             
             # Soru üretimi yap
             questions = self._generate_questions(transcript_data)
@@ -83,9 +313,70 @@ class FlalingoService:
                 }
             }
             
-        except requests.exceptions.RequestException as e:
-            logger.error(f"API isteği sırasında hata: {str(e)}")
+        except (requests.exceptions.RequestException, ValueError) as e:
+            logger.error("API isteği sırasında hata: %s", e)
+            raise FlalingoError('SERVICE_ERROR', str(e))
+    
+    async def get_transcript_async(self, auth_token: str, flai_report: str) -> Dict[str, Any]:
+        """
+        get_transcript'in eş yordam sürümü; soru üretimi (CPU) bir thread'de yapılır.
+        
+        Args:
+            auth_token (str): API token
+            flai_report (str): Flai report ID
+            
+        Returns:
+            Dict[str, Any]: get_transcript ile aynı yapıda sonuç
+            
+        Raises:
+            FlalingoError: API isteği başarısız olduğunda
+        """
+        import aiohttp
+        try:
+            url, params, headers = self._transcript_request(auth_token, flai_report)
+            transcript_data = self._transcript_data(await self._get_json_async(url, params=params, headers=headers))
+        except (aiohttp.ClientError, ValueError) as e:
+            logger.error("API isteği sırasında hata: %s", e)
             raise FlalingoError('SERVICE_ERROR', str(e))
+        
+        questions = await asyncio.to_thread(self._generate_questions, transcript_data)
+        return {
+            'success': True,
+            'data': {
+                'questions': questions
+            }
+        }
+    
+    def _transcript_request(self, auth_token: str, flai_report: str) -> Tuple[str, Dict[str, str], Dict[str, str]]:
+        """
+        Transkript isteğinin adresini, parametrelerini ve başlıklarını döndürür.
+        """
+        headers = {
+            "Authorization": f"Bearer {auth_token}",
+            "Content-Type": "application/json"
+        }
+        params = {
+            'auth_token': auth_token,
+            'flai_report': flai_report
+        }
+        return f"{self.base_url}/flai-transcript", params, headers
+    
+    def _transcript_data(self, data: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Transkript yanıtından soru üretimi için gereken veriyi çıkarır.
+        
+        Raises:
+            FlalingoError: Yanıt başarısızsa
+        """
+        if not data.get('success'):
+            raise FlalingoError('SERVICE_ERROR', data.get('error', 'Failed to get transcript'))
+        
+        # Soru üretimi için veriyi hazırla
+        return {
+            'openai': data.get('data', {}).get('openai', {}),
+            'gladia_response': data.get('data', {}).get('gladia_response', []),
+            'calculations': data.get('data', {}).get('calculations', {})
+        }
 
     def _generate_questions(self, transcript_data: Dict[str, Any]) -> Dict[str, List[Dict[str, Any]]]:
         """
@@ -109,7 +400,7 @@ class FlalingoService:
             }
             
         except Exception as e:
-            logger.error(f"Soru üretimi sırasında hata: {str(e)}")
+            logger.error("Soru üretimi sırasında hata: %s", e)
             raise FlalingoError('QUESTION_GEN_ERROR', str(e))
 
     def send_exercise_completion(self, auth_token: str, flai_report: str, 
@@ -135,7 +426,7 @@ class FlalingoService:
             }
             
         except Exception as e:
-            logger.error(f"Sonuç değerlendirme sırasında hata: {str(e)}")
+            logger.error("Sonuç değerlendirme sırasında hata: %s", e)
             raise FlalingoError('EVALUATION_ERROR', str(e))
 
     def _evaluate_results(self, exercise_response: Dict[str, List[Dict[str, Any]]]) -> Dict[str, Any]:
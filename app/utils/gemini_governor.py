@@ -0,0 +1,377 @@
+import os
+import time
+import heapq
+import asyncio
+import random
+import logging
+import tempfile
+import itertools
+import threading
+import contextlib
+import contextvars
+from typing import Any, Iterator, Optional, Tuple
+
+try:
+    import fcntl
+except ImportError:  # Windows: süreçler arası paylaşım yok, süreç içi sınırlayıcı kullanılır
+    fcntl = None
+
+from .metrics import GEMINI_IN_FLIGHT, GEMINI_QUEUE_DEPTH, GEMINI_QUEUE_TIMEOUTS, GEMINI_QUEUE_WAIT_SECONDS
+
+# Loglama yapılandırması
+logger = logging.getLogger(__name__)
+
+# Öncelikler; küçük değer önce hizmet alır
+INTERACTIVE = 'interactive'
+BACKGROUND = 'background'
+PRIORITIES = {INTERACTIVE: 0, BACKGROUND: 1}
+
+# Çağrının önceliği; arka plan işleri request_priority(BACKGROUND) bağlamında gönderilir
+_priority_var = contextvars.ContextVar('gemini_priority', default=INTERACTIVE)
+
+# acquire_async'in sırasını ve izni yoklama aralığı (saniye); senkron bekleyenler notify ile uyanır
+_ASYNC_POLL_INTERVAL = 0.05
+
+class GovernorTimeout(Exception):
+    """Gemini çağrı izni süresi içinde alınamadığında fırlatılır"""
+
+@contextlib.contextmanager
+def request_priority(priority: str) -> Iterator[None]:
+    """
+    Blok içindeki (ve bu bağlamda gönderilen arka plan işlerindeki) Gemini çağrılarının önceliğini belirler.
+
+    Args:
+        priority (str): INTERACTIVE veya BACKGROUND
+    """
+    if priority not in PRIORITIES:
+        raise ValueError(f"Bilinmeyen öncelik: {priority}")
+    token = _priority_var.set(priority)
+    try:
+        yield
+    finally:
+        _priority_var.reset(token)
+
+def current_priority() -> str:
+    return _priority_var.get()
+
+class _LocalBackend:
+    """Süreç içi token kovası ve eş zamanlı çağrı sınırı"""
+
+    def __init__(self, rate: float, burst: float, max_in_flight: int):
+        self.rate = rate
+        self.burst = burst
+        self.max_in_flight = max_in_flight
+        self._tokens = burst
+        self._updated = time.monotonic()
+        self._in_flight = 0
+        self._lock = threading.Lock()
+
+    def try_acquire(self) -> Tuple[Any, float]:
+        with self._lock:
+            if self.max_in_flight and self._in_flight >= self.max_in_flight:
+                return None, 0.05
+            if self.rate:
+                now = time.monotonic()
+                self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+                self._updated = now
+                if self._tokens < 1:
+                    return None, (1 - self._tokens) / self.rate
+                self._tokens -= 1
+            self._in_flight += 1
+            return True, 0.0
+
+    def release(self, permit: Any) -> None:
+        with self._lock:
+            self._in_flight -= 1
+
+class _FileBackend:
+    """
+    Aynı makinedeki worker süreçleri arasında paylaşılan token kovası ve çağrı sınırı.
+
+    Kova durumu flock ile korunan bir dosyada, çağrı yuvaları ise max_in_flight adet kilit
+    dosyasında tutulur. Yuva kilitleri süreç ölürse çekirdek tarafından bırakılır.
+    """
+
+    def __init__(self, directory: str, rate: float, burst: float, max_in_flight: int):
+        self.directory = directory
+        self.rate = rate
+        self.burst = burst
+        self.max_in_flight = max_in_flight
+        os.makedirs(directory, exist_ok=True)
+        self._bucket_path = os.path.join(directory, 'bucket')
+
+    def _take_token(self) -> float:
+        # Token alındıysa 0, alınamadıysa bir sonraki token'a kalan süre
+        fd = os.open(self._bucket_path, os.O_RDWR | os.O_CREAT, 0o600)
+        try:
+            fcntl.flock(fd, fcntl.LOCK_EX)
+            raw = os.read(fd, 64).decode('ascii', 'ignore').split()
+            now = time.time()
+            try:
+                tokens, updated = float(raw[0]), float(raw[1])
+            except (IndexError, ValueError):
+                tokens, updated = self.burst, now
+            tokens = min(self.burst, tokens + max(0.0, now - updated) * self.rate)
+            wait = 0.0
+            if tokens < 1:
+                wait = (1 - tokens) / self.rate
+            else:
+                tokens -= 1
+            os.lseek(fd, 0, os.SEEK_SET)
+            os.ftruncate(fd, 0)
+            os.write(fd, f"{tokens:.6f} {now:.6f}".encode('ascii'))
+            return wait
+        finally:
+            os.close(fd)
+
+    def _take_slot(self) -> Optional[int]:
+        start = random.randrange(self.max_in_flight)
+        for offset in range(self.max_in_flight):
+            path = os.path.join(self.directory, f"slot-{(start + offset) % self.max_in_flight}.lock")
+            fd = os.open(path, os.O_RDWR | os.O_CREAT, 0o600)
+            try:
+                fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+                return fd
+            except OSError:
+                os.close(fd)
+        return None
+
+    def try_acquire(self) -> Tuple[Any, float]:
+        slot = None
+        if self.max_in_flight:
+            slot = self._take_slot()
+            if slot is None:
+                return None, 0.05
+        if self.rate:
+            wait = self._take_token()
+            if wait:
+                if slot is not None:
+                    os.close(slot)
+                return None, wait
+        return (slot if slot is not None else True), 0.0
+
+    def release(self, permit: Any) -> None:
+        if permit is not True:
+            # Dosyayı kapatmak kilidi bırakır
+            os.close(permit)
+
+class GeminiGovernor:
+    """
+    Gemini çağrılarını token kovası (istek/sn) ve eş zamanlı çağrı sınırıyla düzenler.
+
+    İzin bekleyen çağrılar süreç içinde öncelik sırasına göre kuyruğa girer: etkileşimli
+    istekler arka plan işlerinden önce hizmet alır, aynı öncelikte geliş sırası korunur.
+    Yalnızca kuyruğun başındaki çağrı izin dener; diğerleri sırası gelene kadar uyur.
+
+    Öncelik sırası yalnızca bir süreç içindeki bekleyenler için geçerlidir: paylaşımlı
+    (directory ile) kullanımda sınırlar worker'lar arasında ortaktır, ancak farklı
+    worker'ların kuyruk başları izni sıra gözetmeden yarışarak alır.
+    İzin denemesi (paylaşımlı kullanımda dosya kilidi) kuyruk kilidi dışında yapılır.
+    """
+
+    def __init__(self, rate: float = 0.0, burst: Optional[float] = None, max_in_flight: int = 0,
+                 timeout: float = 30.0, directory: Optional[str] = None):
+        """
+        GeminiGovernor sınıfını başlatır.
+
+        Args:
+            rate (float): Saniye başına izin verilen çağrı sayısı (0: sınırsız)
+            burst (float, optional): Kovanın kapasitesi (varsayılan: max(1, rate))
+            max_in_flight (int): Aynı anda devam edebilecek en fazla çağrı (0: sınırsız)
+            timeout (float): İzin için en fazla bekleme süresi (saniye)
+            directory (str, optional): Verilirse sınırlar bu dizin üzerinden worker süreçleri arasında paylaşılır
+        """
+        self.rate = rate
+        self.burst = burst if burst is not None else max(1.0, rate)
+        self.max_in_flight = max_in_flight
+        self.timeout = timeout
+        if directory and fcntl is not None:
+            self._backend = _FileBackend(directory, rate, self.burst, max_in_flight)
+        else:
+            self._backend = _LocalBackend(rate, self.burst, max_in_flight)
+        self.shared = isinstance(self._backend, _FileBackend)
+        self._waiters = []
+        self._sequence = itertools.count()
+        self._condition = threading.Condition()
+        # Kuyruk veya izin durumu her değiştiğinde artar; kilit dışındaki deneme sırasında
+        # kaçırılan bildirimleri yakalamak için kullanılır
+        self._changes = 0
+
+    def acquire(self, priority: Optional[str] = None, timeout: Optional[float] = None) -> Any:
+        """
+        Çağrı izni alır; izin hazır olana kadar öncelik sırasıyla bekler.
+
+        Args:
+            priority (str, optional): INTERACTIVE veya BACKGROUND (varsayılan: bağlamdaki öncelik)
+            timeout (float, optional): En fazla bekleme süresi (varsayılan: self.timeout)
+
+        Returns:
+            Any: release()'e verilecek izin
+
+        Raises:
+            GovernorTimeout: İzin süresi içinde alınamazsa
+        """
+        priority = priority or current_priority()
+        timeout = self.timeout if timeout is None else timeout
+        started = time.monotonic()
+        deadline = started + timeout
+        ticket = (PRIORITIES[priority], next(self._sequence))
+        GEMINI_QUEUE_DEPTH.inc(priority=priority)
+        with self._condition:
+            heapq.heappush(self._waiters, ticket)
+        try:
+            while True:
+                with self._condition:
+                    at_head = self._waiters[0] == ticket
+                    seen = self._changes
+                permit, retry_after = self._backend.try_acquire() if at_head else (None, None)
+                if permit is not None:
+                    break
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    GEMINI_QUEUE_TIMEOUTS.inc(priority=priority)
+                    raise GovernorTimeout(f"Gemini çağrı izni {timeout} sn içinde alınamadı ({priority})")
+                with self._condition:
+                    # Süreç içi bırakmalar ve sıra değişimleri notify ile uyandırır
+                    if self._changes == seen:
+                        self._condition.wait(min(retry_after or remaining, remaining))
+        finally:
+            self._leave_queue(ticket, priority)
+        return self._granted(permit, started, priority)
+
+    async def acquire_async(self, priority: Optional[str] = None, timeout: Optional[float] = None) -> Any:
+        """
+        acquire()'ın eş yordam sürümü; izin olay döngüsünde beklenir, bekleme süresince thread tutulmaz.
+
+        Senkron çağrılarla aynı öncelik kuyruğunu paylaşır. Sıra ve izin _ASYNC_POLL_INTERVAL
+        aralıklarla yoklanır; paylaşımlı kullanımda dosya kilitli izin denemesi olay döngüsünü
+        durdurmaması için executor'da yapılır. Eş yordam iptal edilirse kuyruktan çıkar.
+
+        Args:
+            priority (str, optional): INTERACTIVE veya BACKGROUND (varsayılan: bağlamdaki öncelik)
+            timeout (float, optional): En fazla bekleme süresi (varsayılan: self.timeout)
+
+        Returns:
+            Any: release()'e verilecek izin
+
+        Raises:
+            GovernorTimeout: İzin süresi içinde alınamazsa
+        """
+        priority = priority or current_priority()
+        timeout = self.timeout if timeout is None else timeout
+        started = time.monotonic()
+        deadline = started + timeout
+        ticket = (PRIORITIES[priority], next(self._sequence))
+        GEMINI_QUEUE_DEPTH.inc(priority=priority)
+        with self._condition:
+            heapq.heappush(self._waiters, ticket)
+        try:
+            while True:
+                with self._condition:
+                    at_head = self._waiters[0] == ticket
+                permit, retry_after = await self._try_acquire_async() if at_head else (None, None)
+                if permit is not None:
+                    break
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    GEMINI_QUEUE_TIMEOUTS.inc(priority=priority)
+                    raise GovernorTimeout(f"Gemini çağrı izni {timeout} sn içinde alınamadı ({priority})")
+                await asyncio.sleep(max(0.0, min(retry_after or remaining, remaining, _ASYNC_POLL_INTERVAL)))
+        finally:
+            self._leave_queue(ticket, priority)
+        return self._granted(permit, started, priority)
+
+    async def _try_acquire_async(self) -> Tuple[Any, float]:
+        if not self.shared:
+            # Süreç içi kova yalnızca bellekte çalışır, beklemez
+            return self._backend.try_acquire()
+        future = asyncio.get_running_loop().run_in_executor(None, self._backend.try_acquire)
+        try:
+            return await asyncio.shield(future)
+        except asyncio.CancelledError:
+            # Deneme thread'de sürer; iptalden sonra alınan izin bırakılır
+            future.add_done_callback(self._release_abandoned)
+            raise
+
+    def _release_abandoned(self, future: 'asyncio.Future') -> None:
+        if future.cancelled() or future.exception() is not None:
+            return
+        permit, _ = future.result()
+        if permit is not None:
+            self._backend.release(permit)
+            self._notify()
+
+    def _notify(self) -> None:
+        with self._condition:
+            self._changes += 1
+            self._condition.notify_all()
+
+    def _leave_queue(self, ticket: Tuple[int, int], priority: str) -> None:
+        with self._condition:
+            self._waiters.remove(ticket)
+            heapq.heapify(self._waiters)
+            self._changes += 1
+            self._condition.notify_all()
+        GEMINI_QUEUE_DEPTH.dec(priority=priority)
+
+    def _granted(self, permit: Any, started: float, priority: str) -> Any:
+        waited = time.monotonic() - started
+        GEMINI_QUEUE_WAIT_SECONDS.observe(waited, priority=priority)
+        GEMINI_IN_FLIGHT.inc()
+        if waited > 1:
+            logger.debug("Gemini çağrı izni %.2f sn beklendi (%s)", waited, priority)
+        return permit
+
+    def release(self, permit: Any) -> None:
+        """
+        acquire() ile alınan izni bırakır.
+        """
+        self._backend.release(permit)
+        GEMINI_IN_FLIGHT.dec()
+        self._notify()
+
+    @contextlib.contextmanager
+    def slot(self, priority: Optional[str] = None) -> Iterator[None]:
+        """
+        Blok süresince bir çağrı izni tutar.
+        """
+        permit = self.acquire(priority)
+        try:
+            yield
+        finally:
+            self.release(permit)
+
+_default_governor = None
+_default_governor_lock = threading.Lock()
+
+def get_governor() -> Optional[GeminiGovernor]:
+    """
+    Ortam değişkenlerine göre yapılandırılmış, süreç genelinde paylaşılan düzenleyiciyi döndürür.
+
+    GEMINI_RATE_LIMIT ve GEMINI_MAX_IN_FLIGHT ikisi de 0 ise (varsayılan) None döner.
+
+    Returns:
+        Optional[GeminiGovernor]: Paylaşılan düzenleyici veya None
+    """
+    global _default_governor
+    if _default_governor is None:
+        rate = float(os.getenv("GEMINI_RATE_LIMIT", "0"))
+        max_in_flight = int(os.getenv("GEMINI_MAX_IN_FLIGHT", "0"))
+        if not rate and not max_in_flight:
+            return None
+        with _default_governor_lock:
+            if _default_governor is None:
+                burst = os.getenv("GEMINI_RATE_BURST")
+                directory = os.getenv("GEMINI_GOVERNOR_DIR",
+                                      os.path.join(tempfile.gettempdir(), 'flai-gemini-governor'))
+                _default_governor = GeminiGovernor(
+                    rate=rate,
+                    burst=float(burst) if burst else None,
+                    max_in_flight=max_in_flight,
+                    timeout=float(os.getenv("GEMINI_QUEUE_TIMEOUT", "30")),
+                    # GEMINI_GOVERNOR_DIR boş verilirse sınırlar yalnızca süreç içinde uygulanır
+                    directory=directory or None
+                )
+                logger.info("Gemini düzenleyicisi: %s istek/sn, en fazla %s eş zamanlı çağrı (paylaşımlı=%s)",
+                            rate or 'sınırsız', max_in_flight or 'sınırsız', _default_governor.shared)
+    return _default_governor
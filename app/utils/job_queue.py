@@ -0,0 +1,166 @@
+import os
+import time
+import uuid
+import logging
+import threading
+import contextvars
+from concurrent.futures import ThreadPoolExecutor
+from typing import TYPE_CHECKING, Dict, Any, Callable, Optional
+
+if TYPE_CHECKING:
+    from .exercise_store import ExerciseStore
+
+# Loglama yapılandırması
+logger = logging.getLogger(__name__)
+
+class JobQueueFull(Exception):
+    """Bekleyen iş sayısı sınıra ulaştığında fırlatılır"""
+
+class JobManager:
+    """
+    Uzun süren egzersiz üretimini arka planda, sınırlı bir iş parçacığı havuzunda çalıştırır.
+
+    Depo verilirse iş durumları her değişiklikte depoya da yazılır; böylece durum sorgusu
+    işi çalıştırmayan bir worker'a ulaşsa da yanıtlanır. Depo yoksa durumlar yalnızca
+    işi oluşturan süreçte tutulur.
+    """
+
+    def __init__(self, max_workers: Optional[int] = None, max_pending: Optional[int] = None,
+                 result_ttl: Optional[int] = None, stages: Optional[Dict[str, int]] = None,
+                 store: Optional['ExerciseStore'] = None):
+        """
+        JobManager sınıfını başlatır.
+
+        Args:
+            max_workers (int, optional): Aynı anda çalışacak iş sayısı
+            max_pending (int, optional): Kuyrukta bekleyebilecek + çalışan en fazla iş sayısı
+            result_ttl (int, optional): Biten işlerin saklanma süresi (saniye)
+            stages (Dict[str, int], optional): Aşama adı -> ilerleme yüzdesi eşlemesi
+            store (ExerciseStore, optional): İş durumlarının worker'lar arasında paylaşıldığı depo
+        """
+        self.max_workers = max_workers or int(os.getenv("EXERCISE_JOB_WORKERS", "4"))
+        self.max_pending = max_pending or int(os.getenv("EXERCISE_JOB_QUEUE_SIZE", "100"))
+        self.result_ttl = result_ttl or int(os.getenv("EXERCISE_JOB_TTL", "3600"))
+        self.stages = stages or {}
+        self.store = store
+        self._executor = None
+        self._jobs = {}
+        self._active = 0
+        self._lock = threading.Lock()
+
+    def _get_executor(self) -> ThreadPoolExecutor:
+        # Havuz ilk işte oluşturulur; böylece fork öncesi thread açılmaz
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(max_workers=self.max_workers,
+                                                thread_name_prefix='exercise-job')
+        return self._executor
+
+    def submit(self, func: Callable[..., Dict[str, Any]], *args, **kwargs) -> str:
+        """
+        Yeni bir iş kuyruğa ekler.
+
+        İşlev, args/kwargs'a ek olarak ``progress`` anahtar argümanını alır.
+
+        Args:
+            func (Callable): Çalıştırılacak işlev
+
+        Returns:
+            str: İş ID'si
+
+        Raises:
+            JobQueueFull: Bekleyen iş sayısı sınıra ulaştığında
+        """
+        job_id = uuid.uuid4().hex
+        with self._lock:
+            self._purge_expired()
+            if self._active >= self.max_pending:
+                raise JobQueueFull(f"Kuyruk dolu ({self.max_pending} iş)")
+            self._active += 1
+            self._jobs[job_id] = {
+                'job_id': job_id,
+                'status': 'queued',
+                'stage': None,
+                'progress': 0,
+                'created_at': time.time(),
+                'started_at': None,
+                'finished_at': None,
+                'result': None,
+                'error': None
+            }
+            job = dict(self._jobs[job_id])
+            executor = self._get_executor()
+
+        try:
+            self._persist(job)
+            # İş, gönderen isteğin bağlamında (ör. request_id) çalışır
+            executor.submit(contextvars.copy_context().run, self._run, job_id, func, args, kwargs)
+        except BaseException:
+            # Havuz kapatılmışsa (ör. çıkışta) veya depo yazılamazsa kuyruk payı geri verilir
+            with self._lock:
+                self._active -= 1
+                self._jobs.pop(job_id, None)
+            raise
+        logger.debug("İş kuyruğa eklendi: %s", job_id)
+        return job_id
+
+    def _run(self, job_id: str, func: Callable[..., Dict[str, Any]], args, kwargs) -> None:
+        """
+        İşi çalıştırır ve sonucunu kaydeder.
+        """
+        def progress(stage: str) -> None:
+            self._update(job_id, stage=stage, progress=self.stages.get(stage, 0))
+
+        self._update(job_id, status='running', started_at=time.time())
+        outcome = {}
+        try:
+            outcome = {'status': 'completed', 'result': func(*args, progress=progress, **kwargs),
+                       'progress': 100}
+        except Exception as e:
+            logger.error("İş %s sırasında hata: %s", job_id, e)
+            outcome = {'status': 'failed', 'error': str(e)}
+        finally:
+            with self._lock:
+                self._active -= 1
+            self._update(job_id, finished_at=time.time(), **outcome)
+
+    def _update(self, job_id: str, **fields) -> None:
+        with self._lock:
+            job = self._jobs.get(job_id)
+            if job is None:
+                return
+            job.update(fields)
+            job = dict(job)
+        self._persist(job)
+
+    def _persist(self, job: Dict[str, Any]) -> None:
+        if self.store is not None:
+            # Çalışan işin kaydı her aşamada yenilenir; biten iş result_ttl sonra silinir
+            self.store.set_job(job, self.result_ttl)
+
+    def get(self, job_id: str) -> Optional[Dict[str, Any]]:
+        """
+        İşin güncel durumunu döndürür.
+
+        Args:
+            job_id (str): İş ID'si
+
+        Returns:
+            Optional[Dict[str, Any]]: İş kaydının kopyası veya bulunamazsa None
+        """
+        with self._lock:
+            self._purge_expired()
+            job = self._jobs.get(job_id)
+            if job is not None:
+                return dict(job)
+        # İş başka bir worker sürecinde oluşturulmuş olabilir
+        return self.store.get_job(job_id) if self.store is not None else None
+
+    def _purge_expired(self) -> None:
+        # Kilit tutulurken çağrılmalıdır
+        now = time.time()
+        expired = [
+            job_id for job_id, job in self._jobs.items()
+            if job['finished_at'] and now - job['finished_at'] > self.result_ttl
+        ]
+        for job_id in expired:
+            del self._jobs[job_id]
@@ -0,0 +1,60 @@
+import os
+import logging
+from typing import Any
+from flask.json.provider import DefaultJSONProvider
+
+try:
+    import orjson
+except ImportError:  # İsteğe bağlı bağımlılık; yoksa standart json kullanılır
+    orjson = None
+
+# Loglama yapılandırması
+logger = logging.getLogger(__name__)
+
+class FastJSONProvider(DefaultJSONProvider):
+    """
+    orjson kuruluysa yanıtları orjson ile, değilse Flask'ın varsayılan kodlayıcısıyla serileştirir.
+
+    Çıktı varsayılan sağlayıcıyla uyumludur: anahtarlar sıralanır, tarih/Decimal/UUID
+    gibi türler aynı default() işleviyle dönüştürülür. orjson'un desteklemediği
+    değerlerde (ör. 64 bitten büyük tamsayılar) varsayılan kodlayıcıya dönülür.
+    Yanıtlar JSON_PRETTY=1 değilse girintisiz (compact) üretilir.
+    """
+
+    def __init__(self, app):
+        super().__init__(app)
+        self.compact = os.getenv("JSON_PRETTY", "0") != "1"
+
+    def _orjson_option(self, indent: bool = False) -> int:
+        # Tarihler Flask'taki gibi http_date biçiminde kalsın diye default()'a bırakılır
+        option = orjson.OPT_NON_STR_KEYS | orjson.OPT_PASSTHROUGH_DATETIME
+        if self.sort_keys:
+            option |= orjson.OPT_SORT_KEYS
+        if indent:
+            option |= orjson.OPT_INDENT_2
+        return option
+
+    def dumps(self, obj: Any, **kwargs: Any) -> str:
+        if orjson is None or kwargs:
+            return super().dumps(obj, **kwargs)
+        try:
+            return orjson.dumps(obj, default=self.default, option=self._orjson_option()).decode('utf-8')
+        except TypeError:
+            return super().dumps(obj)
+
+    def loads(self, s: Any, **kwargs: Any) -> Any:
+        if orjson is None or kwargs:
+            return super().loads(s, **kwargs)
+        return orjson.loads(s)
+
+    def response(self, *args: Any, **kwargs: Any):
+        if orjson is None:
+            return super().response(*args, **kwargs)
+
+        obj = self._prepare_response_obj(args, kwargs)
+        try:
+            body = orjson.dumps(obj, default=self.default, option=self._orjson_option(not self.compact))
+        except TypeError as e:
+            logger.debug("orjson serileştiremedi, standart kodlayıcı kullanılıyor: %s", e)
+            return super().response(*args, **kwargs)
+        return self._app.response_class(body + b"\n", mimetype=self.mimetype)
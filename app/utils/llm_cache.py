@@ -0,0 +1,234 @@
+import os
+import json
+import time
+import hashlib
+import logging
+import tempfile
+import threading
+from collections import OrderedDict
+from typing import Dict, Any, Optional
+
+# Loglama yapılandırması
+logger = logging.getLogger(__name__)
+
+class MemoryCache:
+    """
+    Süre sınırlı (TTL), en az kullanılanı atan (LRU) ve thread-safe bellek önbelleği.
+    """
+
+    def __init__(self, max_entries: int = 256, ttl: Optional[float] = None):
+        """
+        MemoryCache sınıfını başlatır.
+
+        Args:
+            max_entries (int): Saklanacak en fazla kayıt sayısı
+            ttl (float, optional): Kayıtların varsayılan geçerlilik süresi (saniye)
+        """
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Any:
+        """
+        Anahtara karşılık gelen değeri döndürür, yoksa veya süresi dolduysa None.
+        """
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None:
+                return None
+            expires_at, value = entry
+            if expires_at is not None and expires_at < time.time():
+                del self._data[key]
+                return None
+            self._data.move_to_end(key)
+            return value
+
+    def set(self, key: str, value: Any, ttl: Optional[float] = None) -> None:
+        """
+        Değeri önbelleğe yazar; kapasite aşılırsa en eski kaydı atar.
+        """
+        ttl = self.ttl if ttl is None else ttl
+        expires_at = time.time() + ttl if ttl else None
+        with self._lock:
+            self._data[key] = (expires_at, value)
+            self._data.move_to_end(key)
+            while len(self._data) > self.max_entries:
+                self._data.popitem(last=False)
+
+    def delete(self, key: str) -> None:
+        with self._lock:
+            self._data.pop(key, None)
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+class DiskCache:
+    """
+    Her kaydı ayrı bir JSON dosyasında tutan disk önbelleği.
+
+    Dosyalar atomik olarak yazılır; böylece aynı dizini paylaşan worker süreçleri
+    yarım yazılmış kayıt okumaz.
+    """
+
+    def __init__(self, directory: str, ttl: Optional[float] = None):
+        """
+        DiskCache sınıfını başlatır.
+
+        Args:
+            directory (str): Önbellek dizini
+            ttl (float, optional): Kayıtların varsayılan geçerlilik süresi (saniye)
+        """
+        self.directory = directory
+        self.ttl = ttl
+        os.makedirs(directory, exist_ok=True)
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.directory, f"{key}.json")
+
+    def get(self, key: str) -> Any:
+        try:
+            with open(self._path(key), 'r', encoding='utf-8') as f:
+                entry = json.load(f)
+        except (OSError, ValueError):
+            return None
+        expires_at = entry.get('expires_at')
+        if expires_at is not None and expires_at < time.time():
+            self.delete(key)
+            return None
+        return entry.get('value')
+
+    def set(self, key: str, value: Any, ttl: Optional[float] = None) -> None:
+        ttl = self.ttl if ttl is None else ttl
+        entry = {
+            'expires_at': time.time() + ttl if ttl else None,
+            'value': value
+        }
+        try:
+            fd, temp_path = tempfile.mkstemp(dir=self.directory, suffix='.tmp')
+            with os.fdopen(fd, 'w', encoding='utf-8') as f:
+                json.dump(entry, f, ensure_ascii=False)
+            os.replace(temp_path, self._path(key))
+        except OSError as e:
+            logger.warning("Disk önbelleğine yazılamadı: %s", e)
+
+    def delete(self, key: str) -> None:
+        try:
+            os.remove(self._path(key))
+        except OSError:
+            pass
+
+class LLMCache:
+    """
+    Yapay zeka yanıtları için içerik adresli, iki katmanlı (bellek + disk) önbellek.
+
+    Anahtar; normalize edilmiş istem metni, model adı ve istem şablonu sürümünün
+    SHA-256 özetidir.
+    """
+
+    def __init__(self, max_entries: int = 256, ttl: Optional[float] = None,
+                 disk_dir: Optional[str] = None):
+        """
+        LLMCache sınıfını başlatır.
+
+        Args:
+            max_entries (int): Bellek katmanındaki en fazla kayıt sayısı
+            ttl (float, optional): Kayıtların geçerlilik süresi (saniye)
+            disk_dir (str, optional): Disk katmanı dizini; verilmezse disk katmanı kullanılmaz
+        """
+        self.memory = MemoryCache(max_entries=max_entries, ttl=ttl)
+        self.disk = DiskCache(disk_dir, ttl=ttl) if disk_dir else None
+        self._stats = {'hits': 0, 'memory_hits': 0, 'disk_hits': 0, 'misses': 0, 'sets': 0}
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def make_key(prompt: str, model_name: str, prompt_version: str) -> str:
+        """
+        İstem için önbellek anahtarı üretir.
+
+        Boşluk farkları (girinti, satır sonları) aynı anahtarı üretir.
+
+        Args:
+            prompt (str): Modele gönderilecek istem
+            model_name (str): Model adı
+            prompt_version (str): İstem şablonu sürümü
+
+        Returns:
+            str: Hex SHA-256 özeti
+        """
+        normalized = " ".join(prompt.split())
+        digest = hashlib.sha256()
+        for part in (model_name, prompt_version, normalized):
+            digest.update(part.encode('utf-8'))
+            digest.update(b'\x00')
+        return digest.hexdigest()
+
+    def _count(self, *names: str) -> None:
+        with self._lock:
+            for name in names:
+                self._stats[name] += 1
+
+    def get(self, key: str) -> Optional[str]:
+        """
+        Önbellekteki yanıtı döndürür; önce bellek, sonra disk katmanına bakar.
+        """
+        value = self.memory.get(key)
+        if value is not None:
+            self._count('hits', 'memory_hits')
+            return value
+
+        if self.disk is not None:
+            value = self.disk.get(key)
+            if value is not None:
+                # Sonraki istekler için bellek katmanına taşı
+                self.memory.set(key, value)
+                self._count('hits', 'disk_hits')
+                return value
+
+        self._count('misses')
+        return None
+
+    def set(self, key: str, value: str) -> None:
+        """
+        Yanıtı tüm katmanlara yazar.
+        """
+        self.memory.set(key, value)
+        if self.disk is not None:
+            self.disk.set(key, value)
+        self._count('sets')
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Önbellek isabet/ıska sayaçlarını döndürür.
+        """
+        with self._lock:
+            stats = dict(self._stats)
+        lookups = stats['hits'] + stats['misses']
+        stats['hit_ratio'] = round(stats['hits'] / lookups, 4) if lookups else 0
+        stats['memory_entries'] = len(self.memory)
+        return stats
+
+_default_cache = None
+_default_cache_lock = threading.Lock()
+
+def get_llm_cache() -> Optional[LLMCache]:
+    """
+    Ortam değişkenlerine göre yapılandırılmış, süreç genelinde paylaşılan önbelleği döndürür.
+
+    LLM_CACHE_ENABLED=0 ise None döner.
+
+    Returns:
+        Optional[LLMCache]: Paylaşılan önbellek
+    """
+    global _default_cache
+    if os.getenv("LLM_CACHE_ENABLED", "1").lower() in ("0", "false", "no"):
+        return None
+    if _default_cache is None:
+        with _default_cache_lock:
+            if _default_cache is None:
+                _default_cache = LLMCache(
+                    max_entries=int(os.getenv("LLM_CACHE_MAX_ENTRIES", "256")),
+                    ttl=float(os.getenv("LLM_CACHE_TTL", "86400")),
+                    disk_dir=os.getenv("LLM_CACHE_DIR") or None
+                )
+    return _default_cache
@@ -0,0 +1,121 @@
+import os
+import sys
+import json
+import time
+import random
+import logging
+import contextvars
+from typing import Any, Dict, Optional
+
+# İstek kimliği; Flask before_request'te atanır, arka plan işlerine bağlamla taşınır
+request_id_var = contextvars.ContextVar('request_id', default='-')
+
+# LogRecord'un kendi alanları; geri kalanlar extra={...} ile verilmiş yapısal alanlardır
+_RESERVED_ATTRS = frozenset(vars(logging.LogRecord('', 0, '', 0, '', (), None))) | {'message', 'asctime', 'request_id'}
+
+class RequestIdFilter(logging.Filter):
+    """Kayıtlara o anki istek kimliğini (request_id) ekler"""
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        record.request_id = request_id_var.get()
+        return True
+
+class PayloadCapFilter(logging.Filter):
+    """
+    Biçimlendirilmiş mesajı en fazla max_chars karaktere kısaltır.
+
+    Filtre handler'a bağlanır; böylece mesaj yalnızca gerçekten yazılacak kayıtlar için
+    biçimlendirilir (logger seviyesinin altındaki çağrılar hiç biçimlendirilmez).
+    """
+
+    def __init__(self, max_chars: int):
+        super().__init__()
+        self.max_chars = max_chars
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if self.max_chars > 0:
+            message = record.getMessage()
+            if len(message) > self.max_chars:
+                record.msg = f"{message[:self.max_chars]}... [{len(message) - self.max_chars} karakter kısaltıldı]"
+                record.args = None
+        return True
+
+class DebugSamplingFilter(logging.Filter):
+    """DEBUG kayıtlarının yalnızca sample_rate oranındakini geçirir; diğer seviyeler etkilenmez"""
+
+    def __init__(self, sample_rate: float):
+        super().__init__()
+        self.sample_rate = sample_rate
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if record.levelno > logging.DEBUG or self.sample_rate >= 1.0:
+            return True
+        return random.random() < self.sample_rate
+
+class JSONFormatter(logging.Formatter):
+    """
+    Her kaydı tek satırlık JSON nesnesi olarak yazar.
+
+    Alanlar: ts, level, logger, message, request_id, process, thread; extra ile verilen
+    alanlar ve varsa exc_info da eklenir.
+    """
+
+    def format(self, record: logging.LogRecord) -> str:
+        entry: Dict[str, Any] = {
+            'ts': time.strftime('%Y-%m-%dT%H:%M:%S', time.gmtime(record.created)) + f".{int(record.msecs):03d}Z",
+            'level': record.levelname,
+            'logger': record.name,
+            'message': record.getMessage(),
+            'request_id': getattr(record, 'request_id', '-'),
+            'process': record.process,
+            'thread': record.threadName
+        }
+        for key, value in vars(record).items():
+            if key not in _RESERVED_ATTRS and not key.startswith('_'):
+                entry[key] = value
+        if record.exc_info:
+            entry['exc_info'] = self.formatException(record.exc_info)
+        return json.dumps(entry, ensure_ascii=False, default=str)
+
+def configure_logging(level: Optional[str] = None, log_format: Optional[str] = None,
+                      max_chars: Optional[int] = None, debug_sample_rate: Optional[float] = None,
+                      stream=None) -> logging.Handler:
+    """
+    Kök logger'ı ortam değişkenlerine göre yapılandırır.
+
+    Args:
+        level (str, optional): Log seviyesi (LOG_LEVEL, varsayılan INFO)
+        log_format (str, optional): 'text' veya 'json' (LOG_FORMAT, varsayılan text)
+        max_chars (int, optional): Mesaj başına en fazla karakter, 0 sınırsız (LOG_MAX_MESSAGE_CHARS, varsayılan 2000)
+        debug_sample_rate (float, optional): Yazılacak DEBUG kayıtlarının oranı (LOG_DEBUG_SAMPLE_RATE, varsayılan 1.0)
+        stream (optional): Çıktı akışı (varsayılan stderr)
+
+    Returns:
+        logging.Handler: Kök logger'a eklenen handler
+    """
+    level = (level or os.getenv("LOG_LEVEL", "INFO")).upper()
+    log_format = (log_format or os.getenv("LOG_FORMAT", "text")).lower()
+    if max_chars is None:
+        max_chars = int(os.getenv("LOG_MAX_MESSAGE_CHARS", "2000"))
+    if debug_sample_rate is None:
+        debug_sample_rate = float(os.getenv("LOG_DEBUG_SAMPLE_RATE", "1.0"))
+
+    handler = logging.StreamHandler(stream or sys.stderr)
+    handler.addFilter(RequestIdFilter())
+    handler.addFilter(DebugSamplingFilter(debug_sample_rate))
+    handler.addFilter(PayloadCapFilter(max_chars))
+    if log_format == 'json':
+        handler.setFormatter(JSONFormatter())
+    else:
+        handler.setFormatter(logging.Formatter(
+            '%(asctime)s %(levelname)s [%(request_id)s] %(name)s: %(message)s'))
+
+    root = logging.getLogger()
+    # Yeniden yapılandırmada önceki handler'ımız çift yazmasın
+    for existing in list(root.handlers):
+        if getattr(existing, '_flai_handler', False):
+            root.removeHandler(existing)
+    handler._flai_handler = True
+    root.addHandler(handler)
+    root.setLevel(level)
+    return handler
@@ -0,0 +1,275 @@
+import time
+import bisect
+import logging
+import threading
+from typing import Dict, List, Optional, Sequence, Tuple
+
+# Loglama yapılandırması
+logger = logging.getLogger(__name__)
+
+# Gemini çağrıları saniyeler sürebildiğinden üst kovalar geniş tutulur
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+
+def _escape(value: str) -> str:
+    return str(value).replace('\\', '\\\\').replace('\n', '\\n').replace('"', '\\"')
+
+def _format_labels(names: Sequence[str], values: Sequence[str], extra: Optional[Tuple[str, str]] = None) -> str:
+    pairs = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)]
+    if extra:
+        pairs.append(f'{extra[0]}="{extra[1]}"')
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+def _format_value(value: float) -> str:
+    if value == float('inf'):
+        return "+Inf"
+    return repr(float(value)) if not float(value).is_integer() else str(int(value))
+
+class _Metric:
+    """Etiketli metriklerin ortak altyapısı"""
+    kind = 'untyped'
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._lock = threading.Lock()
+
+    def _key(self, labels: Dict[str, str]) -> Tuple[str, ...]:
+        if set(labels) != set(self.labelnames):
+            raise ValueError(f"{self.name} için etiketler {self.labelnames} olmalı, verilen: {tuple(labels)}")
+        return tuple(str(labels[name]) for name in self.labelnames)
+
+    def render(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} {self.kind}"]
+        lines.extend(self._samples())
+        return lines
+
+    def _samples(self) -> List[str]:
+        raise NotImplementedError
+
+class Counter(_Metric):
+    """
+    Yalnızca artan sayaç.
+    """
+    kind = 'counter'
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        super().__init__(name, documentation, labelnames)
+        self._values: Dict[Tuple[str, ...], float] = {}
+        if not self.labelnames:
+            self._values[()] = 0.0
+
+    def inc(self, amount: float = 1.0, **labels) -> None:
+        """
+        Sayacı artırır.
+
+        Args:
+            amount (float): Artış miktarı (negatif olamaz)
+            **labels: Etiket değerleri
+        """
+        if amount < 0:
+            raise ValueError("Sayaç azaltılamaz")
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0.0) + amount
+
+    def value(self, **labels) -> float:
+        with self._lock:
+            return self._values.get(self._key(labels), 0.0)
+
+    def _samples(self) -> List[str]:
+        with self._lock:
+            items = sorted(self._values.items())
+        return [f"{self.name}{_format_labels(self.labelnames, key)} {_format_value(value)}" for key, value in items]
+
+class Gauge(Counter):
+    """
+    Artıp azalabilen anlık değer (ör. devam eden çağrı sayısı).
+    """
+    kind = 'gauge'
+
+    def inc(self, amount: float = 1.0, **labels) -> None:
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0.0) + amount
+
+    def dec(self, amount: float = 1.0, **labels) -> None:
+        self.inc(-amount, **labels)
+
+    def set(self, value: float, **labels) -> None:
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = float(value)
+
+class _HistogramTimer:
+    """with bloğunun süresini histograma kaydeder"""
+    def __init__(self, histogram: 'Histogram', labels: Dict[str, str]):
+        self.histogram = histogram
+        self.labels = labels
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.histogram.observe(time.perf_counter() - self.start, **self.labels)
+        return False
+
+class Histogram(_Metric):
+    """
+    Kovalı süre/değer dağılımı (Prometheus histogram).
+    """
+    kind = 'histogram'
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = (),
+                 buckets: Sequence[float] = DEFAULT_BUCKETS):
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(sorted(buckets))
+        # anahtar -> [kova sayıları..., toplam, adet]
+        self._values: Dict[Tuple[str, ...], List[float]] = {}
+
+    def observe(self, value: float, **labels) -> None:
+        """
+        Bir gözlem kaydeder.
+
+        Args:
+            value (float): Gözlenen değer (ör. saniye)
+            **labels: Etiket değerleri
+        """
+        key = self._key(labels)
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            state = self._values.get(key)
+            if state is None:
+                state = self._values[key] = [0] * len(self.buckets) + [0.0, 0]
+            if index < len(self.buckets):
+                state[index] += 1
+            state[-2] += value
+            state[-1] += 1
+
+    def time(self, **labels) -> _HistogramTimer:
+        """
+        with bloğunun süresini ölçen zamanlayıcı döndürür.
+        """
+        self._key(labels)
+        return _HistogramTimer(self, labels)
+
+    def count(self, **labels) -> int:
+        with self._lock:
+            state = self._values.get(self._key(labels))
+            return int(state[-1]) if state else 0
+
+    def _samples(self) -> List[str]:
+        with self._lock:
+            items = sorted((key, list(state)) for key, state in self._values.items())
+        lines = []
+        for key, state in items:
+            cumulative = 0
+            for bound, bucket_count in zip(self.buckets, state):
+                cumulative += bucket_count
+                labels = _format_labels(self.labelnames, key, ('le', _format_value(bound)))
+                lines.append(f"{self.name}_bucket{labels} {cumulative}")
+            labels = _format_labels(self.labelnames, key, ('le', '+Inf'))
+            lines.append(f"{self.name}_bucket{labels} {int(state[-1])}")
+            lines.append(f"{self.name}_sum{_format_labels(self.labelnames, key)} {_format_value(state[-2])}")
+            lines.append(f"{self.name}_count{_format_labels(self.labelnames, key)} {int(state[-1])}")
+        return lines
+
+class MetricsRegistry:
+    """
+    Metrikleri toplar ve Prometheus metin biçiminde dışa aktarır.
+
+    Metrikler süreç içindedir; birden fazla gunicorn worker'ı varsa her worker kendi
+    değerlerini raporlar.
+    """
+
+    def __init__(self):
+        self._metrics: Dict[str, _Metric] = {}
+        self._lock = threading.Lock()
+
+    def register(self, metric: _Metric) -> _Metric:
+        with self._lock:
+            if metric.name in self._metrics:
+                raise ValueError(f"Metrik zaten kayıtlı: {metric.name}")
+            self._metrics[metric.name] = metric
+        return metric
+
+    def counter(self, name: str, documentation: str, labelnames: Sequence[str] = ()) -> Counter:
+        return self.register(Counter(name, documentation, labelnames))
+
+    def gauge(self, name: str, documentation: str, labelnames: Sequence[str] = ()) -> Gauge:
+        return self.register(Gauge(name, documentation, labelnames))
+
+    def histogram(self, name: str, documentation: str, labelnames: Sequence[str] = (),
+                  buckets: Sequence[float] = DEFAULT_BUCKETS) -> Histogram:
+        return self.register(Histogram(name, documentation, labelnames, buckets))
+
+    def render(self) -> str:
+        """
+        Tüm metrikleri Prometheus metin biçiminde (0.0.4) döndürür.
+        """
+        with self._lock:
+            metrics = list(self._metrics.values())
+        lines = []
+        for metric in metrics:
+            lines.extend(metric.render())
+        return "\n".join(lines) + "\n"
+
+class StageTimer:
+    """
+    Pipeline aşamalarının sürelerini ölçer; her start() bir önceki aşamayı kapatır.
+
+    Kullanım:
+        timer = StageTimer('exercise')
+        timer.start('analyzing')
+        ...
+        timer.start('parsing_tests')
+        ...
+        timer.stop()
+    """
+
+    def __init__(self, pipeline: str, histogram: Optional[Histogram] = None):
+        self.pipeline = pipeline
+        self.histogram = histogram or PIPELINE_STAGE_SECONDS
+        self._stage = None
+        self._started = None
+
+    def start(self, stage: str) -> None:
+        self.stop()
+        self._stage = stage
+        self._started = time.perf_counter()
+
+    def stop(self) -> None:
+        if self._stage is not None:
+            self.histogram.observe(time.perf_counter() - self._started,
+                                   pipeline=self.pipeline, stage=self._stage)
+            self._stage = None
+
+# Uygulama genelindeki metrikler
+REGISTRY = MetricsRegistry()
+
+PIPELINE_STAGE_SECONDS = REGISTRY.histogram(
+    'flai_pipeline_stage_seconds', 'Egzersiz pipeline aşamalarının süresi (saniye)', ['pipeline', 'stage'])
+GEMINI_CALLS = REGISTRY.counter(
+    'flai_gemini_calls_total', 'Gemini API çağrıları', ['mode', 'status'])
+GEMINI_CALL_SECONDS = REGISTRY.histogram(
+    'flai_gemini_call_seconds', 'Gemini API çağrılarının süresi (saniye)', ['mode'])
+LLM_CACHE_HITS = REGISTRY.counter(
+    'flai_llm_cache_hits_total', 'Önbellekten yanıtlanan Gemini istemleri')
+SAMPLE_TEST_FALLBACKS = REGISTRY.counter(
+    'flai_sample_test_fallbacks_total', 'Gemini yanıtı yerine örnek testlerin döndürülme sayısı')
+MANUAL_PARSE_FALLBACKS = REGISTRY.counter(
+    'flai_manual_parse_fallbacks_total', 'Test yanıtının JSON yerine manuel ayrıştırılma sayısı')
+FLALINGO_ERRORS = REGISTRY.counter(
+    'flai_errors_total', 'ERROR_CODES hata kodlarına göre oluşan hatalar', ['code'])
+GEMINI_QUEUE_WAIT_SECONDS = REGISTRY.histogram(
+    'flai_gemini_queue_wait_seconds', 'Gemini çağrı izni için kuyrukta bekleme süresi (saniye)', ['priority'])
+GEMINI_QUEUE_DEPTH = REGISTRY.gauge(
+    'flai_gemini_queue_depth', 'Gemini çağrı izni bekleyen istekler (worker başına)', ['priority'])
+GEMINI_IN_FLIGHT = REGISTRY.gauge(
+    'flai_gemini_in_flight', 'Devam eden Gemini çağrıları (worker başına)')
+GEMINI_QUEUE_TIMEOUTS = REGISTRY.counter(
+    'flai_gemini_queue_timeouts_total', 'Süresi içinde çağrı izni alamayan istekler', ['priority'])
+PROMPT_COMPRESSION_RATIO = REGISTRY.histogram(
+    'flai_prompt_compression_ratio', 'Sıkıştırılan transkriptin özgün token sayısına oranı',
+    buckets=(0.1, 0.2, 0.3, 0.4, 0.5, 0.6, 0.7, 0.8, 0.9, 1.0))
@@ -0,0 +1,190 @@
+import os
+import re
+import heapq
+import logging
+from collections import Counter
+from typing import Any, Dict, List, Optional, Tuple
+
+from .metrics import PROMPT_COMPRESSION_RATIO
+
+# Loglama yapılandırması
+logger = logging.getLogger(__name__)
+
+# Gemini için kaba token tahmini (~4 karakter/token)
+CHARS_PER_TOKEN = 4
+
+# Atlanan konuşmaların yerine konan işaret
+GAP_MARKER = "[...]"
+
+# Uzun konuşmalar (öğretmen anlatımı) bu kelime sayısında kesilir
+MAX_UTTERANCE_WORDS = 60
+
+# ASR dolgu kelimeleri; tek başına bilgi taşımaz
+FILLER_WORDS = frozenset({'um', 'uh', 'erm', 'er', 'ah', 'hmm', 'mm', 'mhm', 'uh-huh', 'mm-hmm'})
+BACKCHANNEL_WORDS = FILLER_WORDS | {'ok', 'okay', 'yeah', 'yes', 'right', 'so', 'well', 'alright', 'oh', 'aha'}
+
+_SPEAKER_LINE_RE = re.compile(r"^([^:\n]{1,40}):\s*(.*)$")
+_WORD_RE = re.compile(r"[A-Za-z']+")
+_FILLER_RE = re.compile(r"\b(?:um+|uh+|erm+|er|hmm+|mm+|mhm)\b[,.]?\s*", re.IGNORECASE)
+
+# Öğrenci hatalarına sık rastlanan kalıplar (kesin değil; yalnızca puanı artırır)
+_ERROR_PATTERNS = re.compile(
+    r"\b(?:he|she|it) (?:go|have|do|want|like|say|make|know|think|live|work)\b"
+    r"|\bdid(?:n't| not)? \w+ed\b"
+    r"|\bi am agree\b"
+    r"|\bmore (?:better|worse|bigger|easier|faster)\b"
+    r"|\b(?:peoples|informations|advices|furnitures)\b"
+    # "a" + ünlü sesle başlayan kelime; ünsüz sesle okunan "u" (university, user), "one" ve "eu" hariç
+    r"|\ba (?!(?:one|once|eu\w*|ewe)\b)(?:[aeio]\w+|u(?![b-df-hj-np-tv-z][aeiouy])\w+)\b"
+    r"|\byesterday i (?:go|eat|see|buy|have)\b",
+    re.IGNORECASE
+)
+
+def prompt_budget_tokens() -> int:
+    """
+    GEMINI_PROMPT_BUDGET_TOKENS > 0 ise transkript, istemlere bu token bütçesine sığacak
+    şekilde sıkıştırılır; 0 ise (varsayılan) ilk 8000 karakter kullanılır.
+    """
+    return int(os.getenv("GEMINI_PROMPT_BUDGET_TOKENS", "0"))
+
+def estimate_tokens(text: str) -> int:
+    return max(1, len(text) // CHARS_PER_TOKEN) if text else 0
+
+def _split_speaker(line: str) -> Tuple[Optional[str], str]:
+    match = _SPEAKER_LINE_RE.match(line)
+    if match:
+        return match.group(1).strip(), match.group(2)
+    return None, line
+
+def _clean(text: str, max_words: int = MAX_UTTERANCE_WORDS) -> str:
+    # Dolgu kelimelerini at, çok uzun konuşmaları kes
+    text = _FILLER_RE.sub("", text).strip()
+    words = text.split()
+    if len(words) > max_words:
+        text = " ".join(words[:max_words]) + " ..."
+    return text
+
+def _score_utterances(texts: List[str], speakers: List[Optional[str]]) -> List[float]:
+    """
+    Her konuşmaya bilgi değeri puanı verir.
+
+    Öğrenci konuşmaları, transkriptte ilk kez geçen kelimeler, olası dil hataları ve
+    sorular puanı artırır; yalnızca dolgu/onay kelimelerinden oluşan ya da aynen tekrarlanan
+    konuşmalar 0 alır.
+    En çok kelime kullanan konuşmacı öğretmen kabul edilir.
+    """
+    word_lists = [[word.lower() for word in _WORD_RE.findall(text)] for text in texts]
+    words_by_speaker = Counter()
+    for speaker, words in zip(speakers, word_lists):
+        words_by_speaker[speaker] += len(words)
+    teacher = None
+    if len([speaker for speaker in words_by_speaker if speaker is not None]) > 1:
+        teacher = words_by_speaker.most_common(1)[0][0]
+
+    seen = set()
+    seen_utterances = set()
+    scores = []
+    for text, speaker, words in zip(texts, speakers, word_lists):
+        content = [word for word in words if word not in BACKCHANNEL_WORDS]
+        utterance_key = " ".join(content)
+        # Dolgu/onaylar ve aynen tekrarlanan konuşmalar yeni bilgi taşımaz
+        if not content or utterance_key in seen_utterances:
+            scores.append(0.0)
+            continue
+        seen_utterances.add(utterance_key)
+        new_words = {word for word in content if len(word) > 3 and word not in seen}
+        seen.update(content)
+        score = 1.0
+        if speaker != teacher:
+            score += 2.0
+        score += min(3.0, 0.5 * len(new_words))
+        if '?' in text:
+            score += 1.0
+        if speaker != teacher and _ERROR_PATTERNS.search(text):
+            score += 1.5
+        scores.append(score)
+    return scores
+
+def compress_transcript(all_text: str, token_budget: int) -> Tuple[str, Dict[str, Any]]:
+    """
+    Transkripti en bilgilendirici konuşmaları seçerek token bütçesine sığdırır.
+
+    Konuşmalar puanlanır, en yüksek puanlılar bütçe dolana kadar seçilir ve özgün
+    sırasıyla yazılır; atlanan aralıkların yerine tek bir "[...]" satırı konur.
+
+    Args:
+        all_text (str): Satır başına bir konuşma içeren ("Konuşmacı: metin") transkript
+        token_budget (int): En fazla token sayısı
+
+    Returns:
+        Tuple[str, Dict[str, Any]]: Sıkıştırılmış metin ve istatistikler
+            (original_tokens, compressed_tokens, ratio, kept, total)
+    """
+    lines = [line for line in all_text.split("\n") if line.strip()]
+    original_tokens = estimate_tokens(all_text)
+    if original_tokens <= token_budget:
+        return all_text, {'original_tokens': original_tokens, 'compressed_tokens': original_tokens,
+                          'ratio': 1.0, 'kept': len(lines), 'total': len(lines)}
+
+    speakers, texts = [], []
+    for line in lines:
+        speaker, text = _split_speaker(line)
+        speakers.append(speaker)
+        texts.append(text)
+    scores = _score_utterances(texts, speakers)
+
+    rendered = []
+    for speaker, text in zip(speakers, texts):
+        cleaned = _clean(text)
+        rendered.append(f"{speaker}: {cleaned}" if speaker is not None else cleaned)
+
+    budget_chars = token_budget * CHARS_PER_TOKEN
+    used = 0
+    selected = set()
+    # Aynı puanda önce daha erken konuşma (ders akışı)
+    for _, index in sorted((-score, index) for index, score in enumerate(scores) if score > 0):
+        cost = len(rendered[index]) + 1 + len(GAP_MARKER) + 1
+        if used + cost > budget_chars:
+            continue
+        selected.add(index)
+        used += cost
+
+    output = []
+    previous = -1
+    for index in sorted(selected):
+        if index != previous + 1:
+            output.append(GAP_MARKER)
+        output.append(rendered[index])
+        previous = index
+    if previous != len(lines) - 1 and output:
+        output.append(GAP_MARKER)
+    compressed = "\n".join(output)
+
+    compressed_tokens = estimate_tokens(compressed)
+    stats = {
+        'original_tokens': original_tokens,
+        'compressed_tokens': compressed_tokens,
+        'ratio': round(compressed_tokens / original_tokens, 4) if original_tokens else 1.0,
+        'kept': len(selected),
+        'total': len(lines)
+    }
+    PROMPT_COMPRESSION_RATIO.observe(stats['ratio'])
+    logger.debug("Transkript sıkıştırıldı: %s", stats)
+    return compressed, stats
+
+def select_speaker_samples(texts: List[str], limit: int = 20) -> List[str]:
+    """
+    Bir konuşmacının konuşmalarından en bilgilendirici limit kadarını özgün sırasıyla seçer.
+
+    Args:
+        texts (List[str]): Konuşmacının konuşmaları
+        limit (int): Seçilecek en fazla konuşma sayısı
+
+    Returns:
+        List[str]: Seçilen (dolgu kelimeleri temizlenmiş) konuşmalar
+    """
+    if len(texts) <= limit:
+        return [_clean(text) for text in texts]
+    scores = _score_utterances(texts, [None] * len(texts))
+    best = heapq.nlargest(limit, range(len(texts)), key=lambda index: (scores[index], -index))
+    return [_clean(texts[index]) for index in sorted(best)]
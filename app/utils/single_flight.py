@@ -0,0 +1,138 @@
+import asyncio
+import logging
+import threading
+from concurrent.futures import Future, TimeoutError as FutureTimeoutError
+from typing import Any, Awaitable, Callable, Dict, Hashable, Optional, Tuple
+
+# Loglama yapılandırması
+logger = logging.getLogger(__name__)
+
+class SingleFlightTimeout(Exception):
+    """Devam eden çağrının sonucu bekleme süresi içinde gelmediğinde fırlatılır"""
+
+class _Call:
+    """Devam eden tek bir çağrının durumu"""
+    def __init__(self):
+        # Senkron ve asenkron bekleyenler aynı Future üzerinden sonucu alır
+        self.future = Future()
+        self.waiters = 0
+
+class SingleFlight:
+    """
+    Aynı anahtarla eş zamanlı yapılan çağrıları birleştirir.
+
+    İlk çağrı işi yapar; aynı anahtarla gelen diğer çağrılar onun sonucunu
+    (veya hatasını) bekler. Senkron (do) ve eş yordam (do_async) çağrıları aynı
+    kaydı paylaşır; hangisi önce gelirse iş bir kez yapılır.
+    """
+
+    def __init__(self, wait_timeout: Optional[float] = None):
+        """
+        SingleFlight sınıfını başlatır.
+
+        Args:
+            wait_timeout (float, optional): Bekleyenlerin sonucu en fazla bekleyeceği süre
+                (saniye); dolarsa SingleFlightTimeout fırlatılır (None: süresiz)
+        """
+        self.wait_timeout = wait_timeout
+        self._calls: Dict[Hashable, _Call] = {}
+        self._lock = threading.Lock()
+
+    def _join(self, key: Hashable) -> Tuple[_Call, bool]:
+        with self._lock:
+            call = self._calls.get(key)
+            if call is not None:
+                call.waiters += 1
+                return call, False
+            call = _Call()
+            self._calls[key] = call
+            return call, True
+
+    def _finish(self, key: Hashable, call: _Call) -> None:
+        with self._lock:
+            del self._calls[key]
+        if call.waiters:
+            logger.debug("%d eş zamanlı çağrı birleştirildi: %s", call.waiters, key)
+
+    def do(self, key: Hashable, func: Callable[..., Any], *args, **kwargs) -> Tuple[Any, bool]:
+        """
+        İşlevi anahtar başına en fazla bir kez eş zamanlı çalıştırır.
+
+        Args:
+            key (Hashable): Birleştirme anahtarı
+            func (Callable): Çalıştırılacak işlev
+
+        Returns:
+            Tuple[Any, bool]: İşlevin sonucu ve sonucun başka bir çağrıdan paylaşılıp paylaşılmadığı
+
+        Raises:
+            SingleFlightTimeout: Devam eden çağrı wait_timeout içinde bitmezse (yalnızca bekleyenler)
+            Exception: İşlevin fırlattığı hata tüm bekleyenlere iletilir
+        """
+        call, leader = self._join(key)
+        if not leader:
+            logger.debug("Devam eden çağrı bekleniyor: %s", key)
+            try:
+                return call.future.result(self.wait_timeout), True
+            except FutureTimeoutError:
+                raise SingleFlightTimeout(f"Devam eden çağrı {self.wait_timeout} sn içinde bitmedi: {key}")
+
+        try:
+            result = func(*args, **kwargs)
+            call.future.set_result(result)
+            return result, False
+        except Exception as e:
+            call.future.set_exception(e)
+            raise
+        finally:
+            self._finish(key, call)
+            if not call.future.done():
+                # Exception dışı bir hata (ör. KeyboardInterrupt) bekleyenleri askıda bırakmasın
+                call.future.cancel()
+
+    async def do_async(self, key: Hashable, coroutine_function: Callable[..., Awaitable[Any]],
+                       *args) -> Tuple[Any, bool]:
+        """
+        do()'nun eş yordam sürümü; senkron çağrılarla aynı anahtar kaydını paylaşır.
+
+        İş bir görev olarak çalışır; çağıran iptal edilirse iş diğer bekleyenler için sürer.
+
+        Args:
+            key (Hashable): Birleştirme anahtarı
+            coroutine_function (Callable): Çalıştırılacak eş yordam işlevi
+
+        Returns:
+            Tuple[Any, bool]: Sonuç ve sonucun başka bir çağrıdan paylaşılıp paylaşılmadığı
+
+        Raises:
+            SingleFlightTimeout: Devam eden çağrı wait_timeout içinde bitmezse (yalnızca bekleyenler)
+            Exception: İşin fırlattığı hata tüm bekleyenlere iletilir
+        """
+        call, leader = self._join(key)
+        if not leader:
+            logger.debug("Devam eden çağrı bekleniyor: %s", key)
+            try:
+                result = await asyncio.wait_for(asyncio.shield(asyncio.wrap_future(call.future)),
+                                                self.wait_timeout)
+            except asyncio.TimeoutError:
+                raise SingleFlightTimeout(f"Devam eden çağrı {self.wait_timeout} sn içinde bitmedi: {key}")
+            return result, True
+
+        try:
+            task = asyncio.get_running_loop().create_task(coroutine_function(*args))
+        except BaseException:
+            self._finish(key, call)
+            call.future.cancel()
+            raise
+
+        def settle(task: asyncio.Task) -> None:
+            self._finish(key, call)
+            if task.cancelled():
+                call.future.cancel()
+            elif task.exception() is not None:
+                call.future.set_exception(task.exception())
+            else:
+                call.future.set_result(task.result())
+
+        task.add_done_callback(settle)
+        return await asyncio.shield(task), False
@@ -1,23 +1,35 @@
+import os
 import json
 import logging
 import random
-from typing import Dict, List, Any
+from typing import Dict, List, Any, Iterable, Iterator, Optional, Union
+from .metrics import MANUAL_PARSE_FALLBACKS
 
 # Loglama yapılandırması
 logger = logging.getLogger(__name__)
 
+# Bir egzersizde döndürülen en fazla soru sayısı (senkron ve akış yolları)
+MAX_QUESTIONS = int(os.getenv("EXERCISE_MAX_QUESTIONS", "10"))
+
 class TestGenerator:
     """
     Transkript verisinden test soruları üreten sınıf.
     """
     
-    def __init__(self, transcript_data: Dict[str, Any]):
+    def __init__(self, transcript_data: Union[Dict[str, Any], str]):
         """
         TestGenerator sınıfını başlatır.
         
         Args:
-            transcript_data (Dict[str, Any]): İşlenmiş transkript verisi
-        """
+            transcript_data (Union[Dict[str, Any], str]): İşlenmiş transkript verisi
+                veya yapay zekadan gelen ham test metni (raw_tests)
+        """
+        if isinstance(transcript_data, str):
+            self.raw_tests = transcript_data
+            transcript_data = {}
+        else:
+            self.raw_tests = transcript_data.get('raw_tests', '')
+        self.processed_tests = []
         self.transcript_data = transcript_data
         self.openai_data = transcript_data.get('openai', {})
         self.gladia_data = transcript_data.get('gladia_response', [])
@@ -212,9 +224,9 @@ class TestGenerator:
             try:
                 # JSON formatını temizle (yapay zeka bazen kod bloğu içinde JSON döndürebilir)
                 cleaned_json = self._clean_json_string(self.raw_tests)
-                logger.debug(f"Temizlenmiş JSON: {cleaned_json}")
+                logger.debug("Temizlenmiş JSON: %s", cleaned_json)
                 tests_data = json.loads(cleaned_json)
-                logger.debug(f"JSON yüklendi: {tests_data}")
+                logger.debug("JSON yüklendi: %s", tests_data)
                 
                 # JSON yapısına göre işleme
                 if isinstance(tests_data, list):
@@ -228,16 +240,23 @@ class TestGenerator:
                     self.processed_tests = [tests_data]
                     logger.debug("Diğer JSON formatında testler işlendi.")
             except json.JSONDecodeError as e:
-                # Manuel ayrıştırma
-                logger.debug(f"JSON ayrıştırma hatası: {str(e)}. Manuel ayrıştırma yapılıyor.")
-                self.processed_tests = self._manually_parse_tests()
+                # Yanıt yarıda kesilmiş olabilir; tamamlanmış soruları kurtar
+                parser = StreamingQuestionParser()
+                salvaged = parser.feed(self.raw_tests or '') + parser.close()
+                if salvaged:
+                    logger.debug("JSON ayrıştırma hatası: %s. %s tamamlanmış soru kurtarıldı.", e, len(salvaged))
+                    self.processed_tests = salvaged
+                else:
+                    # Manuel ayrıştırma
+                    logger.debug("JSON ayrıştırma hatası: %s. Manuel ayrıştırma yapılıyor.", e)
+                    self.processed_tests = self._manually_parse_tests()
             
             # Test verilerini doğrula ve temizle
             self._validate_and_clean_tests()
             
             return self.processed_tests
         except Exception as e:
-            logger.error(f"Test verileri işlenirken hata oluştu: {str(e)}")
+            logger.error("Test verileri işlenirken hata oluştu: %s", e)
             return []
     
     def _clean_json_string(self, json_str: str) -> str:
@@ -271,10 +290,12 @@ class TestGenerator:
         Returns:
             List[Dict[str, Any]]: Manuel olarak ayrıştırılmış test verileri.
         """
+        MANUAL_PARSE_FALLBACKS.inc()
+        
         # Basit bir manuel ayrıştırma
         tests = []
         lines = self.raw_tests.split('\n')
-        logger.debug(f"Manuel ayrıştırma için {len(lines)} satır.")
+        logger.debug("Manuel ayrıştırma için %s satır.", len(lines))
         
         current_test = {}
         for line in lines:
@@ -284,9 +305,9 @@ class TestGenerator:
             if line.startswith("Soru ") or line.startswith("Question "):
                 if current_test and 'question' in current_test:
                     tests.append(current_test)
-                    logger.debug(f"Yeni test eklendi: {current_test}")
+                    logger.debug("Yeni test eklendi: %s", current_test)
                 current_test = {'question': line, 'options': []}
-                logger.debug(f"Yeni soru başladı: {line}")
+                logger.debug("Yeni soru başladı: %s", line)
             
             # Seçenekler
             elif line.startswith(("A)", "B)", "C)", "D)")):
@@ -296,24 +317,24 @@ class TestGenerator:
                     'letter': option_letter,
                     'text': option_text
                 })
-                logger.debug(f"Seçenek eklendi: {option_letter} - {option_text}")
+                logger.debug("Seçenek eklendi: %s - %s", option_letter, option_text)
             
             # Doğru cevap
             elif "Doğru cevap:" in line or "Correct answer:" in line:
                 current_test['correct_answer'] = line.split(":")[-1].strip()
-                logger.debug(f"Doğru cevap eklendi: {current_test['correct_answer']}")
+                logger.debug("Doğru cevap eklendi: %s", current_test['correct_answer'])
             
             # Açıklama
             elif "Açıklama:" in line or "Explanation:" in line:
                 current_test['explanation'] = line.split(":")[-1].strip()
-                logger.debug(f"Açıklama eklendi: {current_test['explanation']}")
+                logger.debug("Açıklama eklendi: %s", current_test['explanation'])
         
         # Son soruyu ekle
         if current_test and 'question' in current_test:
             tests.append(current_test)
-            logger.debug(f"Son test eklendi: {current_test}")
+            logger.debug("Son test eklendi: %s", current_test)
         
-        logger.debug(f"Manuel ayrıştırma sonucu {len(tests)} test oluşturuldu.")
+        logger.debug("Manuel ayrıştırma sonucu %s test oluşturuldu.", len(tests))
         return tests
     
     def _validate_and_clean_tests(self) -> None:
@@ -326,44 +347,59 @@ class TestGenerator:
         
         cleaned_tests = []
         for test in self.processed_tests:
-            # Gerekli alanları kontrol et
-            if not all(key in test for key in ['question']):
-                logger.warning(f"Geçersiz test: 'question' alanı eksik - {test}")
-                continue
-            
-            # Seçenekleri kontrol et
-            if 'options' not in test or not test['options']:
-                logger.debug(f"Test için seçenekler oluşturuluyor: {test['question']}")
-                # Seçenekleri A, B, C, D anahtarlarından oluştur
-                options = []
-                for letter in ['A', 'B', 'C', 'D']:
-                    if letter in test:
-                        options.append({
-                            'letter': letter,
-                            'text': test[letter]
-                        })
-                test['options'] = options
-            
-            # Doğru cevabı kontrol et
-            if 'correct_answer' not in test:
-                if 'answer' in test:
-                    test['correct_answer'] = test['answer']
-                    logger.debug(f"Doğru cevap 'answer' alanından alındı: {test['correct_answer']}")
-                else:
-                    # Varsayılan olarak A'yı seç
-                    test['correct_answer'] = 'A'
-                    logger.warning(f"Doğru cevap bulunamadı, varsayılan olarak 'A' seçildi: {test['question']}")
-            
-            # Açıklamayı kontrol et
-            if 'explanation' not in test:
-                test['explanation'] = "Açıklama bulunmuyor."
-                logger.debug(f"Açıklama bulunamadı, varsayılan açıklama eklendi: {test['question']}")
-            
-            cleaned_tests.append(test)
+            cleaned = self.validate_test(test)
+            if cleaned is not None:
+                cleaned_tests.append(cleaned)
         
-        logger.debug(f"Temizleme sonrası {len(cleaned_tests)} test kaldı.")
+        logger.debug("Temizleme sonrası %s test kaldı.", len(cleaned_tests))
         self.processed_tests = cleaned_tests
     
+    @staticmethod
+    def validate_test(test: Any) -> Optional[Dict[str, Any]]:
+        """
+        Tek bir test sorusunu doğrular ve eksik alanlarını tamamlar.
+        
+        Args:
+            test (Any): Ayrıştırılmış soru nesnesi.
+            
+        Returns:
+            Optional[Dict[str, Any]]: Temizlenmiş soru veya geçersizse None.
+        """
+        # Gerekli alanları kontrol et
+        if not isinstance(test, dict) or 'question' not in test:
+            logger.warning("Geçersiz test: 'question' alanı eksik - %s", test)
+            return None
+        
+        # Seçenekleri kontrol et
+        if 'options' not in test or not test['options']:
+            logger.debug("Test için seçenekler oluşturuluyor: %s", test['question'])
+            # Seçenekleri A, B, C, D anahtarlarından oluştur
+            options = []
+            for letter in ['A', 'B', 'C', 'D']:
+                if letter in test:
+                    options.append({
+                        'letter': letter,
+                        'text': test[letter]
+                    })
+            test['options'] = options
+        
+        # Doğru cevabı kontrol et
+        if 'correct_answer' not in test:
+            if 'answer' in test:
+                test['correct_answer'] = test['answer']
+                logger.debug("Doğru cevap 'answer' alanından alındı: %s", test['correct_answer'])
+            else:
+                # Varsayılan olarak A'yı seç
+                test['correct_answer'] = 'A'
+                logger.warning("Doğru cevap bulunamadı, varsayılan olarak 'A' seçildi: %s", test['question'])
+        
+        # Açıklamayı kontrol et
+        if 'explanation' not in test:
+            test['explanation'] = "Açıklama bulunmuyor."
+            logger.debug("Açıklama bulunamadı, varsayılan açıklama eklendi: %s", test['question'])
+        
+        return test
+    
     def get_tests_as_html(self) -> str:
         """
         Test verilerini HTML formatında döndürür.
@@ -399,19 +435,157 @@ class TestGenerator:
             html += "</div>"
         
         html += "</div>"
-        logger.debug(f"{len(self.processed_tests)} test için HTML oluşturuldu.")
+        logger.debug("%s test için HTML oluşturuldu.", len(self.processed_tests))
         return html
 
     def get_tests_as_json(self) -> List[Dict[str, Any]]:
         """
         Test verilerini JSON formatında döndürür.
-        Her zaman en fazla 10 soru döndürür.
+        Her zaman en fazla MAX_QUESTIONS soru döndürür.
         
         Returns:
-            List[Dict[str, Any]]: İşlenmiş test verileri (maksimum 10 soru).
+            List[Dict[str, Any]]: İşlenmiş test verileri (en fazla MAX_QUESTIONS soru).
         """
         if not self.processed_tests:
             return []
             
-        # En fazla 10 soru döndür
-        return self.processed_tests[:10] 
\ No newline at end of file
+        # En fazla MAX_QUESTIONS soru döndür
+        return self.processed_tests[:MAX_QUESTIONS] 
+
+class StreamingQuestionParser:
+    """
+    Yapay zeka yanıtını parça parça alıp, her soru nesnesini kapanış parantezi geldiği anda üreten artımlı ayrıştırıcı.
+    
+    Yanıt bir soru dizisi (``[{...}, ...]``) veya ``{"questions": [...]}`` nesnesi
+    olabilir. Kod blokları (```), dizinin önündeki/arkasındaki açıklama metinleri
+    ve yarıda kesilmiş son soru tolere edilir. Her karakter yalnızca bir kez taranır.
+    """
+    
+    def __init__(self, validate: bool = True):
+        """
+        StreamingQuestionParser sınıfını başlatır.
+        
+        Args:
+            validate (bool): Üretilen sorular TestGenerator.validate_test ile temizlensin mi
+        """
+        self.validate = validate
+        self._buffer = ""
+        self._scan_pos = 0       # Tamponda taranacak sonraki konum
+        self._stack = []         # Açık JSON kapsayıcıları ('{' veya '[')
+        self._in_string = False
+        self._escape = False
+        self._candidate = None   # Dizi içinde açılan soru nesnesinin (başlangıç, derinlik) bilgisi
+        self.emitted = 0
+    
+    def feed(self, chunk: str) -> List[Dict[str, Any]]:
+        """
+        Yeni bir yanıt parçasını işler.
+        
+        Args:
+            chunk (str): Yanıt parçası
+            
+        Returns:
+            List[Dict[str, Any]]: Bu parça ile tamamlanan sorular
+        """
+        self._buffer += chunk
+        completed = []
+        buffer = self._buffer
+        stack = self._stack
+        
+        for position in range(self._scan_pos, len(buffer)):
+            char = buffer[position]
+            
+            if self._in_string:
+                if self._escape:
+                    self._escape = False
+                elif char == '\\':
+                    self._escape = True
+                elif char == '"':
+                    self._in_string = False
+                continue
+            
+            if char == '"':
+                # JSON dışındaki açıklama metinlerindeki tırnaklar dikkate alınmaz
+                if stack:
+                    self._in_string = True
+            elif char == '[':
+                stack.append('[')
+            elif char == '{':
+                if self._candidate is None and stack and stack[-1] == '[':
+                    self._candidate = (position, len(stack))
+                stack.append('{')
+            elif char in ']}':
+                if not stack:
+                    continue
+                stack.pop()
+                if char == '}' and self._candidate is not None and len(stack) == self._candidate[1]:
+                    question = self._decode(buffer[self._candidate[0]:position + 1])
+                    self._candidate = None
+                    if question is not None:
+                        completed.append(question)
+        
+        # Artık gerekmeyen kısmı tampondan at; henüz soru üretilmediyse tek nesne
+        # biçimindeki yanıtlar için close() tamponun tamamına ihtiyaç duyabilir
+        if self._candidate is not None:
+            keep_from = self._candidate[0]
+            self._candidate = (0, self._candidate[1])
+        elif self.emitted == 0:
+            keep_from = 0
+        else:
+            keep_from = len(buffer)
+        self._buffer = buffer[keep_from:]
+        self._scan_pos = len(self._buffer)
+        return completed
+    
+    def close(self) -> List[Dict[str, Any]]:
+        """
+        Akışın sonunu işler; yarıda kalan soru atılır.
+        
+        Returns:
+            List[Dict[str, Any]]: Son durumda tamamlanabilen sorular (tek bir soru nesnesi dönen yanıtlar için)
+        """
+        completed = []
+        if self._candidate is not None:
+            logger.debug("Akışın sonunda yarım kalan soru atıldı.")
+        elif self.emitted == 0 and self._buffer.strip():
+            # Dizi yerine tek bir soru nesnesi dönmüş olabilir
+            text = self._buffer
+            start = text.find('{')
+            end = text.rfind('}')
+            if start != -1 and end > start:
+                question = self._decode(text[start:end + 1])
+                if question is not None:
+                    completed.append(question)
+        self._buffer = ""
+        self._scan_pos = 0
+        self._candidate = None
+        return completed
+    
+    def _decode(self, text: str) -> Optional[Dict[str, Any]]:
+        try:
+            question = json.loads(text)
+        except json.JSONDecodeError as e:
+            logger.debug("Soru nesnesi ayrıştırılamadı: %s", e)
+            return None
+        if self.validate:
+            question = TestGenerator.validate_test(question)
+        elif not isinstance(question, dict) or 'question' not in question:
+            question = None
+        if question is not None:
+            self.emitted += 1
+        return question
+
+def iter_streamed_questions(chunks: Iterable[str]) -> Iterator[Dict[str, Any]]:
+    """
+    Akış halinde gelen model yanıtından her soruyu tamamlandığı anda üretir.
+
+    Args:
+        chunks (Iterable[str]): Model yanıtının parçaları
+
+    Yields:
+        Dict[str, Any]: Doğrulanmış her soru nesnesi
+    """
+    parser = StreamingQuestionParser()
+    for chunk in chunks:
+        yield from parser.feed(chunk)
+    yield from parser.close()
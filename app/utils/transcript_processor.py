@@ -1,28 +1,244 @@
+import io
+import csv
 import json
 import re
 import os
-from typing import Dict, List, Any
+import heapq
+import logging
+from collections import Counter
+from operator import itemgetter
+from typing import Dict, List, Any, IO, Iterator, Optional, Tuple, Union
 from datetime import datetime, timedelta
 
+# Loglama yapılandırması
+logger = logging.getLogger(__name__)
+
+# Yüklenebilen transkript dosya türleri
+SUPPORTED_EXTENSIONS = ('.txt', '.vtt', '.csv')
+
+# Zoom metin satırları: "Konuşmacı: metin". Konuşmacı harfle başlayan, en fazla 40 karakterlik
+# bir addır (cümle noktalaması yok); iki noktadan hemen sonra rakam gelirse ("10:30") saat sayılır
+_SPEAKER_LINE_RE = re.compile(r"^([^\W\d_][\w .'-]{0,39}?)\s*:(?!\d)\s*(.+)$")
+
+# Zoom sohbet kayıtlarında satır başındaki zaman damgası: "00:01:23 Alice: merhaba"
+_LEADING_TIMESTAMP_RE = re.compile(r'^\[?\d{1,2}:\d{2}(?::\d{2})?\]?\s+')
+
+# Kelime analizinde kaldırılan noktalama işaretleri
+_PUNCTUATION_RE = re.compile(r'[^\w\s]')
+
+# Kelime analizinde döndürülen en sık kelime sayısı
+MOST_COMMON_WORDS = 20
+
+# WebVTT zaman satırları: "00:00:01.829 --> 00:00:04.109"
+_TIMING_LINE_RE = re.compile(
+    r'^((?:\d+:)?\d{1,2}:\d{2}(?:[.,]\d{1,3})?)\s*-->\s*((?:\d+:)?\d{1,2}:\d{2}(?:[.,]\d{1,3})?)'
+)
+
+def _use_columnar_statistics() -> bool:
+    """
+    TRANSCRIPT_STATS_ENGINE=pandas ise istatistikler sütunsal (pandas/NumPy) yolla hesaplanır.
+    """
+    return os.getenv("TRANSCRIPT_STATS_ENGINE", "python").lower() == 'pandas'
+
 class TranscriptProcessor:
     """
     Transkript verilerini işleyen ve analiz eden sınıf.
     """
     
-    def __init__(self, transcript_data: Dict[str, Any]):
+    def __init__(self, transcript_data: Union[Dict[str, Any], str]):
         """
         TranscriptProcessor sınıfını başlatır.
         
         Args:
-            transcript_data (Dict[str, Any]): Gladia'dan alınan transkript verisi
+            transcript_data (Union[Dict[str, Any], str]): Gladia'dan alınan transkript verisi
+                veya load_transcript() ile okunacak .txt/.vtt/.csv dosyasının yolu
         """
+        self.file_path = None
+        self._stream = None
+        if isinstance(transcript_data, str):
+            self.file_path = transcript_data
+            transcript_data = None
         self.transcript_data = transcript_data
         self.processed_data = None
+    
+    @classmethod
+    def from_stream(cls, stream: IO[bytes], filename: str) -> 'TranscriptProcessor':
+        """
+        Diske yazmadan, yüklenen dosyanın akışından okunacak bir işlemci oluşturur.
+        
+        Args:
+            stream (IO[bytes]): Dosya içeriğinin ikili akışı (ör. FileStorage.stream)
+            filename (str): Dosya türünü belirlemek için dosya adı
+            
+        Returns:
+            TranscriptProcessor: load_transcript() çağrılmaya hazır işlemci
+        """
+        processor = cls(filename)
+        processor._stream = stream
+        return processor
+    
+    @property
+    def file_type(self) -> Optional[str]:
+        """
+        Dosya uzantısından transkript türünü ('txt', 'vtt' veya 'csv') döndürür.
+        """
+        if not self.file_path:
+            return None
+        extension = os.path.splitext(self.file_path)[1].lower()
+        return extension[1:] if extension in SUPPORTED_EXTENSIONS else None
+    
+    def load_transcript(self) -> bool:
+        """
+        Transkript dosyasını satır satır okuyarak transcript_data'yı oluşturur.
+        
+        Dosya içeriği hiçbir zaman tek parça halinde belleğe alınmaz.
+        
+        Returns:
+            bool: Yükleme başarılıysa True
+        """
+        if self.file_type is None:
+            logger.error("Desteklenmeyen transkript dosyası: %s", self.file_path)
+            return False
+        
+        try:
+            if self._stream is not None:
+                return self._load_from_binary(self._stream)
+            with open(self.file_path, 'rb') as f:
+                return self._load_from_binary(f)
+        except (OSError, UnicodeError, csv.Error, ValueError) as e:
+            logger.error("Transkript yüklenemedi (%s): %s", self.file_path, e)
+            return False
+    
+    def _load_from_binary(self, stream: IO[bytes]) -> bool:
+        # utf-8-sig: Excel/Zoom dışa aktarımlarındaki BOM karakterini atlar
+        text_stream = io.TextIOWrapper(stream, encoding='utf-8-sig', errors='replace', newline='')
+        try:
+            if self.file_type in ('txt', 'vtt'):
+                self.transcript_data = {'gladia_response': list(self._iter_text_utterances(text_stream))}
+            else:
+                self.transcript_data = self._read_csv(text_stream)
+        finally:
+            # Alttaki akışı kapatmadan ayır (FileStorage akışı Werkzeug tarafından kapatılır)
+            text_stream.detach()
         
-    def process_transcript(self) -> Dict[str, Any]:
+        utterance_count = len(self.transcript_data.get('gladia_response', []))
+        logger.debug("Transkript yüklendi: %s (%s konuşma)", self.file_path, utterance_count)
+        return utterance_count > 0
+    
+    @staticmethod
+    def _iter_text_utterances(lines: Iterator[str]) -> Iterator[Dict[str, Any]]:
+        """
+        Zoom metin (.txt) veya WebVTT (.vtt) transkript satırlarından konuşma kayıtları üretir.
+        
+        "Konuşmacı: metin" satırları yeni bir konuşma başlatır; konuşmacısı olmayan satırlar
+        bir önceki konuşmanın devamı sayılır. WebVTT dosyalarında başlık ve ipucu numaraları
+        atlanır, zaman satırları konuşmaya time_begin/time_end/duration olarak eklenir.
+        Satırlar tek geçişte işlenir; dosyanın tamamı belleğe alınmaz.
+        
+        Args:
+            lines (Iterator[str]): Transkript satırları
+            
+        Yields:
+            Dict[str, Any]: speaker, text ve (varsa) zaman alanlarını içeren konuşma
+        """
+        current = None
+        cue_times = None
+        last_speaker = 'Unknown'
+        for line in lines:
+            line = line.strip()
+            if not line:
+                # WebVTT'de boş satır ipucunu bitirir
+                cue_times = None
+                continue
+            
+            if line[0].isdigit():
+                timing = _TIMING_LINE_RE.match(line)
+                if timing:
+                    if current is not None:
+                        yield current
+                        current = None
+                    cue_times = (_parse_timestamp(timing.group(1)), _parse_timestamp(timing.group(2)))
+                    continue
+                if line.isdigit():
+                    # WebVTT ipucu numarası
+                    continue
+            elif current is None and cue_times is None and line.startswith('WEBVTT'):
+                continue
+            
+            match = _SPEAKER_LINE_RE.match(_LEADING_TIMESTAMP_RE.sub('', line, count=1))
+            if match:
+                if current is not None:
+                    yield current
+                last_speaker = match.group(1).strip()
+                current = {'speaker': last_speaker, 'text': match.group(2).strip()}
+            elif current is not None:
+                current['text'] += " " + line
+                continue
+            elif cue_times is not None:
+                # Konuşmacı adı olmayan ipucu önceki konuşmacıya aittir
+                current = {'speaker': last_speaker, 'text': line}
+            else:
+                continue
+            
+            if cue_times is not None:
+                current['time_begin'], current['time_end'] = cue_times
+                current['duration'] = round(cue_times[1] - cue_times[0], 3)
+        if current is not None:
+            yield current
+    
+    @staticmethod
+    def _read_csv(lines: Iterator[str]) -> Dict[str, Any]:
+        """
+        CSV transkriptini satır satır okur.
+        
+        İki biçim desteklenir:
+            - Flalingo rapor dışa aktarımı: JSON içeren gladia_response (ve isteğe bağlı
+              openai, calculations) sütunları
+            - Konuşma satırları: speaker, text/transcription ve duration veya time_begin/time_end sütunları
+        """
+        transcript_data = {'gladia_response': []}
+        utterances = transcript_data['gladia_response']
+        
+        for row in csv.DictReader(lines):
+            if row.get('gladia_response'):
+                utterances.extend(
+                    TranscriptProcessor._normalize_utterance(entry)
+                    for entry in json.loads(row['gladia_response'])
+                )
+                for column in ('openai', 'calculations'):
+                    if row.get(column) and column not in transcript_data:
+                        transcript_data[column] = json.loads(row[column])
+            else:
+                utterance = TranscriptProcessor._normalize_utterance(row)
+                if utterance.get('text'):
+                    utterances.append(utterance)
+        
+        return transcript_data
+    
+    @staticmethod
+    def _normalize_utterance(entry: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Gladia'nın ham alanlarını (transcription, time_begin, time_end) işlemcinin
+        kullandığı text/duration alanlarına dönüştürür.
+        """
+        utterance = {'speaker': entry.get('speaker', 'Unknown')}
+        utterance['text'] = (entry.get('text') or entry.get('transcription') or '').strip()
+        if entry.get('duration') not in (None, ''):
+            utterance['duration'] = float(entry['duration'])
+        elif entry.get('time_begin') not in (None, '') and entry.get('time_end') not in (None, ''):
+            utterance['time_begin'] = float(entry['time_begin'])
+            utterance['time_end'] = float(entry['time_end'])
+            utterance['duration'] = round(utterance['time_end'] - utterance['time_begin'], 5)
+        return utterance
+        
+    def process_transcript(self, include_word_frequency: bool = False) -> Dict[str, Any]:
         """
         Transkripti işler ve analiz için hazırlar.
         
+        Args:
+            include_word_frequency (bool): True ise kelime analizine tüm kelime
+                frekansları (word_frequency) da eklenir
+        
         Returns:
             Dict[str, Any]: İşlenmiş transkript verileri.
         """
@@ -37,10 +253,14 @@ class TranscriptProcessor:
         stats = self._calculate_statistics(gladia_data)
         
         # Kelime analizini yap
-        vocabulary = self._analyze_vocabulary(gladia_data)
+        vocabulary = self._analyze_vocabulary(gladia_data, include_word_frequency)
+        
+        # Yapay zeka analizinin beklediği konuşmacı yapıları
+        conversation = self._build_conversation(gladia_data)
         
         # Sonuçları hazırla
         self.processed_data = {
+            **conversation,
             'gladia_response': gladia_data,
             'calculations': {
                 'statistics': stats,
@@ -50,32 +270,82 @@ class TranscriptProcessor:
         
         return self.processed_data
     
-    def _calculate_statistics(self, gladia_data: List[Dict[str, Any]]) -> Dict[str, Any]:
+    @staticmethod
+    def _build_conversation(gladia_data: List[Dict[str, Any]]) -> Dict[str, Any]:
         """
-        Konuşma istatistiklerini hesaplar.
+        Konuşmalardan speakers, speaker_counts, all_text ve timings yapılarını tek geçişte oluşturur.
+        
+        Metinler kopyalanmaz; speakers listeleri ve all_text aynı metin nesnelerini kullanır.
         
         Args:
             gladia_data: Gladia'dan gelen konuşma verileri
             
         Returns:
-            Dict[str, Any]: Hesaplanan istatistikler
+            Dict[str, Any]: speakers (konuşmacı başına metinler), speaker_counts (konuşmacı başına
+                konuşma sayısı), all_text ("Konuşmacı: metin" satırları) ve timings (ders başlangıcı,
+                bitişi ve süresi; zaman bilgisi yoksa None)
         """
-        # Konuşmacıları gruplandır
         speakers = {}
+        speaker_counts = {}
+        lines = []
+        start = end = None
+        
         for entry in gladia_data:
+            text = entry.get('text', '')
+            if not text:
+                continue
             speaker = entry.get('speaker', 'Unknown')
-            if speaker not in speakers:
-                speakers[speaker] = []
-            speakers[speaker].append(entry)
+            texts = speakers.get(speaker)
+            if texts is None:
+                texts = speakers[speaker] = []
+                speaker_counts[speaker] = 0
+            texts.append(text)
+            speaker_counts[speaker] += 1
+            lines.append(f"{speaker}: {text}")
+            
+            time_begin = entry.get('time_begin')
+            if time_begin is not None:
+                if start is None or time_begin < start:
+                    start = time_begin
+                time_end = entry.get('time_end', time_begin)
+                if end is None or time_end > end:
+                    end = time_end
+        
+        timings = None
+        if start is not None:
+            timings = {'start': start, 'end': end, 'duration': round(end - start, 3)}
+        
+        return {
+            'speakers': speakers,
+            'speaker_counts': speaker_counts,
+            'all_text': "\n".join(lines),
+            'timings': timings
+        }
+    
+    def _calculate_statistics(self, gladia_data: List[Dict[str, Any]]) -> Dict[str, Any]:
+        """
+        Konuşma istatistiklerini hesaplar.
+        
+        TRANSCRIPT_STATS_ENGINE=pandas ise konuşmacı toplamları pandas/NumPy ile
+        sütunsal olarak hesaplanır; sonuç Python yoluyla aynıdır.
+        
+        Args:
+            gladia_data: Gladia'dan gelen konuşma verileri
+            
+        Returns:
+            Dict[str, Any]: Hesaplanan istatistikler
+        """
+        speaker_totals = None
+        if _use_columnar_statistics():
+            speaker_totals = self._speaker_totals_columnar(gladia_data)
+        if speaker_totals is None:
+            speaker_totals = self._speaker_totals(gladia_data)
         
         # Her konuşmacı için istatistikler
         speaker_stats = {}
-        for speaker, entries in speakers.items():
-            total_words = sum(len(entry.get('text', '').split()) for entry in entries)
-            total_time = sum(float(entry.get('duration', 0)) for entry in entries)
-            
+        for speaker, utterances, total_words, total_time in speaker_totals:
             speaker_stats[speaker] = {
-                'total_utterances': len(entries),
+                'total_utterances': utterances,
                 'total_words': total_words,
                 'total_time': round(total_time, 2),
                 'words_per_minute': round((total_words / total_time) * 60, 2) if total_time > 0 else 0
@@ -92,44 +362,115 @@ class TranscriptProcessor:
             'average_words_per_minute': round((total_words / total_time) * 60, 2) if total_time > 0 else 0
         }
     
-    def _analyze_vocabulary(self, gladia_data: List[Dict[str, Any]]) -> Dict[str, Any]:
+    @staticmethod
+    def _speaker_totals(gladia_data: List[Dict[str, Any]]) -> List[Tuple[Any, int, int, float]]:
+        """
+        Konuşmacı başına konuşma sayısı, kelime sayısı ve konuşma süresini hesaplar.
+        
+        Args:
+            gladia_data: Gladia'dan gelen konuşma verileri
+            
+        Returns:
+            List[Tuple[Any, int, int, float]]: İlk görünme sırasına göre
+                (konuşmacı, konuşma sayısı, kelime sayısı, süre) kayıtları
+        """
+        # Konuşmacıları gruplandır
+        speakers = {}
+        for entry in gladia_data:
+            speaker = entry.get('speaker', 'Unknown')
+            if speaker not in speakers:
+                speakers[speaker] = []
+            speakers[speaker].append(entry)
+        
+        return [
+            (
+                speaker,
+                len(entries),
+                sum(len(entry.get('text', '').split()) for entry in entries),
+                sum(float(entry.get('duration', 0)) for entry in entries)
+            )
+            for speaker, entries in speakers.items()
+        ]
+    
+    @staticmethod
+    def _speaker_totals_columnar(gladia_data: List[Dict[str, Any]]) -> Optional[List[Tuple[Any, int, int, float]]]:
+        """
+        _speaker_totals ile aynı toplamları sütunsal olarak hesaplar.
+        
+        Konuşma tablosu bir kez oluşturulur (konuşmacı kodları, süre ve kelime sayısı
+        dizileri), konuşmacı toplamları np.bincount ile tek indirgemede bulunur.
+        
+        Args:
+            gladia_data: Gladia'dan gelen konuşma verileri
+            
+        Returns:
+            Optional[List[Tuple[Any, int, int, float]]]: Konuşmacı toplamları;
+                pandas kurulu değilse None
+        """
+        try:
+            import numpy as np
+            import pandas as pd
+        except ImportError:
+            logger.warning("pandas bulunamadı, istatistikler Python ile hesaplanıyor.")
+            return None
+        
+        count = len(gladia_data)
+        speakers = np.empty(count, dtype=object)
+        speakers[:] = [entry.get('speaker', 'Unknown') for entry in gladia_data]
+        durations = np.fromiter((float(entry.get('duration', 0)) for entry in gladia_data),
+                                dtype=np.float64, count=count)
+        words = np.fromiter((len(entry.get('text', '').split()) for entry in gladia_data),
+                            dtype=np.int64, count=count)
+        
+        # Kodlar ilk görünme sırasına göre atanır (Python yolundaki sözlük sırası)
+        codes, uniques = pd.factorize(speakers, sort=False, use_na_sentinel=False)
+        size = len(uniques)
+        utterance_counts = np.bincount(codes, minlength=size)
+        word_totals = np.bincount(codes, weights=words, minlength=size)
+        time_totals = np.bincount(codes, weights=durations, minlength=size)
+        
+        return [
+            (speaker, int(utterances), int(total_words), float(total_time))
+            for speaker, utterances, total_words, total_time in zip(
+                uniques.tolist(), utterance_counts.tolist(), word_totals.tolist(), time_totals.tolist())
+        ]
+    
+    def _analyze_vocabulary(self, gladia_data: List[Dict[str, Any]],
+                            include_word_frequency: bool = False) -> Dict[str, Any]:
         """
         Konuşmalardaki kelime kullanımını analiz eder.
         
+        Kelimeler konuşma konuşma sayaca eklenir; tüm kelimelerin listesi oluşturulmaz.
+        En sık kelimeler tüm sözlük sıralanmadan yığın (heap) ile bulunur.
+        
         Args:
             gladia_data: Gladia'dan gelen konuşma verileri
+            include_word_frequency: True ise tüm kelime frekansları da döndürülür
             
         Returns:
             Dict[str, Any]: Kelime analizi sonuçları
         """
-        # Tüm kelimeleri topla
-        all_words = []
+        word_freq = Counter()
         for entry in gladia_data:
-            text = entry.get('text', '').lower()
             # Noktalama işaretlerini kaldır
-            text = re.sub(r'[^\w\s]', '', text)
-            words = text.split()
-            all_words.extend(words)
+            word_freq.update(_PUNCTUATION_RE.sub('', entry.get('text', '').lower()).split())
         
-        # Kelime frekanslarını hesapla
-        word_freq = {}
-        for word in all_words:
-            word_freq[word] = word_freq.get(word, 0) + 1
-        
-        # En sık kullanılan kelimeleri bul
-        common_words = sorted(word_freq.items(), key=lambda x: x[1], reverse=True)[:20]
+        # En sık kullanılan kelimeleri bul (eşitlikte ilk görülen kelime önce gelir)
+        common_words = heapq.nlargest(MOST_COMMON_WORDS, word_freq.items(), key=itemgetter(1))
         
         # Kelime çeşitliliği
-        vocabulary_size = len(set(all_words))
-        total_words = len(all_words)
+        vocabulary_size = len(word_freq)
+        total_words = sum(word_freq.values())
         
-        return {
+        vocabulary = {
             'vocabulary_size': vocabulary_size,
             'total_words': total_words,
             'unique_words_ratio': round(vocabulary_size / total_words * 100, 2) if total_words > 0 else 0,
-            'most_common_words': [{'word': word, 'count': count} for word, count in common_words],
-            'word_frequency': word_freq
+            'most_common_words': [{'word': word, 'count': count} for word, count in common_words]
         }
+        if include_word_frequency:
+            vocabulary['word_frequency'] = dict(word_freq)
+        return vocabulary
     
     def get_summary(self) -> Dict[str, Any]:
         """
@@ -165,4 +506,13 @@ class TranscriptProcessor:
                 'diversity_ratio': vocab['unique_words_ratio'],
                 'top_words': vocab['most_common_words'][:10]  # İlk 10 kelime
             }
-        } 
\ No newline at end of file
+        } 
+
+def _parse_timestamp(value: str) -> float:
+    """
+    "SS:DD:ss.mmm" veya "DD:ss.mmm" biçimindeki zamanı saniyeye çevirir.
+    """
+    seconds = 0.0
+    for part in value.replace(',', '.').split(':'):
+        seconds = seconds * 60 + float(part)
+    return round(seconds, 3)
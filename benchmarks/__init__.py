@@ -0,0 +1 @@
+# benchmarks paketi başlatma dosyası
@@ -0,0 +1,93 @@
+"""
+Aynı anda çok sayıda ders analizinde senkron pipeline (thread havuzu) ile asenkron
+pipeline'ın (tek olay döngüsü) karşılaştırması.
+
+Raporlar generate_exercises ile üretilir. Flalingo isteği sabit bir gecikmeyle, Gemini ise
+token sayısına göre gecikme ekleyen sahte modelle simüle edilir. Süre, rapor/sn ve
+çalışma sırasında görülen en yüksek thread sayısı raporlanır.
+
+Kullanım:
+    python -m benchmarks.bench_async_pipeline [--reports 200] [--workers 8 200] [--llm-time-scale 0.2]
+"""
+import os
+import time
+import asyncio
+import logging
+import argparse
+import itertools
+import threading
+from unittest import mock
+
+os.environ["LLM_CACHE_ENABLED"] = "0"
+
+from app.utils import exercise_pipeline
+from app.utils.ai_analyzer import AIAnalyzer, set_analyzer
+from benchmarks.common import LatencyStubModel, emit
+from benchmarks.run_suite import respond
+from benchmarks.synthetic import generate_gladia_transcript
+
+def run(reports, asynchronous: bool, workers: int) -> dict:
+    environ = {'EXERCISE_ASYNC_PIPELINE': '1' if asynchronous else '0', 'BATCH_EXERCISE_WORKERS': str(workers)}
+    peak = [threading.active_count()]
+    done = threading.Event()
+
+    def sample():
+        while not done.wait(0.01):
+            peak[0] = max(peak[0], threading.active_count())
+
+    sampler = threading.Thread(target=sample, daemon=True)
+    with mock.patch.dict(os.environ, environ), mock.patch.object(exercise_pipeline, '_batch_executor', None):
+        sampler.start()
+        started = time.perf_counter()
+        results = list(exercise_pipeline.generate_exercises('bench', reports))
+        elapsed = time.perf_counter() - started
+        done.set()
+        sampler.join()
+        if exercise_pipeline._batch_executor is not None:
+            exercise_pipeline._batch_executor.shutdown()
+    return {
+        'wall_s': round(elapsed, 3),
+        'reports_per_s': round(len(reports) / elapsed, 1),
+        'failed': sum(1 for result in results if not result['success']),
+        # Örnekleyici thread hariç
+        'peak_threads': peak[0] - 1
+    }
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--reports', type=int, default=200)
+    parser.add_argument('--utterances', type=int, default=200)
+    parser.add_argument('--workers', type=int, nargs='+', default=[8, 200],
+                        help="Senkron pipeline için denenecek thread havuzu boyutları")
+    parser.add_argument('--flalingo-latency', type=float, default=0.3, help="Simüle edilen Flalingo gecikmesi (saniye)")
+    parser.add_argument('--llm-time-scale', type=float, default=0.2, help="Sahte Gemini gecikmelerinin çarpanı")
+    parser.add_argument('--output', help="Sonuçların yazılacağı JSON dosyası")
+    args = parser.parse_args()
+
+    logging.disable(logging.WARNING)
+    transcript = {'gladia_response': generate_gladia_transcript(args.utterances)}
+
+    def fetch(auth_token, flai_report):
+        time.sleep(args.flalingo_latency)
+        return transcript
+
+    async def fetch_async(auth_token, flai_report):
+        await asyncio.sleep(args.flalingo_latency)
+        return transcript
+
+    set_analyzer(AIAnalyzer(model=LatencyStubModel(respond, time_scale=args.llm_time_scale)))
+    ids = itertools.count()
+    results = {'reports': args.reports}
+    with mock.patch.object(exercise_pipeline, '_fetch_transcript', side_effect=fetch), \
+            mock.patch.object(exercise_pipeline, '_fetch_transcript_async', side_effect=fetch_async), \
+            mock.patch.object(exercise_pipeline, '_exercise_store', None):
+        for workers in args.workers:
+            reports = [f"r{next(ids)}" for _ in range(args.reports)]
+            results[f'threads_{workers}'] = run(reports, asynchronous=False, workers=workers)
+        reports = [f"r{next(ids)}" for _ in range(args.reports)]
+        results['asyncio'] = run(reports, asynchronous=True, workers=0)
+    set_analyzer(None)
+    emit('async_pipeline', results, args.output)
+
+if __name__ == '__main__':
+    main()
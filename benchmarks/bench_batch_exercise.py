@@ -0,0 +1,69 @@
+"""
+Çok sayıda rapor için egzersizlerin tek tek GET /api/flai-exercise istekleriyle ve
+tek bir POST /api/flai-exercise/batch isteğiyle üretilme sürelerinin karşılaştırması.
+
+Her iki yolda da raporlar farklıdır (önbellek isabeti yok); sahte Gemini modeli gecikme simüle eder.
+
+Kullanım:
+    python -m benchmarks.bench_batch_exercise [--reports 100] [--utterances 200] [--llm-time-scale 0.2]
+"""
+import os
+import time
+import json
+import logging
+import argparse
+import itertools
+from unittest import mock
+
+os.environ["LLM_CACHE_ENABLED"] = "0"
+
+from app.utils import exercise_pipeline
+from app.utils.ai_analyzer import AIAnalyzer, set_analyzer
+from benchmarks.common import LatencyStubModel, emit
+from benchmarks.run_suite import respond
+from benchmarks.synthetic import generate_gladia_transcript
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--reports', type=int, default=100)
+    parser.add_argument('--utterances', type=int, default=200)
+    parser.add_argument('--llm-time-scale', type=float, default=0.2,
+                        help="Sahte Gemini gecikmelerinin çarpanı")
+    parser.add_argument('--output', help="Sonuçların yazılacağı JSON dosyası")
+    args = parser.parse_args()
+
+    from app import app
+    logging.disable(logging.INFO)
+    client = app.test_client()
+    transcript = {'gladia_response': generate_gladia_transcript(args.utterances)}
+    set_analyzer(AIAnalyzer(model=LatencyStubModel(respond, time_scale=args.llm_time_scale)))
+    ids = itertools.count()
+
+    results = {'reports': args.reports, 'workers': int(os.getenv("BATCH_EXERCISE_WORKERS", "8"))}
+    with mock.patch.object(exercise_pipeline, '_fetch_transcript', return_value=transcript), \
+            mock.patch.object(exercise_pipeline, '_exercise_store', None):
+        started = time.perf_counter()
+        for _ in range(args.reports):
+            response = client.get(f"/api/flai-exercise?auth_token=bench&flai_report=r{next(ids)}")
+            assert response.status_code == 200
+        results['sequential_s'] = round(time.perf_counter() - started, 3)
+
+        reports = [f"r{next(ids)}" for _ in range(args.reports)]
+        started = time.perf_counter()
+        response = client.post('/api/flai-exercise/batch', json={'auth_token': 'bench', 'flai_reports': reports})
+        first_line = None
+        lines = []
+        for chunk in response.response:
+            if first_line is None:
+                first_line = time.perf_counter() - started
+            lines.extend(line for line in chunk.decode('utf-8').splitlines() if line)
+        results['batch_s'] = round(time.perf_counter() - started, 3)
+        results['batch_first_result_s'] = round(first_line, 3)
+        results['batch_summary'] = json.loads(lines[-1])['summary']
+    set_analyzer(None)
+
+    results['speedup'] = round(results['sequential_s'] / results['batch_s'], 1)
+    emit('batch_exercise', results, args.output)
+
+if __name__ == '__main__':
+    main()
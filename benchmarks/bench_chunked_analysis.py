@@ -0,0 +1,54 @@
+"""
+Uzun derslerde 8000 karakterle kesilen tek çağrılı analiz ile parçalı (map-reduce) analizin
+gecikme ve kapsam karşılaştırması.
+
+Kullanım:
+    python -m benchmarks.bench_chunked_analysis [--utterances 200 800 2400] [--repeat 3] [--time-scale 1.0]
+"""
+import os
+import json
+import argparse
+from unittest import mock
+
+# Önbellek ölçümü bozmasın
+os.environ["LLM_CACHE_ENABLED"] = "0"
+
+from app.utils.ai_analyzer import AIAnalyzer, ANALYSIS_CHUNK_CHARS
+from benchmarks.bench_combined_mode import ANALYSIS, build_transcript
+from benchmarks.common import LatencyStubModel, measure, emit
+
+def respond(prompt: str) -> str:
+    return "```json\n" + json.dumps(ANALYSIS, ensure_ascii=False) + "\n```"
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--utterances', type=int, nargs='+', default=[200, 800, 2400])
+    parser.add_argument('--repeat', type=int, default=3)
+    parser.add_argument('--time-scale', type=float, default=1.0,
+                        help="Sahte model gecikmelerinin çarpanı")
+    parser.add_argument('--output', help="Sonuçların yazılacağı JSON dosyası")
+    args = parser.parse_args()
+
+    results = {}
+    for utterances in args.utterances:
+        transcript = build_transcript(utterances)
+        text_length = len(transcript['all_text'])
+        row = {'characters': text_length}
+
+        for mode, enabled in (('truncated', '0'), ('chunked', '1')):
+            model = LatencyStubModel(respond, time_scale=args.time_scale)
+            analyzer = AIAnalyzer(model=model)
+            with mock.patch.dict(os.environ, {'GEMINI_CHUNKED_ANALYSIS': enabled}):
+                timing = measure(lambda: analyzer.analyze_zoom_transcript(transcript),
+                                 repeat=args.repeat, warmup=0)
+            timing['calls_per_run'] = len(model.calls) / args.repeat
+            timing['coverage'] = 1.0 if enabled == '1' else round(min(1.0, ANALYSIS_CHUNK_CHARS / text_length), 3)
+            row[mode] = timing
+
+        row['latency_ratio'] = round(row['chunked']['mean_s'] / row['truncated']['mean_s'], 3)
+        results[f"{utterances}_utterances"] = row
+
+    emit('chunked_analysis', results, args.output)
+
+if __name__ == '__main__':
+    main()
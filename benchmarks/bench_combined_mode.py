@@ -0,0 +1,106 @@
+"""
+İki çağrılı (analiz + test) yol ile tek çağrılı birleşik modun gecikme ve token karşılaştırması.
+
+Kullanım:
+    python -m benchmarks.bench_combined_mode [--utterances 400] [--repeat 5] [--time-scale 1.0]
+"""
+import os
+import json
+import argparse
+
+# Önbellek ölçümü bozmasın
+os.environ["LLM_CACHE_ENABLED"] = "0"
+
+from app.utils.ai_analyzer import AIAnalyzer
+from benchmarks.common import LatencyStubModel, measure, emit
+
+ANALYSIS = {
+    "ogretmen": "Teacher",
+    "ogrenci": "Student",
+    "seviye": "B1",
+    "guclu_yonler": ["akıcılık", "kelime bilgisi"],
+    "gelistirilmesi_gerekenler": ["geçmiş zaman", "edatlar"],
+    "yeni_kelimeler": ["itinerary", "souvenir", "layover"],
+    "ana_konular": ["seyahat", "tatil planları"]
+}
+
+QUESTIONS = [
+    {
+        "question": f"Question {i}: Which word completes the sentence?",
+        "options": [{"letter": letter, "text": f"Option {letter}"} for letter in "ABCD"],
+        "correct_answer": "B",
+        "explanation": "Explanation of the correct answer."
+    }
+    for i in range(1, 6)
+]
+
+def respond(prompt: str) -> str:
+    """
+    İstemin türüne göre örnek yanıt döndürür.
+    """
+    if '"questions"' in prompt:
+        return "```json\n" + json.dumps({"analysis": ANALYSIS, "questions": QUESTIONS}, ensure_ascii=False) + "\n```"
+    if "Analiz Sonuçları" in prompt:
+        return "```\n" + json.dumps(QUESTIONS, ensure_ascii=False) + "\n```"
+    return "```json\n" + json.dumps(ANALYSIS, ensure_ascii=False) + "\n```"
+
+def build_transcript(utterances: int):
+    """
+    Öğretmen ve öğrenci arasında geçen basit bir Zoom transkripti oluşturur.
+    """
+    lines = [
+        ("Teacher", "Could you tell me about your last holiday and where you stayed?"),
+        ("Student", "Last summer I goed to Antalya with my family and we stayed in a hotel near the beach."),
+        ("Teacher", "Nice! We say 'I went', not 'I goed'. What did you do there?"),
+        ("Student", "We swimmed every day and I bought a souvenir for my friend.")
+    ]
+    speakers = {}
+    speaker_counts = {}
+    all_text = []
+    for i in range(utterances):
+        speaker, text = lines[i % len(lines)]
+        speakers.setdefault(speaker, []).append(text)
+        speaker_counts[speaker] = speaker_counts.get(speaker, 0) + 1
+        all_text.append(f"{speaker}: {text}")
+    return {'speakers': speakers, 'speaker_counts': speaker_counts, 'all_text': "\n".join(all_text)}
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--utterances', type=int, default=400)
+    parser.add_argument('--repeat', type=int, default=5)
+    parser.add_argument('--time-scale', type=float, default=1.0,
+                        help="Sahte model gecikmelerinin çarpanı")
+    parser.add_argument('--output', help="Sonuçların yazılacağı JSON dosyası")
+    args = parser.parse_args()
+
+    transcript = build_transcript(args.utterances)
+    results = {}
+
+    for mode in ('two_call', 'combined'):
+        model = LatencyStubModel(respond, time_scale=args.time_scale)
+        analyzer = AIAnalyzer(model=model)
+
+        if mode == 'combined':
+            def run():
+                analyzer.analyze_and_generate_zoom_tests(transcript)
+        else:
+            def run():
+                analysis = analyzer.analyze_zoom_transcript(transcript)
+                analyzer.generate_zoom_tests(analysis, transcript)
+
+        timing = measure(run, repeat=args.repeat, warmup=0)
+        runs = args.repeat
+        timing.update({
+            'calls_per_run': len(model.calls) / runs,
+            'input_tokens_per_run': sum(c['input_tokens'] for c in model.calls) / runs,
+            'output_tokens_per_run': sum(c['output_tokens'] for c in model.calls) / runs
+        })
+        results[mode] = timing
+
+    results['latency_ratio'] = round(results['combined']['mean_s'] / results['two_call']['mean_s'], 3)
+    results['input_token_ratio'] = round(
+        results['combined']['input_tokens_per_run'] / results['two_call']['input_tokens_per_run'], 3)
+    emit('combined_mode', results, args.output)
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,72 @@
+"""
+Ders bitiminde önceden üretilmiş egzersizin GET /api/flai-exercise ile depodan döndürülme
+süresi ile egzersizin istek sırasında üretilmesinin karşılaştırması.
+
+Depo isabetinde worker belleği her istekte boşaltılır (isteği başka bir worker
+karşılıyormuş gibi); böylece SQLite okuması ölçülür.
+
+Kullanım:
+    python -m benchmarks.bench_exercise_store [--utterances 600] [--llm-time-scale 1.0]
+"""
+import os
+import time
+import logging
+import argparse
+import tempfile
+from unittest import mock
+
+os.environ["LLM_CACHE_ENABLED"] = "0"
+
+from app.utils import exercise_pipeline
+from app.utils.ai_analyzer import AIAnalyzer, set_analyzer
+from app.utils.exercise_store import ExerciseStore
+from benchmarks.common import LatencyStubModel, measure, emit
+from benchmarks.run_suite import respond
+from benchmarks.synthetic import generate_gladia_transcript
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--utterances', type=int, default=600)
+    parser.add_argument('--llm-time-scale', type=float, default=1.0,
+                        help="Sahte Gemini gecikmelerinin çarpanı")
+    parser.add_argument('--repeat', type=int, default=50)
+    parser.add_argument('--output', help="Sonuçların yazılacağı JSON dosyası")
+    args = parser.parse_args()
+
+    from app import app
+    logging.disable(logging.INFO)
+    client = app.test_client()
+    transcript = {'gladia_response': generate_gladia_transcript(args.utterances)}
+    set_analyzer(AIAnalyzer(model=LatencyStubModel(respond, time_scale=args.llm_time_scale)))
+
+    results = {}
+    with tempfile.TemporaryDirectory() as directory, \
+            mock.patch.object(exercise_pipeline, '_fetch_transcript', return_value=transcript), \
+            mock.patch.object(exercise_pipeline, '_exercise_store', ExerciseStore(os.path.join(directory, 'store.db'))):
+        reports = iter(range(10 ** 6))
+
+        def generate():
+            response = client.get(f"/api/flai-exercise?auth_token=bench&flai_report=r{next(reports)}")
+            assert response.status_code == 200
+
+        results['generated_on_request'] = measure(generate, repeat=3, warmup=0)
+
+        # Ders bitiş bildirimiyle üretilmiş bir egzersiz
+        response = client.post('/api/webhooks/lesson-ended', json={'auth_token': 'bench', 'flai_report': 'lesson'})
+        job_url = response.get_json()['data']['status_url']
+        while client.get(job_url).get_json()['data']['status'] not in ('completed', 'failed'):
+            time.sleep(0.05)
+
+        def lookup():
+            exercise_pipeline._exercise_cache._data.clear()
+            response = client.get("/api/flai-exercise?auth_token=bench&flai_report=lesson")
+            assert response.status_code == 200
+
+        results['store_hit'] = measure(lookup, repeat=args.repeat, warmup=3)
+    set_analyzer(None)
+
+    results['speedup'] = round(results['generated_on_request']['median_s'] / results['store_hit']['median_s'], 1)
+    emit('exercise_store', results, args.output)
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,95 @@
+"""
+FlalingoService HTTP istemcisinin yerel bir Flalingo sunucusuna karşı ölçümü.
+
+Karşılaştırılanlar:
+  - bare_requests: Her çağrıda yeni bağlantı açan requests.get (eski davranış)
+  - pooled_session: Bağlantı havuzlu paylaşılan oturum (FlalingoService._get)
+  - hung_upstream: Askıda kalan sunucuda zaman aşımı + devre kesici ile hata süresi
+
+Kullanım:
+    python -m benchmarks.bench_flalingo_client [--requests 300] [--threads 8]
+"""
+import os
+import time
+import argparse
+import requests
+from concurrent.futures import ThreadPoolExecutor
+
+from app.utils.circuit_breaker import CircuitBreaker
+from app.utils.flalingo_service import FlalingoService, FlalingoError
+from benchmarks.common import emit
+from benchmarks.flalingo_standin import StandInServer
+
+def run_load(call, total: int, threads: int) -> dict:
+    """
+    Çağrıyı verilen eşzamanlılıkla total kez çalıştırır.
+    """
+    latencies = []
+
+    def one(_):
+        start = time.perf_counter()
+        call()
+        latencies.append(time.perf_counter() - start)
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=threads) as executor:
+        list(executor.map(one, range(total)))
+    elapsed = time.perf_counter() - start
+    latencies.sort()
+    return {
+        'requests': total,
+        'elapsed_s': round(elapsed, 4),
+        'throughput_rps': round(total / elapsed, 1),
+        'p50_ms': round(latencies[len(latencies) // 2] * 1000, 3),
+        'p95_ms': round(latencies[int(len(latencies) * 0.95) - 1] * 1000, 3)
+    }
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--requests', type=int, default=300)
+    parser.add_argument('--threads', type=int, default=8)
+    parser.add_argument('--latency', type=float, default=0.002, help="Sunucu gecikmesi (saniye)")
+    parser.add_argument('--output', help="Sonuçların yazılacağı JSON dosyası")
+    args = parser.parse_args()
+
+    results = {}
+    params = {'auth_token': 'token', 'flai_report': 'report'}
+
+    with StandInServer(latency=args.latency) as server:
+        url = f"{server.base_url}/flai-transcript"
+
+        server.connections = 0
+        results['bare_requests'] = run_load(lambda: requests.get(url, params=params).json(),
+                                            args.requests, args.threads)
+        results['bare_requests']['connections'] = server.connections
+
+        service = FlalingoService(base_url=server.base_url)
+        server.connections = 0
+        results['pooled_session'] = run_load(lambda: service._get(url, params=params).json(),
+                                             args.requests, args.threads)
+        results['pooled_session']['connections'] = server.connections
+
+    # Askıda kalan sunucu: zaman aşımı ve devre kesici hatayı sınırlar
+    os.environ.setdefault("FLALINGO_READ_TIMEOUT", "0.5")
+    os.environ.setdefault("FLALINGO_MAX_RETRIES", "1")
+    with StandInServer(hang=3.0) as server:
+        service = FlalingoService(base_url=server.base_url,
+                                  breaker=CircuitBreaker('bench', failure_threshold=2, reset_timeout=60))
+        timings = []
+        for _ in range(5):
+            start = time.perf_counter()
+            try:
+                service._get(f"{server.base_url}/flai-transcript", params=params)
+            except FlalingoError:
+                pass
+            timings.append(round(time.perf_counter() - start, 4))
+        results['hung_upstream'] = {
+            'read_timeout_s': service.timeout[1],
+            'failure_times_s': timings,
+            'breaker_state': service.breaker.state
+        }
+
+    emit('flalingo_client', results, args.output)
+
+if __name__ == '__main__':
+    main()
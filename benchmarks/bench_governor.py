@@ -0,0 +1,111 @@
+"""
+Gemini düzenleyicisinin (GeminiGovernor) ani yük altında davranışı.
+
+Birden fazla süreç (gunicorn worker'larını temsilen) aynı GEMINI_GOVERNOR_DIR dizinini
+paylaşır; her süreç etkileşimli ve arka plan çağrılarını aynı anda başlatır. Sahte modelin
+gördüğü en yüksek eş zamanlı çağrı sayısı, gerçekleşen istek/sn ve önceliğe göre kuyruk
+bekleme yüzdelikleri raporlanır.
+
+Kullanım:
+    python -m benchmarks.bench_governor [--processes 4] [--calls 24] [--max-in-flight 4] [--rate 20]
+"""
+import time
+import shutil
+import logging
+import tempfile
+import argparse
+import multiprocessing
+from concurrent.futures import ThreadPoolExecutor
+
+from benchmarks.common import emit
+
+def _worker(args, directory: str, queue) -> None:
+    from app.utils.fake_gemini import FakeGenerativeModel
+    from app.utils.gemini_governor import BACKGROUND, INTERACTIVE, GeminiGovernor, request_priority
+    logging.getLogger().setLevel(logging.WARNING)
+
+    governor = None
+    if args.max_in_flight or args.rate:
+        governor = GeminiGovernor(rate=args.rate, max_in_flight=args.max_in_flight, timeout=120,
+                                  directory=directory)
+    model = FakeGenerativeModel(latency=args.latency)
+
+    def call(index: int):
+        priority = BACKGROUND if index % 2 else INTERACTIVE
+        submitted = time.time()
+        with request_priority(priority):
+            permit = governor.acquire() if governor else None
+            started = time.time()
+            try:
+                model.generate_content("Aşağıdaki Zoom ders transkriptini analiz et.")
+            finally:
+                if governor:
+                    governor.release(permit)
+        return priority, submitted, started, time.time()
+
+    with ThreadPoolExecutor(max_workers=args.calls) as executor:
+        queue.put(list(executor.map(call, range(args.calls))))
+
+def percentile(samples, fraction):
+    samples = sorted(samples)
+    return round(samples[min(len(samples) - 1, int(len(samples) * fraction))], 3) if samples else 0.0
+
+def summarize(records) -> dict:
+    events = sorted([(started, 1) for _, _, started, _ in records] + [(ended, -1) for _, _, _, ended in records],
+                    key=lambda event: (event[0], event[1]))
+    peak = current = 0
+    for _, delta in events:
+        current += delta
+        peak = max(peak, current)
+    first = min(submitted for _, submitted, _, _ in records)
+    last = max(ended for _, _, _, ended in records)
+    result = {
+        'calls': len(records),
+        'peak_in_flight': peak,
+        'wall_s': round(last - first, 3),
+        'achieved_rps': round(len(records) / (last - first), 2)
+    }
+    for priority in ('interactive', 'background'):
+        waits = [started - submitted for p, submitted, started, _ in records if p == priority]
+        result[f'{priority}_wait_p50_s'] = percentile(waits, 0.5)
+        result[f'{priority}_wait_p95_s'] = percentile(waits, 0.95)
+    return result
+
+def run(args, limited: bool) -> dict:
+    directory = tempfile.mkdtemp(prefix='flai-governor-bench-')
+    options = argparse.Namespace(**vars(args))
+    if not limited:
+        options.max_in_flight, options.rate = 0, 0.0
+    queue = multiprocessing.Queue()
+    processes = [multiprocessing.Process(target=_worker, args=(options, directory, queue))
+                 for _ in range(args.processes)]
+    try:
+        for process in processes:
+            process.start()
+        records = [record for _ in processes for record in queue.get()]
+        for process in processes:
+            process.join()
+    finally:
+        shutil.rmtree(directory, ignore_errors=True)
+    return summarize(records)
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--processes', type=int, default=4)
+    parser.add_argument('--calls', type=int, default=24, help="Süreç başına eş zamanlı çağrı sayısı")
+    parser.add_argument('--latency', type=float, default=0.2, help="Sahte Gemini gecikmesi (saniye)")
+    parser.add_argument('--max-in-flight', type=int, default=4)
+    parser.add_argument('--rate', type=float, default=20.0, help="İstek/sn sınırı (0: sınırsız)")
+    parser.add_argument('--output', help="Sonuçların yazılacağı JSON dosyası")
+    args = parser.parse_args()
+
+    emit('governor', {
+        'processes': args.processes,
+        'max_in_flight': args.max_in_flight,
+        'rate': args.rate,
+        'unlimited': run(args, limited=False),
+        'governed': run(args, limited=True)
+    }, args.output)
+
+if __name__ == '__main__':
+    main()
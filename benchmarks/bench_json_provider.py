@@ -0,0 +1,69 @@
+"""
+Tipik egzersiz yanıtlarının Flask'ın varsayılan JSON sağlayıcısı ve FastJSONProvider ile
+serileştirilme süresi ve boyutu karşılaştırması.
+
+Kullanım:
+    python -m benchmarks.bench_json_provider [--repeat 200]
+"""
+import json
+import argparse
+from flask import Flask
+from flask.json.provider import DefaultJSONProvider
+
+from app.utils.json_provider import FastJSONProvider
+from app.utils.transcript_processor import TranscriptProcessor
+from benchmarks.bench_combined_mode import ANALYSIS, QUESTIONS
+from benchmarks.common import measure, emit
+from benchmarks.synthetic import generate_gladia_transcript
+
+def build_payloads() -> dict:
+    """
+    Endpoint'lerin döndürdüğü yanıtlara benzeyen örnek veriler oluşturur.
+    """
+    utterances = generate_gladia_transcript(3000, 2)
+    processed = TranscriptProcessor({'gladia_response': utterances}).process_transcript(include_word_frequency=True)
+    exercise = {
+        'success': True,
+        'data': {
+            'analysis': json.dumps(ANALYSIS, ensure_ascii=False, indent=2),
+            'tests': QUESTIONS * 2
+        }
+    }
+    return {
+        'exercise': exercise,
+        'job_status': {'success': True, 'data': {'job_id': 'abc', 'status': 'completed', 'result': exercise}},
+        'calculations_with_word_frequency': {'success': True, 'data': processed['calculations']}
+    }
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--repeat', type=int, default=200)
+    parser.add_argument('--output', help="Sonuçların yazılacağı JSON dosyası")
+    args = parser.parse_args()
+
+    providers = {}
+    for name, provider_class, debug in (('flask_default', DefaultJSONProvider, False),
+                                        ('flask_default_debug', DefaultJSONProvider, True),
+                                        ('fast', FastJSONProvider, False)):
+        app = Flask(name)
+        app.debug = debug
+        app.json = provider_class(app)
+        providers[name] = app
+
+    results = {}
+    for payload_name, payload in build_payloads().items():
+        row = {}
+        for name, app in providers.items():
+            with app.app_context():
+                def run():
+                    return app.json.response(payload).get_data()
+                timing = measure(run, repeat=args.repeat, warmup=3)
+                timing['body_kb'] = round(len(run()) / 1024, 1)
+            row[name] = timing
+        row['speedup'] = round(row['flask_default']['median_s'] / row['fast']['median_s'], 2)
+        results[payload_name] = row
+
+    emit('json_provider', results, args.output)
+
+if __name__ == '__main__':
+    main()
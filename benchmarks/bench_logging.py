@@ -0,0 +1,55 @@
+"""
+Loglama yapılandırmalarının /api/upload sıcak yolundaki maliyeti.
+
+Manuel ayrıştırmaya düşen (satır başına DEBUG kaydı üreten) test yanıtı ve büyük bir
+işlenmiş test listesi, farklı LOG_LEVEL / LOG_FORMAT / LOG_DEBUG_SAMPLE_RATE ayarlarıyla
+ölçülür. Çıktı /dev/null'a yazılır; yalnızca biçimlendirme ve filtre maliyeti ölçülür.
+
+Kullanım:
+    python -m benchmarks.bench_logging [--repeat 200]
+"""
+import os
+import logging
+import argparse
+
+from app.utils.logging_config import configure_logging
+from app.utils.test_generator import TestGenerator
+from benchmarks.common import measure, emit
+from benchmarks.synthetic import generate_raw_tests
+
+CONFIGS = {
+    'info_text': {'level': 'INFO', 'log_format': 'text'},
+    'debug_text': {'level': 'DEBUG', 'log_format': 'text'},
+    'debug_json': {'level': 'DEBUG', 'log_format': 'json'},
+    'debug_json_sampled_10pct': {'level': 'DEBUG', 'log_format': 'json', 'debug_sample_rate': 0.1}
+}
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--repeat', type=int, default=200)
+    parser.add_argument('--questions', type=int, default=10)
+    parser.add_argument('--output', help="Sonuçların yazılacağı JSON dosyası")
+    args = parser.parse_args()
+
+    raw = generate_raw_tests(args.questions, 'prose')
+    app_logger = logging.getLogger('app')
+    results = {}
+    with open(os.devnull, 'w') as sink:
+        for name, options in CONFIGS.items():
+            configure_logging(max_chars=2000, stream=sink, **options)
+
+            def run():
+                tests = TestGenerator(raw)
+                tests.process_tests()
+                app_logger.debug("İşlenmiş testler (JSON): %s", tests.get_tests_as_json())
+
+            results[name] = measure(run, repeat=args.repeat, warmup=3)
+        configure_logging(level='WARNING')
+
+    baseline = results['info_text']['median_s']
+    for timing in results.values():
+        timing['vs_info'] = round(timing['median_s'] / baseline, 2)
+    emit('logging', results, args.output)
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,77 @@
+"""
+Worker açılış maliyeti: uygulamanın içe aktarılma süresi, ilk sağlık kontrolü ve bellek.
+
+Her ölçüm temiz bir Python sürecinde yapılır. 'eager' modu google.generativeai'yi uygulamadan
+önce içe aktararak modülün açılışta yüklendiği eski davranışı taklit eder; 'lazy' modunda
+modül ilk Gemini modeli oluşturulurken yüklenir. Ertelenen maliyet 'first_analyzer_s'
+satırında görünür (GEMINI_API_KEY sahte bir değerdir; ağ çağrısı yapılmaz).
+
+Kullanım:
+    python -m benchmarks.bench_startup [--repeat 5]
+"""
+import os
+import sys
+import json
+import argparse
+import statistics
+import subprocess
+
+from benchmarks.common import emit
+
+_PROBE = r"""
+import os, sys, json, time
+eager = sys.argv[1] == 'eager'
+started = time.perf_counter()
+if eager:
+    import google.generativeai
+import app
+imported = time.perf_counter() - started
+
+started = time.perf_counter()
+response = app.app.test_client().get('/api/health')
+assert response.status_code == 200
+health = time.perf_counter() - started
+
+def rss_mb():
+    with open('/proc/self/status') as status:
+        for line in status:
+            if line.startswith('VmRSS:'):
+                return int(line.split()[1]) / 1024
+rss = rss_mb()
+loaded = 'google.generativeai' in sys.modules
+
+from app.utils.ai_analyzer import AIAnalyzer
+started = time.perf_counter()
+AIAnalyzer()
+analyzer = time.perf_counter() - started
+
+print(json.dumps({'import_s': imported, 'health_s': health, 'rss_mb': rss,
+                  'healthy_s': imported + health, 'first_analyzer_s': analyzer,
+                  'google_loaded_at_boot': loaded}))
+"""
+
+def probe(mode: str) -> dict:
+    env = dict(os.environ, GEMINI_API_KEY='bench-key', GEMINI_FAKE='0', GEMINI_WARMUP='0', LOG_LEVEL='WARNING')
+    output = subprocess.run([sys.executable, '-c', _PROBE, mode], env=env, check=True,
+                            capture_output=True, text=True).stdout
+    return json.loads(output.strip().splitlines()[-1])
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--repeat', type=int, default=5)
+    parser.add_argument('--output', help="Sonuçların yazılacağı JSON dosyası")
+    args = parser.parse_args()
+
+    results = {}
+    for mode in ('eager', 'lazy'):
+        samples = [probe(mode) for _ in range(args.repeat)]
+        results[mode] = {key: round(statistics.median(sample[key] for sample in samples), 4)
+                         for key in ('import_s', 'health_s', 'healthy_s', 'first_analyzer_s')}
+        results[mode]['rss_mb'] = round(statistics.median(sample['rss_mb'] for sample in samples), 1)
+        results[mode]['google_loaded_at_boot'] = samples[0]['google_loaded_at_boot']
+    results['healthy_speedup'] = round(results['eager']['healthy_s'] / results['lazy']['healthy_s'], 2)
+    results['rss_saved_mb'] = round(results['eager']['rss_mb'] - results['lazy']['rss_mb'], 1)
+    emit('startup', results, args.output)
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,76 @@
+"""
+Zoom/WebVTT transkript ayrıştırıcısının uzun derslerde ölçümü.
+
+Her ders süresi için ayrıştırma + speakers/all_text oluşturma süresi ve en yüksek bellek
+kullanımı ölçülür. Konuşma başına süre (us_per_utterance) ders uzadıkça sabit kalmalıdır.
+
+Kullanım:
+    python -m benchmarks.bench_transcript_parser [--hours 1 2 4 8] [--repeat 3]
+"""
+import argparse
+import tracemalloc
+from typing import Iterator
+
+from app.utils.transcript_processor import TranscriptProcessor
+from benchmarks.common import measure, emit
+
+SENTENCES = [
+    ("Teacher", "Could you tell me about your last holiday and where you stayed?"),
+    ("Student", "Last summer I goed to Antalya with my family and we stayed in a hotel near the beach."),
+    ("Teacher", "Nice! We say 'I went', not 'I goed'. What did you do there?"),
+    ("Student", "We swimmed every day and I bought a souvenir for my friend.")
+]
+
+# Zoom ipuçları ortalama ~4 saniye sürer
+CUE_SECONDS = 4
+
+def _timestamp(seconds: int) -> str:
+    return f"{seconds // 3600:02d}:{seconds % 3600 // 60:02d}:{seconds % 60:02d}.000"
+
+def vtt_lines(hours: float) -> Iterator[str]:
+    """
+    Verilen süre için Zoom WebVTT satırları üretir (dosya belleğe alınmaz).
+    """
+    yield "WEBVTT\n"
+    yield "\n"
+    for cue in range(int(hours * 3600 / CUE_SECONDS)):
+        speaker, text = SENTENCES[cue % len(SENTENCES)]
+        begin = cue * CUE_SECONDS
+        yield f"{cue + 1}\n"
+        yield f"{_timestamp(begin)} --> {_timestamp(begin + CUE_SECONDS)}\n"
+        yield f"{speaker}: {text}\n"
+        yield "\n"
+
+def parse(hours: float) -> dict:
+    utterances = list(TranscriptProcessor._iter_text_utterances(vtt_lines(hours)))
+    return TranscriptProcessor._build_conversation(utterances)
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--hours', type=float, nargs='+', default=[1, 2, 4, 8])
+    parser.add_argument('--repeat', type=int, default=3)
+    parser.add_argument('--output', help="Sonuçların yazılacağı JSON dosyası")
+    args = parser.parse_args()
+
+    results = {}
+    for hours in args.hours:
+        utterances = int(hours * 3600 / CUE_SECONDS)
+        timing = measure(lambda: parse(hours), repeat=args.repeat)
+
+        tracemalloc.start()
+        conversation = parse(hours)
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+
+        timing.update({
+            'utterances': utterances,
+            'us_per_utterance': round(timing['median_s'] / utterances * 1e6, 2),
+            'peak_memory_mb': round(peak / 1024 / 1024, 2),
+            'all_text_mb': round(len(conversation['all_text']) / 1024 / 1024, 2)
+        })
+        results[f"{hours:g}h"] = timing
+
+    emit('transcript_parser', results, args.output)
+
+if __name__ == '__main__':
+    main()
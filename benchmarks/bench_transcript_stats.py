@@ -0,0 +1,42 @@
+"""
+TranscriptProcessor istatistiklerinin Python ve sütunsal (pandas/NumPy) yollarla hesaplanmasının ölçümü.
+
+Her boyut için iki yolun çıktısının aynı olduğu da doğrulanır.
+
+Kullanım:
+    python -m benchmarks.bench_transcript_stats [--utterances 10000 100000 500000] [--repeat 3]
+"""
+import os
+import argparse
+from unittest import mock
+
+from app.utils.transcript_processor import TranscriptProcessor
+from benchmarks.common import measure, emit
+from benchmarks.synthetic import generate_gladia_transcript
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--utterances', type=int, nargs='+', default=[10000, 100000, 500000])
+    parser.add_argument('--speakers', type=int, default=2)
+    parser.add_argument('--repeat', type=int, default=3)
+    parser.add_argument('--output', help="Sonuçların yazılacağı JSON dosyası")
+    args = parser.parse_args()
+
+    results = {}
+    for count in args.utterances:
+        utterances = generate_gladia_transcript(count, args.speakers, unique_words=False)
+        processor = TranscriptProcessor({'gladia_response': utterances})
+        row = {}
+        outputs = {}
+        for engine in ('python', 'pandas'):
+            with mock.patch.dict(os.environ, {'TRANSCRIPT_STATS_ENGINE': engine}):
+                outputs[engine] = processor._calculate_statistics(utterances)
+                row[engine] = measure(lambda: processor._calculate_statistics(utterances), repeat=args.repeat)
+        row['identical_output'] = outputs['python'] == outputs['pandas']
+        row['speedup'] = round(row['python']['median_s'] / row['pandas']['median_s'], 3)
+        results[f"{count}_utterances"] = row
+
+    emit('transcript_stats', results, args.output)
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,78 @@
+"""
+Kelime analizinin eski (tam kelime listesi + tam sıralama) ve yeni (sayaç + yığın) sürümlerinin
+süre, en yüksek bellek ve JSON yanıt boyutu karşılaştırması.
+
+Kullanım:
+    python -m benchmarks.bench_vocabulary [--utterances 2000 20000] [--repeat 3]
+"""
+import re
+import json
+import argparse
+import tracemalloc
+
+from app.utils.transcript_processor import TranscriptProcessor
+from benchmarks.common import measure, emit
+from benchmarks.synthetic import generate_gladia_transcript
+
+def legacy_vocabulary(gladia_data):
+    """
+    Önceki _analyze_vocabulary uygulaması (karşılaştırma için).
+    """
+    all_words = []
+    for entry in gladia_data:
+        text = entry.get('text', '').lower()
+        text = re.sub(r'[^\w\s]', '', text)
+        all_words.extend(text.split())
+    word_freq = {}
+    for word in all_words:
+        word_freq[word] = word_freq.get(word, 0) + 1
+    common_words = sorted(word_freq.items(), key=lambda x: x[1], reverse=True)[:20]
+    vocabulary_size = len(set(all_words))
+    total_words = len(all_words)
+    return {
+        'vocabulary_size': vocabulary_size,
+        'total_words': total_words,
+        'unique_words_ratio': round(vocabulary_size / total_words * 100, 2) if total_words > 0 else 0,
+        'most_common_words': [{'word': word, 'count': count} for word, count in common_words],
+        'word_frequency': word_freq
+    }
+
+def peak_memory(func) -> float:
+    tracemalloc.start()
+    func()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return round(peak / 1024 / 1024, 3)
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--utterances', type=int, nargs='+', default=[2000, 20000])
+    parser.add_argument('--repeat', type=int, default=3)
+    parser.add_argument('--output', help="Sonuçların yazılacağı JSON dosyası")
+    args = parser.parse_args()
+
+    results = {}
+    for count in args.utterances:
+        # Gerçek derslerde kelime dağarcığı büyüktür; her konuşmada özgün bir kelime bulunur
+        utterances = generate_gladia_transcript(count, 2)
+        processor = TranscriptProcessor({'gladia_response': utterances})
+
+        variants = {
+            'legacy': lambda: legacy_vocabulary(utterances),
+            'counter_full_map': lambda: processor._analyze_vocabulary(utterances, include_word_frequency=True),
+            'counter_top_k': lambda: processor._analyze_vocabulary(utterances)
+        }
+        row = {}
+        for name, func in variants.items():
+            timing = measure(func, repeat=args.repeat)
+            timing['peak_memory_mb'] = peak_memory(func)
+            timing['response_kb'] = round(len(json.dumps(func(), ensure_ascii=False)) / 1024, 1)
+            row[name] = timing
+        row['identical_top_words'] = (variants['legacy']()['most_common_words']
+                                      == variants['counter_top_k']()['most_common_words'])
+        results[f"{count}_utterances"] = row
+
+    emit('vocabulary', results, args.output)
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,103 @@
+"""
+Benchmark betikleri için ortak yardımcılar.
+"""
+import json
+import time
+import asyncio
+import statistics
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+def estimate_tokens(text: str) -> int:
+    """
+    Gemini token sayısını yaklaşık olarak hesaplar (~4 karakter/token).
+    """
+    return max(1, len(text) // 4)
+
+class StubResponse:
+    """Gemini yanıtı yerine kullanılan basit nesne"""
+    def __init__(self, text: str):
+        self.text = text
+
+class LatencyStubModel:
+    """
+    genai.GenerativeModel yerine kullanılan, token sayısına göre gecikme ekleyen sahte model.
+
+    Gecikme = base_latency + giriş token'ı * input_cost + çıkış token'ı * output_cost
+    """
+
+    def __init__(self, responder: Callable[[str], str], base_latency: float = 0.35,
+                 input_cost: float = 0.00005, output_cost: float = 0.006, time_scale: float = 1.0):
+        """
+        LatencyStubModel sınıfını başlatır.
+
+        Args:
+            responder (Callable[[str], str]): İstemden yanıt metni üreten işlev
+            base_latency (float): Sabit istek gecikmesi (saniye)
+            input_cost (float): Giriş token'ı başına gecikme (saniye)
+            output_cost (float): Çıkış token'ı başına gecikme (saniye)
+            time_scale (float): Tüm gecikmelerin çarpanı (hızlı çalıştırma için < 1)
+        """
+        self.responder = responder
+        self.base_latency = base_latency
+        self.input_cost = input_cost
+        self.output_cost = output_cost
+        self.time_scale = time_scale
+        self.calls: List[Dict[str, int]] = []
+
+    def generate_content(self, prompt: str, **kwargs) -> StubResponse:
+        text, delay = self._respond(prompt)
+        time.sleep(delay)
+        return StubResponse(text)
+
+    async def generate_content_async(self, prompt: str, **kwargs) -> StubResponse:
+        text, delay = self._respond(prompt)
+        await asyncio.sleep(delay)
+        return StubResponse(text)
+
+    def _respond(self, prompt: str) -> Tuple[str, float]:
+        text = self.responder(prompt)
+        input_tokens = estimate_tokens(prompt)
+        output_tokens = estimate_tokens(text)
+        self.calls.append({'input_tokens': input_tokens, 'output_tokens': output_tokens})
+        delay = self.base_latency + input_tokens * self.input_cost + output_tokens * self.output_cost
+        return text, delay * self.time_scale
+
+    def count_tokens(self, contents: str) -> Dict[str, int]:
+        return {'total_tokens': estimate_tokens(contents)}
+
+def measure(func: Callable[[], Any], repeat: int = 5, warmup: int = 1) -> Dict[str, float]:
+    """
+    İşlevi tekrar tekrar çalıştırır ve süre istatistiklerini döndürür.
+
+    Args:
+        func (Callable): Ölçülecek işlev
+        repeat (int): Ölçüm sayısı
+        warmup (int): Ölçüme katılmayan ısınma çalıştırması sayısı
+
+    Returns:
+        Dict[str, float]: Saniye cinsinden min/ortalama/medyan/maks süreler
+    """
+    for _ in range(warmup):
+        func()
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        samples.append(time.perf_counter() - start)
+    return {
+        'repeat': repeat,
+        'min_s': round(min(samples), 6),
+        'mean_s': round(statistics.mean(samples), 6),
+        'median_s': round(statistics.median(samples), 6),
+        'max_s': round(max(samples), 6)
+    }
+
+def emit(name: str, results: Dict[str, Any], output: Optional[str] = None) -> None:
+    """
+    Sonuçları JSON olarak yazdırır; output verilirse dosyaya da yazar.
+    """
+    payload = json.dumps({'benchmark': name, 'results': results}, indent=2, ensure_ascii=False)
+    print(payload)
+    if output:
+        with open(output, 'w', encoding='utf-8') as f:
+            f.write(payload + "\n")
@@ -0,0 +1,108 @@
+"""
+Flalingo API'si yerine kullanılan yerel HTTP sunucusu.
+
+Gecikme, hata oranı ve askıda kalma (hang) davranışları ayarlanabilir.
+"""
+import json
+import time
+import random
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, Optional
+
+SAMPLE_TRANSCRIPT = {
+    'success': True,
+    'data': {
+        'openai': {'topics': ['travel']},
+        'gladia_response': [
+            {'speaker': 'Teacher', 'text': 'Tell me about your travel plans.', 'duration': 2.5, 'topic': 'travel'},
+            {'speaker': 'Student', 'text': 'I will travel to Izmir next week with my sister.', 'duration': 3.1, 'topic': 'travel'}
+        ],
+        'calculations': {}
+    }
+}
+
+class StandInServer:
+    """
+    Arka planda çalışan yerel Flalingo sunucusu.
+
+    Kullanım:
+        with StandInServer(latency=0.01, error_rate=0.1) as server:
+            FlalingoService(base_url=server.base_url)
+    """
+
+    def __init__(self, latency: float = 0.0, error_rate: float = 0.0, hang: float = 0.0,
+                 payload: Optional[Dict[str, Any]] = None, seed: int = 0):
+        """
+        StandInServer sınıfını başlatır.
+
+        Args:
+            latency (float): Her yanıta eklenecek gecikme (saniye)
+            error_rate (float): 503 döndürülecek isteklerin oranı (0-1)
+            hang (float): Yanıt vermeden önce beklenecek süre (askıda kalan servis için)
+            payload (Dict[str, Any], optional): Döndürülecek JSON gövdesi
+            seed (int): Hata üretimi için rastgele sayı tohumu
+        """
+        self.latency = latency
+        self.error_rate = error_rate
+        self.hang = hang
+        self.body = json.dumps(payload or SAMPLE_TRANSCRIPT).encode('utf-8')
+        self.random = random.Random(seed)
+        self.requests = 0
+        self.connections = 0
+        self._lock = threading.Lock()
+        self._server = None
+
+    def _handler(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = 'HTTP/1.1'  # keep-alive için
+            disable_nagle_algorithm = True
+
+            def setup(self):
+                super().setup()
+                with server._lock:
+                    server.connections += 1
+
+            def do_GET(self):
+                with server._lock:
+                    server.requests += 1
+                    fail = server.random.random() < server.error_rate
+                if server.hang:
+                    time.sleep(server.hang)
+                if server.latency:
+                    time.sleep(server.latency)
+                status, body = (503, b'{"success": false}') if fail else (200, server.body)
+                self.send_response(status)
+                self.send_header('Content-Type', 'application/json')
+                self.send_header('Content-Length', str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args):
+                pass
+
+        return Handler
+
+    @property
+    def base_url(self) -> str:
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}/api"
+
+    def start(self) -> 'StandInServer':
+        self._server = ThreadingHTTPServer(('127.0.0.1', 0), self._handler())
+        self._server.daemon_threads = True
+        threading.Thread(target=self._server.serve_forever, daemon=True).start()
+        return self
+
+    def stop(self) -> None:
+        if self._server is not None:
+            self._server.shutdown()
+            self._server.server_close()
+
+    def __enter__(self) -> 'StandInServer':
+        return self.start()
+
+    def __exit__(self, *exc) -> None:
+        self.stop()
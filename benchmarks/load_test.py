@@ -0,0 +1,219 @@
+"""
+Sahte Gemini modeliyle (GEMINI_FAKE=1) gunicorn worker yapılandırmalarının çevrimdışı yük testi.
+
+Her yapılandırma için gunicorn ayrı bir süreçte başlatılır, eş zamanlı istekler gönderilir ve
+verim (istek/sn), gecikme yüzdelikleri, durum kodları, açılış süresi ve toplam bellek (PSS; ana süreç +
+worker'lar) raporlanır. --url verilirse gunicorn başlatılmaz, çalışan sunucuya istek gönderilir.
+
+Varsayılan olarak gunicorn yapılandırma dosyası olmadan başlatılır; --gunicorn-config gunicorn.conf.py
+verilirse depodaki üretim yapılandırması (preload, keepalive, ...) kullanılır. Komut satırındaki
+worker/thread/worker sınıfı değerleri dosyadakileri ezer.
+
+Uç noktalar:
+    upload: /api/upload'a sentetik Zoom .txt transkripti yükler (Flalingo gerekmez)
+    exercise: /api/flai-exercise; Flalingo yerine yerel StandInServer kullanılır
+
+Kullanım:
+    python -m benchmarks.load_test --configs 1x8 2x4 4x2 --requests 200 --concurrency 16 --profile realistic
+    python -m benchmarks.load_test --configs 2x16 --gunicorn-config gunicorn.conf.py
+"""
+import io
+import os
+import sys
+import time
+import socket
+import logging
+import argparse
+import tempfile
+import itertools
+import subprocess
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Optional
+
+import requests
+
+from benchmarks.common import emit
+from benchmarks.flalingo_standin import StandInServer
+from benchmarks.synthetic import generate_gladia_transcript
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        return sock.getsockname()[1]
+
+def wait_until_ready(url: str, timeout: float = 30.0) -> None:
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            requests.get(url, timeout=1)
+            return
+        except requests.exceptions.RequestException:
+            time.sleep(0.2)
+    raise RuntimeError(f"Sunucu {timeout} sn içinde hazır olmadı: {url}")
+
+def process_tree_pss_mb(pid: int) -> Optional[float]:
+    """
+    Sürecin ve alt süreçlerinin toplam PSS değerini döndürür (yalnızca Linux).
+
+    RSS'ten farklı olarak copy-on-write paylaşılan sayfalar süreçler arasında bölünür;
+    böylece preload_app'in bellek etkisi doğru görünür.
+    """
+    total_kb = 0
+    pending = [pid]
+    try:
+        while pending:
+            current = pending.pop()
+            with open(f"/proc/{current}/smaps_rollup") as rollup:
+                for line in rollup:
+                    if line.startswith('Pss:'):
+                        total_kb += int(line.split()[1])
+            with open(f"/proc/{current}/task/{current}/children") as children:
+                pending.extend(int(child) for child in children.read().split())
+    except OSError:
+        return None
+    return round(total_kb / 1024, 1)
+
+def build_upload(utterances: int) -> bytes:
+    lines = [f"{entry['speaker']}: {entry['text']}" for entry in generate_gladia_transcript(utterances)]
+    return "\n".join(lines).encode('utf-8')
+
+def percentile(samples: List[float], fraction: float) -> float:
+    if not samples:
+        return 0.0
+    return round(samples[min(len(samples) - 1, int(len(samples) * fraction))], 4)
+
+def run_load(base_url: str, endpoint: str, total: int, concurrency: int, upload: bytes,
+             timeout: float) -> Dict[str, object]:
+    """
+    Sunucuya total istek gönderir ve sonuçları özetler.
+    """
+    local = threading.local()
+    report_ids = itertools.count()
+    latencies = []
+    statuses: Dict[str, int] = {}
+    lock = threading.Lock()
+
+    def one(_):
+        session = getattr(local, 'session', None)
+        if session is None:
+            session = local.session = requests.Session()
+        start = time.perf_counter()
+        try:
+            if endpoint == 'upload':
+                response = session.post(f"{base_url}/api/upload", timeout=timeout,
+                                        files={'transcript_file': ('lesson.txt', io.BytesIO(upload), 'text/plain')})
+            else:
+                # Her istekte farklı rapor: egzersiz önbelleği ölçümü bozmasın
+                response = session.get(f"{base_url}/api/flai-exercise", timeout=timeout,
+                                       params={'auth_token': 'load-test', 'flai_report': f"r{next(report_ids)}"})
+            status = str(response.status_code)
+        except requests.exceptions.Timeout:
+            status = 'timeout'
+        except requests.exceptions.RequestException:
+            status = 'connection_error'
+        elapsed = time.perf_counter() - start
+        with lock:
+            latencies.append(elapsed)
+            statuses[status] = statuses.get(status, 0) + 1
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        list(executor.map(one, range(total)))
+    wall = time.perf_counter() - start
+    latencies.sort()
+    return {
+        'requests': total,
+        'concurrency': concurrency,
+        'wall_s': round(wall, 3),
+        'throughput_rps': round(total / wall, 2),
+        'p50_s': percentile(latencies, 0.50),
+        'p95_s': percentile(latencies, 0.95),
+        'p99_s': percentile(latencies, 0.99),
+        'max_s': round(latencies[-1], 4) if latencies else 0.0,
+        'statuses': statuses
+    }
+
+def spawn_gunicorn(port: int, workers: int, threads: int, worker_class: str, env: Dict[str, str],
+                   timeout: int, config_file: str) -> subprocess.Popen:
+    command = [sys.executable, '-m', 'gunicorn', '-c', config_file, '-w', str(workers), '-k', worker_class,
+               '--threads', str(threads), '-b', f"127.0.0.1:{port}", '--timeout', str(timeout),
+               '--log-level', 'warning', 'app:app']
+    return subprocess.Popen(command, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--configs', nargs='+', default=['1x8', '2x4', '4x2'],
+                        help="WORKERxTHREAD biçiminde gunicorn yapılandırmaları")
+    parser.add_argument('--worker-class', default='gthread')
+    parser.add_argument('--gunicorn-config', help="Kullanılacak gunicorn yapılandırma dosyası (varsayılan: yok)")
+    parser.add_argument('--url', help="Gunicorn başlatmak yerine kullanılacak çalışan sunucu")
+    parser.add_argument('--endpoint', choices=['upload', 'exercise'], default='upload')
+    parser.add_argument('--requests', type=int, default=200)
+    parser.add_argument('--concurrency', type=int, default=16)
+    parser.add_argument('--utterances', type=int, default=300, help="Yüklenen transkriptteki konuşma sayısı")
+    parser.add_argument('--profile', default='realistic', help="Sahte Gemini profili (GEMINI_FAKE_PROFILE)")
+    parser.add_argument('--time-scale', type=float, default=0.2,
+                        help="Profil gecikmelerinin çarpanı (hızlı çalıştırma için < 1)")
+    parser.add_argument('--request-timeout', type=float, default=60.0)
+    parser.add_argument('--output', help="Sonuçların yazılacağı JSON dosyası")
+    args = parser.parse_args()
+
+    from app.utils.fake_gemini import PROFILES
+    # app paketi kök logger'ı LOG_LEVEL'e göre yapılandırır; istemci tarafında gereksiz
+    logging.getLogger().setLevel(logging.WARNING)
+    profile = PROFILES[args.profile]
+    upload = build_upload(args.utterances)
+    results = {}
+    # Yapılandırma verilmezse gunicorn'un çalışma dizinindeki gunicorn.conf.py'yi okumaması için boş dosya
+    empty_config = tempfile.NamedTemporaryFile('w', suffix='.py', delete=False)
+    empty_config.close()
+    config_file = args.gunicorn_config or empty_config.name
+
+    with StandInServer(latency=0.02) as flalingo:
+        env = dict(os.environ)
+        env.update({
+            'GEMINI_FAKE': '1',
+            'GEMINI_FAKE_PROFILE': args.profile,
+            'GEMINI_FAKE_LATENCY': str(profile['latency'] * args.time_scale),
+            'GEMINI_FAKE_CHUNK_DELAY': str(profile['chunk_delay'] * args.time_scale),
+            'LLM_CACHE_ENABLED': '0',
+            'LOG_LEVEL': os.getenv('LOG_LEVEL', 'WARNING'),
+            'FLALINGO_BASE_URL': flalingo.base_url
+        })
+
+        if args.url:
+            wait_until_ready(args.url)
+            results['external'] = run_load(args.url.rstrip('/'), args.endpoint, args.requests,
+                                           args.concurrency, upload, args.request_timeout)
+        else:
+            for config in args.configs:
+                workers, threads = (int(part) for part in config.lower().split('x'))
+                port = free_port()
+                started = time.perf_counter()
+                process = spawn_gunicorn(port, workers, threads, args.worker_class, env,
+                                         timeout=int(args.request_timeout) + 30, config_file=config_file)
+                base_url = f"http://127.0.0.1:{port}"
+                try:
+                    wait_until_ready(base_url + '/')
+                    boot = time.perf_counter() - started
+                    results[config] = run_load(base_url, args.endpoint, args.requests,
+                                               args.concurrency, upload, args.request_timeout)
+                    results[config]['boot_s'] = round(boot, 2)
+                    results[config]['pss_mb'] = process_tree_pss_mb(process.pid)
+                finally:
+                    process.terminate()
+                    process.wait(timeout=30)
+    os.unlink(empty_config.name)
+
+    emit('load_test', {
+        'endpoint': args.endpoint,
+        'profile': args.profile,
+        'time_scale': args.time_scale,
+        'worker_class': args.worker_class,
+        'gunicorn_config': args.gunicorn_config,
+        'results': results
+    }, args.output)
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,210 @@
+"""
+Transkript işleme, test ayrıştırma ve uçtan uca /api/flai-exercise yolunu ölçen benchmark takımı.
+
+Sonuçlar commit, Python sürümü ve zaman bilgisiyle birlikte JSON olarak yazılır. --compare ile
+önceki bir sonuç dosyasıyla karşılaştırılır; eşikten fazla yavaşlayan ölçümler listelenir ve
+betik 1 çıkış koduyla biter (CI'da gerilemeleri yakalamak için).
+
+Kullanım:
+    python -m benchmarks.run_suite [--sizes 10 100 1000 10000 100000] [--speakers 2] [--prompt-budget 1500]
+                                   [--output results.json] [--compare baseline.json] [--threshold 0.2]
+"""
+import os
+import sys
+import json
+import time
+import logging
+import argparse
+import platform
+import subprocess
+from itertools import count
+from unittest import mock
+
+# Önbellekler ölçümü bozmasın
+os.environ["LLM_CACHE_ENABLED"] = "0"
+
+from app.utils import exercise_pipeline
+from app.utils.ai_analyzer import AIAnalyzer, set_analyzer
+from app.utils.prompt_budget import compress_transcript
+from app.utils.test_generator import TestGenerator
+from app.utils.transcript_processor import TranscriptProcessor
+from benchmarks.bench_combined_mode import ANALYSIS
+from benchmarks.common import LatencyStubModel, estimate_tokens, measure, emit
+from benchmarks.synthetic import generate_gladia_transcript, generate_lesson_transcript, generate_raw_tests
+
+def _repeat_for(size: int) -> int:
+    # Büyük girdilerde toplam süreyi makul tut
+    if size >= 100000:
+        return 3
+    if size >= 10000:
+        return 5
+    return 20
+
+def bench_process_transcript(sizes, speakers: int) -> dict:
+    results = {}
+    for size in sizes:
+        utterances = generate_gladia_transcript(size, speakers)
+
+        def run():
+            TranscriptProcessor({'gladia_response': utterances}).process_transcript()
+
+        timing = measure(run, repeat=_repeat_for(size))
+        timing['us_per_utterance'] = round(timing['median_s'] / size * 1e6, 3)
+        results[str(size)] = timing
+    return results
+
+def bench_process_tests(repeat: int) -> dict:
+    results = {}
+    for style in ('fenced', 'truncated', 'prose'):
+        raw = generate_raw_tests(10, style)
+
+        def run():
+            TestGenerator(raw).process_tests()
+
+        timing = measure(run, repeat=repeat)
+        timing['questions'] = len(TestGenerator(raw).process_tests())
+        results[style] = timing
+    return results
+
+def respond(prompt: str) -> str:
+    if "Analiz Sonuçları" in prompt:
+        return generate_raw_tests(5)
+    return "```json\n" + json.dumps(ANALYSIS, ensure_ascii=False) + "\n```"
+
+def bench_get_exercise(sizes, speakers: int, llm_time_scale: float) -> dict:
+    from app import app
+
+    client = app.test_client()
+    report_ids = count()
+    results = {}
+    for size in sizes:
+        transcript = {'gladia_response': generate_gladia_transcript(size, speakers)}
+        model = LatencyStubModel(respond, time_scale=llm_time_scale)
+        set_analyzer(AIAnalyzer(model=model))
+
+        def run():
+            # Her çağrıda farklı rapor: egzersiz önbelleği ölçümü bozmasın
+            response = client.get(f"/api/flai-exercise?auth_token=bench&flai_report=r{next(report_ids)}")
+            assert response.status_code == 200, response.get_data(as_text=True)
+
+        try:
+            with mock.patch.object(exercise_pipeline, '_fetch_transcript', return_value=transcript):
+                results[str(size)] = measure(run, repeat=min(_repeat_for(size), 10))
+        finally:
+            set_analyzer(None)
+    return results
+
+def bench_prompt_budget(sizes, budget: int) -> dict:
+    """
+    Ders benzeri transkriptlerde istem sıkıştırmanın token ve (sahte modelle tahmin edilen)
+    Gemini gecikmesi etkisini ölçer. Sıkıştırmasız yol metnin ilk 8000 karakterini kullanır.
+    """
+    results = {}
+    for size in sizes:
+        processed = TranscriptProcessor({'gladia_response': generate_lesson_transcript(size)}).process_transcript()
+        row = {}
+        for label, value in (('truncate_8000', '0'), ('budget', str(budget))):
+            model = LatencyStubModel(respond, time_scale=0)
+            analyzer = AIAnalyzer(model=model)
+
+            def run():
+                analysis = analyzer.analyze_zoom_transcript(processed)
+                analyzer.generate_zoom_tests(analysis, processed)
+
+            with mock.patch.dict(os.environ, {'GEMINI_PROMPT_BUDGET_TOKENS': value}):
+                timing = measure(run, repeat=10)
+            calls = model.calls[-2:]
+            timing['input_tokens'] = sum(call['input_tokens'] for call in calls)
+            timing['simulated_llm_s'] = round(sum(
+                model.base_latency + call['input_tokens'] * model.input_cost + call['output_tokens'] * model.output_cost
+                for call in calls), 3)
+            row[label] = timing
+        all_text = processed['all_text']
+        row['transcript_tokens'] = estimate_tokens(all_text)
+        # Dersin ne kadarının isteme girdiği (konuşma oranı)
+        _, stats = compress_transcript(all_text, budget)
+        row['utterance_coverage'] = {
+            'truncate_8000': round(all_text[:8000].count("\n") / max(1, stats['total']), 3),
+            'budget': round(stats['kept'] / max(1, stats['total']), 3)
+        }
+        row['compression_ratio'] = round(row['budget']['input_tokens'] / row['truncate_8000']['input_tokens'], 3)
+        row['simulated_latency_change'] = round(
+            row['budget']['simulated_llm_s'] / row['truncate_8000']['simulated_llm_s'] - 1, 3)
+        # --compare için bu yolun ortanca süresi (sıkıştırma maliyeti dahil)
+        row['median_s'] = row['budget']['median_s']
+        results[str(size)] = row
+    return results
+
+def git_commit() -> str:
+    try:
+        return subprocess.check_output(['git', 'rev-parse', '--short', 'HEAD'],
+                                       stderr=subprocess.DEVNULL, text=True).strip()
+    except (OSError, subprocess.CalledProcessError):
+        return 'unknown'
+
+def compare(results: dict, baseline: dict, threshold: float) -> list:
+    """
+    Ortanca süresi baseline'a göre threshold oranından fazla artan ölçümleri döndürür.
+    """
+    regressions = []
+    for suite, cases in results.items():
+        for case, timing in cases.items():
+            previous = baseline.get(suite, {}).get(case)
+            if not previous or not previous.get('median_s'):
+                continue
+            ratio = timing['median_s'] / previous['median_s']
+            if ratio > 1 + threshold:
+                regressions.append({'suite': suite, 'case': case, 'ratio': round(ratio, 3),
+                                    'median_s': timing['median_s'], 'baseline_median_s': previous['median_s']})
+    return regressions
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--sizes', type=int, nargs='+', default=[10, 100, 1000, 10000, 100000])
+    parser.add_argument('--speakers', type=int, default=2)
+    parser.add_argument('--exercise-sizes', type=int, nargs='+', default=[100, 1000, 10000],
+                        help="Uçtan uca ölçümde kullanılacak konuşma sayıları")
+    parser.add_argument('--lesson-sizes', type=int, nargs='+', default=[200, 600, 1200],
+                        help="İstem sıkıştırma ölçümünde kullanılacak ders transkripti konuşma sayıları")
+    parser.add_argument('--prompt-budget', type=int, default=1500,
+                        help="İstem sıkıştırma ölçümündeki token bütçesi")
+    parser.add_argument('--llm-time-scale', type=float, default=0.0,
+                        help="Sahte Gemini gecikmelerinin çarpanı (0: yalnızca uygulama yükü)")
+    parser.add_argument('--output', help="Sonuçların yazılacağı JSON dosyası")
+    parser.add_argument('--compare', help="Karşılaştırılacak önceki sonuç dosyası")
+    parser.add_argument('--threshold', type=float, default=0.2,
+                        help="Gerileme sayılacak yavaşlama oranı (0.2 = %%20)")
+    args = parser.parse_args()
+
+    # Uygulama DEBUG loglaması ölçümü bozmasın
+    logging.disable(logging.INFO)
+
+    results = {
+        'process_transcript': bench_process_transcript(args.sizes, args.speakers),
+        'process_tests': bench_process_tests(repeat=50),
+        'get_exercise': bench_get_exercise(args.exercise_sizes, args.speakers, args.llm_time_scale),
+        'prompt_budget': bench_prompt_budget(args.lesson_sizes, args.prompt_budget)
+    }
+    report = {
+        'commit': git_commit(),
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S%z'),
+        'speakers': args.speakers,
+        'suites': results
+    }
+
+    regressions = []
+    if args.compare:
+        with open(args.compare, encoding='utf-8') as f:
+            baseline = json.load(f)
+        regressions = compare(results, baseline['results']['suites'], args.threshold)
+        report['compared_to'] = baseline['results'].get('commit')
+        report['regressions'] = regressions
+
+    emit('suite', report, args.output)
+    if regressions:
+        sys.exit(1)
+
+if __name__ == '__main__':
+    main()
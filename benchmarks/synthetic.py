@@ -0,0 +1,140 @@
+"""
+Benchmark'lar için sentetik Gladia transkriptleri ve Gemini ham çıktıları üreten yardımcılar.
+"""
+import json
+import random
+from typing import Any, Dict, List
+
+WORDS = ["I", "went", "to", "the", "beach", "yesterday", "and", "bought", "a", "souvenir",
+         "could", "you", "repeat", "that", "please", "what", "does", "itinerary", "mean",
+         "we", "stayed", "in", "hotel", "near", "city", "centre", "my", "sister", "visited"]
+
+PUNCTUATION = ["", "", "", ".", ",", "?", "!"]
+
+def generate_gladia_transcript(utterances: int, speakers: int = 2, seed: int = 42,
+                               unique_words: bool = True) -> List[Dict[str, Any]]:
+    """
+    Gladia biçiminde (speaker, text, duration, time_begin, time_end, confidence) konuşmalar üretir.
+
+    Konuşmacılar çoğunlukla sırayla konuşur; %20 olasılıkla rastgele bir konuşmacı araya girer.
+
+    Args:
+        utterances (int): Konuşma sayısı
+        speakers (int): Konuşmacı sayısı ("Speaker 0", "Speaker 1", ...)
+        seed (int): Rastgele sayı tohumu (aynı tohum aynı transkripti üretir)
+        unique_words (bool): True ise her konuşmaya özgün bir kelime eklenir (büyük kelime dağarcığı)
+
+    Returns:
+        List[Dict[str, Any]]: Konuşmalar
+    """
+    rng = random.Random(seed)
+    names = [f"Speaker {i}" for i in range(speakers)]
+    entries = []
+    clock = 0.0
+    for i in range(utterances):
+        words = [rng.choice(WORDS) for _ in range(rng.randint(1, 25))]
+        if unique_words:
+            words.append(f"word{i}")
+        duration = round(len(words) * rng.uniform(0.25, 0.5), 3)
+        entries.append({
+            'speaker': names[i % speakers] if rng.random() < 0.8 else rng.choice(names),
+            'text': " ".join(words) + rng.choice(PUNCTUATION),
+            'duration': duration,
+            'time_begin': round(clock, 3),
+            'time_end': round(clock + duration, 3),
+            'confidence': round(rng.uniform(0.8, 1.0), 2)
+        })
+        clock += duration + rng.uniform(0.1, 1.5)
+    return entries
+
+TEACHER_PHRASES = ["so", "um", "let's", "talk", "about", "your", "holiday", "and", "remember", "that", "we",
+                   "use", "the", "past", "simple", "when", "the", "action", "is", "finished", "for", "example",
+                   "yesterday", "I", "visited", "my", "grandmother", "okay", "now", "try", "another", "sentence"]
+STUDENT_ERRORS = ["he go to school every day", "yesterday I go to the market", "it is more better",
+                  "I am agree with you", "she have two brothers", "I buyed a souvenir"]
+BACKCHANNELS = ["okay", "yeah", "mm-hmm", "uh, yes", "right"]
+
+def generate_lesson_transcript(utterances: int, seed: int = 42) -> List[Dict[str, Any]]:
+    """
+    Öğretmen anlatımı, kısa öğrenci yanıtları, hatalar ve dolgu konuşmaları içeren
+    ders benzeri bir Gladia transkripti üretir (istem sıkıştırma ölçümleri için).
+
+    Args:
+        utterances (int): Konuşma sayısı
+        seed (int): Rastgele sayı tohumu
+
+    Returns:
+        List[Dict[str, Any]]: "Teacher" ve "Student" konuşmaları
+    """
+    rng = random.Random(seed)
+    entries = []
+    clock = 0.0
+    for i in range(utterances):
+        if i % 2 == 0:
+            speaker = 'Teacher'
+            text = " ".join(rng.choice(TEACHER_PHRASES) for _ in range(rng.randint(20, 70))) + rng.choice([".", "?"])
+        else:
+            speaker = 'Student'
+            roll = rng.random()
+            if roll < 0.35:
+                text = rng.choice(BACKCHANNELS)
+            elif roll < 0.55:
+                text = rng.choice(STUDENT_ERRORS) + "."
+            else:
+                text = " ".join(rng.choice(WORDS) for _ in range(rng.randint(3, 15))) + f" word{i}" + rng.choice(PUNCTUATION)
+        duration = round(len(text.split()) * rng.uniform(0.25, 0.5), 3)
+        entries.append({
+            'speaker': speaker,
+            'text': text,
+            'duration': duration,
+            'time_begin': round(clock, 3),
+            'time_end': round(clock + duration, 3),
+            'confidence': round(rng.uniform(0.8, 1.0), 2)
+        })
+        clock += duration + rng.uniform(0.1, 1.5)
+    return entries
+
+def generate_questions(count: int = 10, seed: int = 42) -> List[Dict[str, Any]]:
+    """
+    Çoktan seçmeli test soruları üretir.
+    """
+    rng = random.Random(seed)
+    return [
+        {
+            'question': f"Question {i + 1}: which word best completes '{' '.join(rng.sample(WORDS, 6))} ___'?",
+            'options': [{'letter': letter, 'text': rng.choice(WORDS)} for letter in "ABCD"],
+            'correct_answer': rng.choice("ABCD"),
+            'explanation': "The correct option matches the tense used in the lesson."
+        }
+        for i in range(count)
+    ]
+
+def generate_raw_tests(count: int = 10, style: str = 'fenced', seed: int = 42) -> str:
+    """
+    Gemini'nin test üretimi yanıtına benzeyen ham metin üretir.
+
+    Args:
+        count (int): Soru sayısı
+        style (str): 'fenced' (```json bloğu), 'truncated' (yarıda kesilmiş JSON dizisi)
+            veya 'prose' (JSON olmayan düz metin)
+        seed (int): Rastgele sayı tohumu
+
+    Returns:
+        str: Ham yanıt metni
+    """
+    questions = generate_questions(count, seed)
+    if style == 'fenced':
+        return "```json\n" + json.dumps(questions, ensure_ascii=False, indent=2) + "\n```"
+    if style == 'truncated':
+        text = json.dumps(questions, ensure_ascii=False, indent=2)
+        return text[:int(len(text) * 0.9)]
+    if style == 'prose':
+        lines = []
+        for question in questions:
+            lines.append(question['question'])
+            lines.extend(f"{option['letter']}) {option['text']}" for option in question['options'])
+            lines.append(f"Correct answer: {question['correct_answer']}")
+            lines.append(f"Explanation: {question['explanation']}")
+            lines.append("")
+        return "\n".join(lines)
+    raise ValueError(f"Bilinmeyen stil: {style}")
@@ -0,0 +1,70 @@
+"""
+Üretim için gunicorn yapılandırması.
+
+İstek süresinin büyük kısmı Gemini ve Flalingo yanıtlarını beklemekle geçer; bu yüzden
+çok sayıda thread çalıştıran tek bir gthread worker'ı kullanılır. Thread sayısı aynı anda
+beklenen istek sayısına göre ayarlanır.
+
+Kullanım (depo kök dizininde gunicorn bu dosyayı kendiliğinden okur):
+    gunicorn app:app
+    GUNICORN_THREADS=64 gunicorn app:app
+    EXERCISE_STORE_PATH=/var/lib/flai/exercises.db GUNICORN_WORKERS=2 gunicorn app:app
+"""
+import os
+import threading
+
+# GEMINI_WARMUP=1 ise Gemini istemcisi fork'tan sonra her worker'da ısıtılır (post_fork).
+# Isınma gerçek bir count_tokens çağrısı yaptığından varsayılan kapalıdır; sahte modelle atlanır.
+_warm_up = os.getenv("GEMINI_WARMUP", "0") == "1" and os.getenv("GEMINI_FAKE", "0") != "1"
+
+bind = os.getenv("GUNICORN_BIND", f"0.0.0.0:{os.getenv('PORT', '8000')}")
+
+# Egzersiz önbelleği, aynı rapor isteklerinin birleştirilmesi (SingleFlight), Gemini
+# öncelik kuyruğu ve (depo yoksa) arka plan iş durumları süreç içinde tutulur; birden
+# fazla worker bunları böler. Bu yüzden varsayılan tek worker'dır ve eş zamanlılık thread
+# sayısıyla artırılır. Birden fazla worker yalnızca GUNICORN_WORKERS ile açıkça seçilir.
+workers = int(os.getenv("GUNICORN_WORKERS", "1"))
+worker_class = os.getenv("GUNICORN_WORKER_CLASS", "gthread")
+threads = int(os.getenv("GUNICORN_THREADS", "32"))
+
+# Uygulama ana süreçte bir kez yüklenir; modüller ve sabit veriler worker'lar arasında
+# copy-on-write paylaşılır. Gemini istemcisi, HTTP oturumları, thread havuzları ve
+# olay döngüsü fork'tan sonra ilk kullanımda worker içinde oluşturulur.
+preload_app = os.getenv("GUNICORN_PRELOAD", "1") == "1"
+
+# Bir egzersiz isteği iki Gemini çağrısı (her biri 30 sn'ye kadar kuyrukta bekleyebilir)
+# ve Flalingo okuması (20 sn) içerebilir. gthread'de timeout yalnızca worker'ın yanıt
+# vermemesini ölçer; uzun süren istekler worker'ı öldürmez.
+timeout = int(os.getenv("GUNICORN_TIMEOUT", "120"))
+
+# Yeniden başlatmada devam eden Gemini çağrılarının bitmesi beklenir
+graceful_timeout = int(os.getenv("GUNICORN_GRACEFUL_TIMEOUT", "90"))
+
+# Yük dengeleyicinin boşta bağlantı süresinden (genellikle 60 sn) uzun tutulur; aksi halde
+# dengeleyicinin yeniden kullandığı bağlantı gunicorn tarafından kapatılıp 502 üretir.
+# gthread'de boşta bekleyen bağlantılar thread tutmaz.
+keepalive = int(os.getenv("GUNICORN_KEEPALIVE", "75"))
+
+# Bellek büyümesini sınırlamak için worker'lar bu kadar istekten sonra yenilenir (0: kapalı)
+max_requests = int(os.getenv("GUNICORN_MAX_REQUESTS", "0"))
+max_requests_jitter = max(1, max_requests // 10) if max_requests else 0
+
+# Heartbeat dosyası bellekte tutulur; konteyner diskindeki gecikmeler worker'ı öldürmesin
+if os.path.isdir("/dev/shm"):
+    worker_tmp_dir = "/dev/shm"
+
+loglevel = os.getenv("GUNICORN_LOG_LEVEL", "info")
+accesslog = os.getenv("GUNICORN_ACCESS_LOG") or None
+
+def when_ready(server):
+    if workers > 1 and not os.getenv("EXERCISE_STORE_PATH"):
+        server.log.warning(
+            "%s worker EXERCISE_STORE_PATH olmadan çalışıyor: arka plan iş durumu sorguları "
+            "işi oluşturmayan worker'da 404 döner, egzersiz önbelleği ve istek birleştirme "
+            "worker başına ayrıdır.", workers)
+
+def post_fork(server, worker):
+    # Isınma worker'ın açılışını geciktirmesin (Gemini erişilemezse timeout'a takılmasın)
+    if _warm_up:
+        from app.utils.ai_analyzer import warm_up_analyzer
+        threading.Thread(target=warm_up_analyzer, name='gemini-warmup', daemon=True).start()
@@ -1,4 +1,12 @@
+import os
+
 from app import app
 
 if __name__ == '__main__':
-    app.run(debug=True) 
\ No newline at end of file
+    # Yalnızca geliştirme sunucusu; üretimde gunicorn kullanılır (gunicorn.conf.py)
+    app.run(
+        host=os.getenv("HOST", "127.0.0.1"),
+        port=int(os.getenv("PORT", "5000")),
+        debug=os.getenv("FLASK_DEBUG", "0").lower() in ("1", "true", "yes"),
+        threaded=True
+    )
@@ -1,7 +1,19 @@
 import unittest
 import os
+import json
+import time
+import threading
+from unittest import mock
 from app.utils.transcript_processor import TranscriptProcessor
-from app.utils.test_generator import TestGenerator
+from app.utils.test_generator import TestGenerator, StreamingQuestionParser, iter_streamed_questions
+from app.utils.job_queue import JobManager, JobQueueFull
+from app.utils.llm_cache import LLMCache
+from app.utils.ai_analyzer import AIAnalyzer
+from app.utils import ai_analyzer
+from app.utils.single_flight import SingleFlight
+from app.utils import exercise_pipeline
+from app.utils.circuit_breaker import CircuitBreaker
+from app.utils.flalingo_service import FlalingoService, FlalingoError
 
 class TestTranscriptProcessor(unittest.TestCase):
     """
@@ -35,6 +47,141 @@ class TestTranscriptProcessor(unittest.TestCase):
         self.assertIn('speakers', processed_data, "Konuşmacılar bulunamadı.")
         self.assertIn('all_text', processed_data, "Tüm metin bulunamadı.")
 
+class TestTranscriptLoading(unittest.TestCase):
+    """
+    Yüklenen transkriptlerin akıştan okunmasını test eden birim testleri.
+    """
+    
+    def test_load_csv_and_txt_from_stream(self):
+        """
+        Gladia dışa aktarımlı CSV'nin ve Zoom metin dosyasının akıştan okunduğunu test eder.
+        """
+        import io
+        gladia = json.dumps([
+            {"transcription": "Hello,", "time_begin": 1.0, "time_end": 1.5, "speaker": 1},
+            {"transcription": "how are you?", "time_begin": 1.6, "time_end": 2.6, "speaker": 2}
+        ])
+        csv_bytes = ('openai,gladia_response\n"{}",' + '"' + gladia.replace('"', '""') + '"\n').encode('utf-8')
+        processor = TranscriptProcessor.from_stream(io.BytesIO(csv_bytes), 'report.csv')
+        
+        self.assertTrue(processor.load_transcript(), "CSV yüklenemedi.")
+        utterances = processor.transcript_data['gladia_response']
+        self.assertEqual([u['text'] for u in utterances], ['Hello,', 'how are you?'])
+        self.assertEqual(utterances[1]['duration'], 1.0)
+        
+        txt_bytes = "\ufeffTeacher: Good morning!\nStudent: Morning,\nI am ready.\n".encode('utf-8')
+        processor = TranscriptProcessor.from_stream(io.BytesIO(txt_bytes), 'lesson.TXT')
+        self.assertTrue(processor.load_transcript(), "Metin dosyası yüklenemedi.")
+        self.assertEqual(processor.transcript_data['gladia_response'][1],
+                         {'speaker': 'Student', 'text': 'Morning, I am ready.'})
+        
+        self.assertIsNone(TranscriptProcessor.from_stream(io.BytesIO(b''), 'notes.pdf').file_type)
+    
+    def test_colon_in_text_and_chat_timestamps(self):
+        """
+        Saat içeren cümlenin konuşmacı satırı sayılmadığını ve sohbet satırı başındaki
+        zaman damgasının konuşmacı adından ayrıldığını test eder.
+        """
+        import io
+        txt_bytes = ("Öğretmen: Let's plan the trip.\n"
+                     "The train leaves at 10:30 tomorrow.\n"
+                     "00:01:23 Alice: hello\n").encode('utf-8')
+        processor = TranscriptProcessor.from_stream(io.BytesIO(txt_bytes), 'chat.txt')
+        self.assertTrue(processor.load_transcript(), "Metin dosyası yüklenemedi.")
+        
+        self.assertEqual(processor.transcript_data['gladia_response'], [
+            {'speaker': 'Öğretmen', 'text': "Let's plan the trip. The train leaves at 10:30 tomorrow."},
+            {'speaker': 'Alice', 'text': 'hello'}
+        ])
+    
+    def test_vtt_builds_conversation(self):
+        """
+        Zoom VTT dosyasından speakers, speaker_counts, all_text ve timings alanlarının oluştuğunu test eder.
+        """
+        import io
+        vtt = (
+            "WEBVTT\n\n"
+            "1\n00:00:01.000 --> 00:00:04.500\nTeacher: Hello, how are you?\n\n"
+            "2\n00:00:05.000 --> 00:00:07.000\nStudent: I am fine,\nthank you.\n\n"
+            "3\n00:00:07.500 --> 00:00:09.000\nand you?\n\n"
+        ).encode('utf-8')
+        processor = TranscriptProcessor.from_stream(io.BytesIO(vtt), 'zoom.vtt')
+        self.assertTrue(processor.load_transcript(), "VTT yüklenemedi.")
+        processed = processor.process_transcript()
+        
+        self.assertEqual(processed['speakers'], {
+            'Teacher': ['Hello, how are you?'],
+            'Student': ['I am fine, thank you.', 'and you?']
+        })
+        self.assertEqual(processed['speaker_counts'], {'Teacher': 1, 'Student': 2})
+        self.assertEqual(processed['all_text'].splitlines()[1], 'Student: I am fine, thank you.')
+        self.assertEqual(processed['timings'], {'start': 1.0, 'end': 9.0, 'duration': 8.0})
+        self.assertEqual(processed['calculations']['statistics']['speaker_stats']['Teacher']['total_time'], 3.5)
+    
+    def test_columnar_statistics_match_python(self):
+        """
+        Sütunsal istatistik yolunun Python yoluyla aynı sonucu verdiğini test eder.
+        """
+        utterances = [
+            {'speaker': 1, 'text': 'Hello there, how are you?', 'duration': 2.25},
+            {'speaker': 'Teacher', 'text': 'Fine', 'duration': '1.5'},
+            {'text': 'no speaker here'},
+            {'speaker': 1, 'text': '  ', 'duration': 0.333}
+        ] * 50
+        processor = TranscriptProcessor({'gladia_response': utterances})
+        
+        with mock.patch.dict(os.environ, {'TRANSCRIPT_STATS_ENGINE': 'python'}):
+            expected = processor._calculate_statistics(utterances)
+        with mock.patch.dict(os.environ, {'TRANSCRIPT_STATS_ENGINE': 'pandas'}):
+            actual = processor._calculate_statistics(utterances)
+        
+        self.assertEqual(actual, expected)
+        self.assertEqual(list(actual['speaker_stats']), [1, 'Teacher', 'Unknown'], "Konuşmacı sırası değişti.")
+        self.assertIs(type(actual['speaker_stats'][1]['total_words']), int, "NumPy türü döndürüldü.")
+    
+    def test_vocabulary_top_k_and_optional_frequency(self):
+        """
+        En sık kelimelerin eşitlikte ilk görülme sırasını koruduğunu ve tam frekansın isteğe bağlı olduğunu test eder.
+        """
+        utterances = [
+            {'speaker': 'A', 'text': "Don't stop, the THE end!"},
+            {'speaker': 'B', 'text': 'stop the end'}
+        ]
+        processor = TranscriptProcessor({'gladia_response': utterances})
+        
+        vocabulary = processor.process_transcript()['calculations']['vocabulary']
+        self.assertNotIn('word_frequency', vocabulary, "Tam frekans varsayılan olarak döndürüldü.")
+        self.assertEqual(vocabulary['most_common_words'][:3], [
+            {'word': 'the', 'count': 3}, {'word': 'stop', 'count': 2}, {'word': 'end', 'count': 2}
+        ])
+        self.assertEqual((vocabulary['vocabulary_size'], vocabulary['total_words']), (4, 8))
+        
+        vocabulary = processor.process_transcript(include_word_frequency=True)['calculations']['vocabulary']
+        self.assertEqual(vocabulary['word_frequency'], {'dont': 1, 'stop': 2, 'the': 3, 'end': 2})
+    
+    def test_upload_does_not_touch_disk(self):
+        """
+        Yükleme endpoint'inin geçici dosya yazmadan çalıştığını test eder.
+        """
+        import io
+        import app as app_module
+        analyzer = mock.MagicMock()
+        analyzer.analyze_transcript.return_value = {'success': True, 'raw_analysis': 'analiz'}
+        analyzer.generate_tests.return_value = {'success': True, 'raw_tests': '[{"question": "Q?"}]'}
+        csv_bytes = b"speaker,text,duration\nTeacher,Hello there,1.5\nStudent,Hi teacher,1.0\n"
+        
+        with mock.patch.object(app_module, 'get_analyzer', return_value=analyzer), \
+                mock.patch('werkzeug.datastructures.FileStorage.save') as save:
+            response = app_module.app.test_client().post('/api/upload', data={
+                'transcript_file': (io.BytesIO(csv_bytes), 'lesson.csv')
+            }, content_type='multipart/form-data')
+        
+        self.assertEqual(response.status_code, 200, response.get_data(as_text=True))
+        self.assertEqual(response.get_json()['data']['file_type'], 'csv')
+        save.assert_not_called()
+        processed = analyzer.analyze_transcript.call_args.args[0]
+        self.assertEqual(processed['calculations']['statistics']['total_words'], 4)
+
 class TestTestGenerator(unittest.TestCase):
     """
     TestGenerator sınıfını test eden birim testleri.
@@ -85,5 +232,1506 @@ class TestTestGenerator(unittest.TestCase):
         self.assertIn("What is the meaning of 'nettle' in Greek?", html, "Soru metni HTML'de bulunamadı.")
         self.assertIn("Water", html, "Seçenek metni HTML'de bulunamadı.")
 
+class TestStreamingQuestionParser(unittest.TestCase):
+    """
+    StreamingQuestionParser sınıfını test eden birim testleri.
+    """
+    
+    raw = ('Here are your questions:\n```json\n{"questions": [\n'
+           '{"question": "Pick \\"}\\" [x]", "options": [{"letter": "A", "text": "a}"}], "correct_answer": "A"},\n'
+           '{"question": "Second", "answer": "B"},\n'
+           '{"question": "Trunc')
+    
+    def test_emits_each_question_when_closed(self):
+        """
+        Parça boyutundan bağımsız olarak soruların kapanışta üretildiğini test eder.
+        """
+        first_close = self.raw.index('},\n{"question": "Second"') + 1
+        for size in (1, 5, 64, len(self.raw)):
+            parser = StreamingQuestionParser()
+            emitted_at = []
+            questions = []
+            for start in range(0, len(self.raw), size):
+                for question in parser.feed(self.raw[start:start + size]):
+                    questions.append(question)
+                    emitted_at.append(start + size)
+            questions.extend(parser.close())
+            
+            self.assertEqual([q['question'] for q in questions], ['Pick "}" [x]', 'Second'])
+            self.assertEqual(questions[1]['correct_answer'], 'B', "Soru doğrulanmadı.")
+            self.assertLessEqual(emitted_at[0], first_close + size, "İlk soru geç üretildi.")
+    
+    def test_process_tests_salvages_truncated_output(self):
+        """
+        Yarıda kesilmiş yanıttaki tamamlanmış soruların kurtarıldığını test eder.
+        """
+        generator = TestGenerator(self.raw)
+        processed_tests = generator.process_tests()
+        
+        self.assertEqual(len(processed_tests), 2, "Tamamlanmış sorular kurtarılmadı.")
+
+class TestJobManager(unittest.TestCase):
+    """
+    JobManager sınıfını test eden birim testleri.
+    """
+    
+    def _wait(self, manager, job_id, timeout=5):
+        deadline = time.time() + timeout
+        while time.time() < deadline:
+            job = manager.get(job_id)
+            if job['status'] in ('completed', 'failed'):
+                return job
+            time.sleep(0.01)
+        self.fail("İş zamanında tamamlanmadı.")
+    
+    def test_job_completes_with_progress(self):
+        """
+        İşin sonucunu ve ilerleme bilgisini kaydettiğini test eder.
+        """
+        def work(value, progress=None):
+            progress('analyzing')
+            return {'value': value}
+        
+        manager = JobManager(max_workers=1, stages={'analyzing': 40})
+        job = self._wait(manager, manager.submit(work, 42))
+        
+        self.assertEqual(job['status'], 'completed', "İş tamamlanmadı.")
+        self.assertEqual(job['result'], {'value': 42}, "İş sonucu yanlış.")
+        self.assertEqual(job['stage'], 'analyzing', "Aşama bilgisi kaydedilmedi.")
+        self.assertEqual(job['progress'], 100, "İlerleme yüzdesi yanlış.")
+    
+    def test_job_failure_and_queue_limit(self):
+        """
+        Hatalı işlerin ve dolu kuyruğun doğru işlendiğini test eder.
+        """
+        def fail(progress=None):
+            raise RuntimeError("boom")
+        
+        manager = JobManager(max_workers=1, max_pending=1)
+        job_id = manager.submit(fail)
+        job = self._wait(manager, job_id)
+        self.assertEqual(job['status'], 'failed', "İş başarısız olarak işaretlenmedi.")
+        self.assertEqual(job['error'], "boom", "Hata mesajı yanlış.")
+        
+        release = threading.Event()
+        manager.submit(lambda progress=None: release.wait(5))
+        try:
+            with self.assertRaises(JobQueueFull):
+                manager.submit(fail)
+        finally:
+            release.set()
+    
+    def test_rejected_submit_releases_queue_slot(self):
+        """
+        Havuz kapatıldığı için gönderilemeyen işin kuyruk payını geri verdiğini test eder.
+        """
+        manager = JobManager(max_workers=1, max_pending=1)
+        manager._get_executor().shutdown()
+        for _ in range(2):
+            with self.assertRaises(RuntimeError):
+                manager.submit(lambda progress=None: None)
+        self.assertEqual((manager._active, manager._jobs), (0, {}))
+    
+    def test_job_state_shared_through_store(self):
+        """
+        Depo verildiğinde işin durumunun başka bir süreçteki JobManager'dan da okunabildiğini test eder.
+        """
+        import tempfile
+        from app.utils.exercise_store import ExerciseStore
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'exercises.db')
+            worker = JobManager(max_workers=1, stages={'analyzing': 40}, store=ExerciseStore(path))
+            other_worker = JobManager(store=ExerciseStore(path))
+            
+            job_id = worker.submit(lambda progress=None: {'value': 1})
+            self._wait(worker, job_id)
+            job = other_worker.get(job_id)
+            
+            self.assertIsNotNone(job, "İş başka worker'dan bulunamadı.")
+            self.assertEqual((job['status'], job['result']), ('completed', {'value': 1}))
+            self.assertIsNone(other_worker.get('missing'))
+
+class TestExerciseJobEndpoints(unittest.TestCase):
+    """
+    Asenkron egzersiz iş endpoint'lerini test eden birim testleri.
+    """
+    
+    def test_submit_and_poll(self):
+        """
+        İş gönderme ve durum sorgulama akışını test eder.
+        """
+        import app as app_module
+        client = app_module.app.test_client()
+        exercise = {'analysis': 'analiz', 'tests': []}
+        
+        with mock.patch.object(app_module, 'get_or_generate_exercise', return_value=exercise):
+            response = client.post('/api/flai-exercise/jobs',
+                                   json={'auth_token': 'token', 'flai_report': 'report'})
+            self.assertEqual(response.status_code, 202, "İş kabul edilmedi.")
+            status_url = response.get_json()['data']['status_url']
+            
+            deadline = time.time() + 5
+            while time.time() < deadline:
+                job = client.get(status_url).get_json()['data']
+                if job['status'] == 'completed':
+                    break
+                time.sleep(0.01)
+        
+        self.assertEqual(job['result'], exercise, "İş sonucu yanlış.")
+        self.assertEqual(client.get('/api/flai-exercise/jobs/unknown').status_code, 404)
+
+class TestLLMCache(unittest.TestCase):
+    """
+    LLMCache sınıfını ve AIAnalyzer önbellek kullanımını test eden birim testleri.
+    """
+    
+    def test_memory_and_disk_tiers(self):
+        """
+        Bellek/disk katmanlarını, LRU atmayı ve TTL süresini test eder.
+        """
+        import tempfile
+        with tempfile.TemporaryDirectory() as cache_dir:
+            key = LLMCache.make_key("  Analyze\n   this ", "model", "1")
+            self.assertEqual(key, LLMCache.make_key("Analyze this", "model", "1"),
+                             "Boşluk farkları farklı anahtar üretti.")
+            self.assertNotEqual(key, LLMCache.make_key("Analyze this", "model", "2"),
+                                "Şablon sürümü anahtara dahil edilmedi.")
+            
+            cache = LLMCache(max_entries=1, ttl=60, disk_dir=cache_dir)
+            self.assertIsNone(cache.get(key))
+            cache.set(key, "yanıt")
+            cache.set("other", "diğer")  # Bellekten ilk kaydı atar
+            self.assertEqual(cache.get(key), "yanıt", "Disk katmanı kullanılmadı.")
+            
+            stats = cache.stats()
+            self.assertEqual((stats['hits'], stats['disk_hits'], stats['misses']), (1, 1, 1))
+            
+            # Aynı dizini paylaşan yeni bir süreç kaydı görebilmeli
+            self.assertEqual(LLMCache(disk_dir=cache_dir).get(key), "yanıt")
+            
+            expired = LLMCache(ttl=60)
+            expired.memory.set(key, "eski", ttl=-1)
+            self.assertIsNone(expired.get(key), "Süresi dolan kayıt döndürüldü.")
+    
+    def test_analyzer_skips_model_on_repeated_prompt(self):
+        """
+        Aynı transkript için modelin ikinci kez çağrılmadığını test eder.
+        """
+        with mock.patch.dict(os.environ, {'GEMINI_API_KEY': 'test-key'}):
+            analyzer = AIAnalyzer(cache=LLMCache())
+        analyzer.model = mock.MagicMock()
+        analyzer.model.generate_content.return_value.text = '{"seviye": "B1"}'
+        transcript = {'speakers': {'A': ['Hello']}, 'speaker_counts': {'A': 1}, 'all_text': 'Hello'}
+        
+        first = analyzer.analyze_zoom_transcript(transcript)
+        second = analyzer.analyze_zoom_transcript(transcript)
+        
+        self.assertEqual(first, second, "Önbellekten dönen analiz farklı.")
+        self.assertEqual(analyzer.model.generate_content.call_count, 1, "Model tekrar çağrıldı.")
+    
+    def test_invalid_reply_not_cached(self):
+        """
+        Kullanılamayan yanıtın önbelleğe alınmadığını, yeniden denemenin modeli tekrar çağırdığını test eder.
+        """
+        model = mock.MagicMock()
+        model.generate_content.side_effect = [
+            mock.MagicMock(text="Üzgünüm, soru üretemedim."),
+            mock.MagicMock(text='```json\n[{"question": "Q?", "correct_answer": "A"}]\n```')
+        ]
+        analyzer = AIAnalyzer(cache=LLMCache(), model=model, governor=None)
+        transcript = {'speakers': {}, 'speaker_counts': {}, 'all_text': 'Hello'}
+        
+        first = analyzer.generate_zoom_tests({'success': True, 'raw_analysis': '{}'}, transcript)
+        second = analyzer.generate_zoom_tests({'success': True, 'raw_analysis': '{}'}, transcript)
+        
+        self.assertTrue(first['fallback'])
+        self.assertFalse(second['fallback'], "Bozuk yanıt önbellekten döndürüldü.")
+        self.assertEqual(model.generate_content.call_count, 2)
+        
+        # CSV yolu (generate_tests) da örnek soruları işaretler ve önbelleğe yazmaz
+        model.generate_content.side_effect = [
+            mock.MagicMock(text="Üzgünüm."),
+            mock.MagicMock(text='```json\n[{"question": "Q2?", "correct_answer": "B"}]\n```')
+        ]
+        first = analyzer.generate_tests({'success': True, 'raw_analysis': 'CSV'}, transcript)
+        second = analyzer.generate_tests({'success': True, 'raw_analysis': 'CSV'}, transcript)
+        self.assertEqual((first['fallback'], second['fallback']), (True, False))
+        self.assertEqual(model.generate_content.call_count, 4)
+        model.generate_content.side_effect = RuntimeError("geçici hata")
+        self.assertTrue(analyzer.generate_tests({'success': True, 'raw_analysis': 'hata'}, transcript)['fallback'])
+
+class TestRequestCoalescing(unittest.TestCase):
+    """
+    Eş zamanlı istek birleştirme ve egzersiz önbelleğini test eden birim testleri.
+    """
+    
+    def test_concurrent_calls_share_one_execution(self):
+        """
+        Aynı anahtarla eş zamanlı çağrıların tek bir çalıştırmayı paylaştığını test eder.
+        """
+        flight = SingleFlight()
+        started = threading.Event()
+        release = threading.Event()
+        calls = []
+        
+        def work():
+            calls.append(1)
+            started.set()
+            release.wait(5)
+            return 'sonuç'
+        
+        results = []
+        leader = threading.Thread(target=lambda: results.append(flight.do('report', work)))
+        leader.start()
+        started.wait(5)
+        followers = [threading.Thread(target=lambda: results.append(flight.do('report', work)))
+                     for _ in range(3)]
+        for thread in followers:
+            thread.start()
+        time.sleep(0.05)
+        release.set()
+        for thread in [leader] + followers:
+            thread.join(5)
+        
+        self.assertEqual(len(calls), 1, "İşlev birden fazla kez çalıştı.")
+        self.assertEqual(sorted(shared for _, shared in results), [False, True, True, True])
+        self.assertTrue(all(result == 'sonuç' for result, _ in results))
+    
+    def test_waiters_time_out_when_leader_hangs(self):
+        """
+        Takılan bir çağrıyı bekleyenlerin wait_timeout sonunda SingleFlightTimeout aldığını
+        ve birleştirme zaman aşımının egzersiz yolunda 504 olarak döndüğünü test eder.
+        """
+        from app.utils.single_flight import SingleFlightTimeout
+        flight = SingleFlight(wait_timeout=0.1)
+        release = threading.Event()
+        leader = threading.Thread(target=lambda: flight.do('report', release.wait, 5))
+        leader.start()
+        time.sleep(0.05)
+        with self.assertRaises(SingleFlightTimeout):
+            flight.do('report', lambda: 'ikinci')
+        release.set()
+        leader.join(5)
+        self.assertEqual(flight.do('report', lambda: 'yeni'), ('yeni', False))
+        
+        with mock.patch.object(exercise_pipeline._in_flight, 'do', side_effect=SingleFlightTimeout('takıldı')):
+            with self.assertRaises(exercise_pipeline.PipelineError) as raised:
+                exercise_pipeline.get_or_generate_exercise('token', 'hung-report')
+        self.assertEqual(raised.exception.status_code, 504)
+    
+    def test_sync_and_async_requests_share_one_generation(self):
+        """
+        Aynı rapor için senkron ve asenkron yoldan gelen eş zamanlı isteklerin tek bir
+        üretimi paylaştığını test eder.
+        """
+        from app.utils import async_runtime
+        exercise = {'analysis': 'analiz', 'tests': []}
+        started = threading.Event()
+        
+        def generate(auth_token, flai_report, progress=None):
+            started.set()
+            time.sleep(0.2)
+            return exercise
+        
+        async def generate_async(auth_token, flai_report, progress=None):
+            return {'analysis': 'ikinci üretim', 'tests': []}
+        
+        with mock.patch.object(exercise_pipeline, 'generate_exercise', side_effect=generate) as sync_generate, \
+             mock.patch.object(exercise_pipeline, 'generate_exercise_async', side_effect=generate_async) as async_generate:
+            results = []
+            leader = threading.Thread(target=lambda: results.append(
+                exercise_pipeline.get_or_generate_exercise('token', 'mixed-report')))
+            leader.start()
+            started.wait(5)
+            results.append(async_runtime.run(exercise_pipeline.get_or_generate_exercise_async, 'token', 'mixed-report'))
+            leader.join(5)
+        
+        self.assertEqual(results, [exercise, exercise])
+        self.assertEqual(sync_generate.call_count, 1)
+        async_generate.assert_not_called()
+    
+    def test_exercise_cached_per_report_and_token(self):
+        """
+        Egzersizin rapor ve token başına önbelleğe alındığını test eder.
+        """
+        exercise = {'analysis': 'analiz', 'tests': []}
+        with mock.patch.object(exercise_pipeline, 'generate_exercise',
+                               return_value=exercise) as generate:
+            first = exercise_pipeline.get_or_generate_exercise('token', 'cache-report')
+            second = exercise_pipeline.get_or_generate_exercise('token', 'cache-report')
+            exercise_pipeline.get_or_generate_exercise('other-token', 'cache-report')
+        
+        self.assertIs(first, second, "Önbellekteki egzersiz kullanılmadı.")
+        self.assertEqual(generate.call_count, 2, "Farklı token önbellekten yanıt aldı.")
+    
+    def test_sample_test_fallback_not_cached(self):
+        """
+        Gemini hatasından sonra örnek sorularla tamamlanan egzersizin saklanmadığını test eder.
+        """
+        analyzer = AIAnalyzer(cache=None, governor=None, model=mock.MagicMock())
+        analyzer.model.generate_content.side_effect = RuntimeError("geçici hata")
+        self.assertTrue(analyzer.generate_zoom_tests({'success': True}, {})['fallback'])
+        
+        exercise = {'analysis': 'analiz', 'tests': [], 'fallback': True}
+        store = mock.MagicMock()
+        store.get.return_value = None
+        with mock.patch.object(exercise_pipeline, 'generate_exercise', return_value=exercise) as generate, \
+                mock.patch.object(exercise_pipeline, '_exercise_store', store):
+            exercise_pipeline.get_or_generate_exercise('token', 'fallback-report')
+            exercise_pipeline.get_or_generate_exercise('token', 'fallback-report')
+        
+        self.assertEqual(generate.call_count, 2, "Örnek sorular önbellekten döndürüldü.")
+        store.set.assert_not_called()
+
+class TestSharedAnalyzer(unittest.TestCase):
+    """
+    Süreç genelinde paylaşılan AIAnalyzer'ı test eden birim testleri.
+    """
+    
+    def tearDown(self):
+        ai_analyzer.set_analyzer(None)
+    
+    def test_analyzer_created_once_per_process(self):
+        """
+        Analiz nesnesinin thread'ler arasında paylaşıldığını ve fork sonrası yenilendiğini test eder.
+        """
+        with mock.patch.dict(os.environ, {'GEMINI_API_KEY': 'test-key'}), \
+                mock.patch.object(ai_analyzer.genai, 'configure') as configure:
+            seen = []
+            threads = [threading.Thread(target=lambda: seen.append(ai_analyzer.get_analyzer()))
+                       for _ in range(8)]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join(5)
+            
+            self.assertEqual(len({id(analyzer) for analyzer in seen}), 1, "Birden fazla nesne oluşturuldu.")
+            self.assertEqual(configure.call_count, 1, "Gemini birden fazla kez yapılandırıldı.")
+            
+            with mock.patch.object(ai_analyzer.os, 'getpid', return_value=-1):
+                forked = ai_analyzer.get_analyzer()
+            self.assertIsNot(forked, seen[0], "Fork sonrası nesne yeniden oluşturulmadı.")
+
+class TestCombinedMode(unittest.TestCase):
+    """
+    Tek istekte analiz + test üretimini test eden birim testleri.
+    """
+    
+    transcript = {'speakers': {'A': ['Hello']}, 'speaker_counts': {'A': 1}, 'all_text': 'A: Hello'}
+    
+    def _analyzer(self, *responses):
+        model = mock.MagicMock()
+        model.generate_content.side_effect = [mock.MagicMock(text=text) for text in responses]
+        return AIAnalyzer(cache=LLMCache(), model=model), model
+    
+    def test_single_call_split_into_existing_shapes(self):
+        """
+        Birleşik yanıtın raw_analysis / raw_tests yapısına bölündüğünü test eder.
+        """
+        combined = '```json\n{"analysis": {"seviye": "B2"}, "questions": [{"question": "Q?"}]}\n```'
+        analyzer, model = self._analyzer(combined)
+        
+        analysis_result, tests_result = analyzer.analyze_and_generate_zoom_tests(self.transcript)
+        
+        self.assertEqual(model.generate_content.call_count, 1, "Birden fazla istek yapıldı.")
+        self.assertEqual(json.loads(analysis_result['raw_analysis']), {'seviye': 'B2'})
+        self.assertIn("```", tests_result['raw_tests'], "Test çıktısı kod bloğu içinde değil.")
+        self.assertEqual(json.loads(analyzer._strip_code_fence(tests_result['raw_tests'])),
+                         [{'question': 'Q?'}])
+    
+    def test_malformed_response_falls_back_to_two_calls(self):
+        """
+        Ayrıştırılamayan birleşik yanıtta iki ayrı çağrıya dönüldüğünü test eder.
+        """
+        analyzer, model = self._analyzer("not json", '{"seviye": "A2"}', '```\n[]\n```')
+        
+        analysis_result, tests_result = analyzer.analyze_and_generate_zoom_tests(self.transcript)
+        
+        self.assertEqual(model.generate_content.call_count, 3, "Geri dönüş çağrıları yapılmadı.")
+        self.assertEqual(analysis_result['raw_analysis'], '{"seviye": "A2"}')
+        self.assertTrue(tests_result['success'])
+
+class TestChunkedAnalysis(unittest.TestCase):
+    """
+    Uzun transkriptlerin parçalı analizini test eden birim testleri.
+    """
+    
+    def test_whole_lesson_analyzed_and_merged(self):
+        """
+        Metnin kesilmeden parçalara bölündüğünü ve parça sonuçlarının birleştirildiğini test eder.
+        """
+        lines = [f"Student: sentence number {i} about topic{i % 3}" for i in range(30)]
+        transcript = {'speakers': {'Student': []}, 'speaker_counts': {}, 'all_text': "\n".join(lines)}
+        levels = iter(['B1', 'B2', 'A2', 'B1', 'C1', 'B1', 'B2', 'B1'] * 4)
+        lock = threading.Lock()
+        seen = []
+        
+        def respond(prompt):
+            with lock:
+                seen.append(prompt)
+                level = next(levels)
+            topics = sorted({line.split()[-1] for line in lines if line in prompt})
+            return mock.MagicMock(text=json.dumps({
+                'ogrenci': 'Student', 'seviye': level, 'ana_konular': topics, 'yeni_kelimeler': ['sentence']
+            }))
+        
+        model = mock.MagicMock()
+        model.generate_content.side_effect = respond
+        analyzer = AIAnalyzer(cache=LLMCache(), model=model)
+        
+        with mock.patch.dict(os.environ, {'GEMINI_CHUNKED_ANALYSIS': '1'}), \
+                mock.patch.object(ai_analyzer, 'ANALYSIS_CHUNK_CHARS', 400):
+            result = analyzer.analyze_zoom_transcript(transcript)
+        
+        self.assertTrue(result['success'])
+        self.assertGreater(len(seen), 1, "Metin parçalara bölünmedi.")
+        self.assertTrue(all(any(line in prompt for prompt in seen) for line in lines),
+                        "Transkriptin bir kısmı analiz edilmedi.")
+        analysis = json.loads(result['raw_analysis'])
+        self.assertEqual(analysis['ogrenci'], 'Student')
+        self.assertEqual(sorted(analysis['ana_konular']), ['topic0', 'topic1', 'topic2'])
+        self.assertEqual(analysis['yeni_kelimeler'], ['sentence'])
+        self.assertIn(analysis['seviye'], ('B1', 'B2'))
+    
+    def test_split_and_merge_helpers(self):
+        """
+        Parçalamanın konuşma sınırlarına uyduğunu ve seviyelerin medyanla birleştirildiğini test eder.
+        """
+        chunks = AIAnalyzer._split_into_chunks("A: one two\nB: three four\nA: five", 24)
+        self.assertEqual(chunks, ["A: one two\nB: three four", "A: five"])
+        
+        merged = AIAnalyzer._merge_analyses([
+            {'level': 'A2', 'strengths': ['Fluency'], 'vocabulary': {'new_words': ['trip']}},
+            {'level': 'c1', 'strengths': ['fluency', 'Grammar'], 'vocabulary': {'new_words': ['hotel']}},
+            {'level': 'B2', 'strengths': []}
+        ])
+        self.assertEqual(merged, {
+            'level': 'B2',
+            'strengths': ['Fluency', 'Grammar'],
+            'vocabulary': {'new_words': ['trip', 'hotel']}
+        })
+
+class TestExerciseStream(unittest.TestCase):
+    """
+    Egzersiz üretim akışını (SSE) test eden birim testleri.
+    """
+    
+    raw_tests = '```json\n[{"question": "Q1 {x}?", "correct_answer": "A"}, {"question": "Q2", "correct_answer": "B"}]\n```'
+    
+    def test_questions_emitted_as_soon_as_complete(self):
+        """
+        Her sorunun kapanış parantezi gelir gelmez üretildiğini test eder.
+        """
+        chunks = [self.raw_tests[i:i + 7] for i in range(0, len(self.raw_tests), 7)]
+        received = []
+        
+        def feed():
+            for index, chunk in enumerate(chunks):
+                received.append(index)
+                yield chunk
+        
+        questions = []
+        for question in iter_streamed_questions(feed()):
+            questions.append((question['question'], received[-1]))
+        
+        self.assertEqual([q for q, _ in questions], ['Q1 {x}?', 'Q2'])
+        self.assertLess(questions[0][1], len(chunks) - 1, "İlk soru akış bitmeden üretilmedi.")
+    
+    def test_stream_endpoint_emits_stage_events(self):
+        """
+        SSE endpoint'inin aşama ve soru olaylarını sırayla gönderdiğini test eder.
+        """
+        import app as app_module
+        model = mock.MagicMock()
+        model.generate_content.side_effect = [
+            mock.MagicMock(text='{"seviye": "B1"}'),
+            [mock.MagicMock(text=self.raw_tests[:40]), mock.MagicMock(text=self.raw_tests[40:])]
+        ]
+        analyzer = AIAnalyzer(cache=LLMCache(), model=model)
+        transcript = {'gladia_response': [{'speaker': 'A', 'text': 'Hello there', 'duration': 1.0}]}
+        
+        with mock.patch.object(exercise_pipeline, '_fetch_transcript', return_value=transcript), \
+                mock.patch.object(exercise_pipeline, 'get_analyzer', return_value=analyzer):
+            response = app_module.app.test_client().get(
+                '/api/flai-exercise/stream?auth_token=t&flai_report=stream-report')
+            body = response.get_data(as_text=True)
+        
+        self.assertEqual(response.mimetype, 'text/event-stream')
+        events = [line[len('event: '):] for line in body.splitlines() if line.startswith('event: ')]
+        self.assertEqual(events, ['transcript_fetched', 'statistics', 'analysis',
+                                  'question', 'question', 'completed'])
+    
+    def test_stream_without_questions_falls_back_like_sync_path(self):
+        """
+        Akıştan soru ayrıştırılamadığında senkron yoldaki gibi örnek soruların gönderildiğini
+        ve sonucun önbelleğe alınmadığını test eder.
+        """
+        model = mock.MagicMock()
+        model.generate_content.side_effect = [
+            mock.MagicMock(text='{"seviye": "B1"}'),
+            [mock.MagicMock(text="Üzgünüm, "), mock.MagicMock(text="soru üretemedim.")]
+        ]
+        analyzer = AIAnalyzer(cache=LLMCache(), model=model)
+        transcript = {'gladia_response': [{'speaker': 'A', 'text': 'Hello there', 'duration': 1.0}]}
+        
+        with mock.patch.object(exercise_pipeline, '_fetch_transcript', return_value=transcript), \
+                mock.patch.object(exercise_pipeline, 'get_analyzer', return_value=analyzer):
+            events = list(exercise_pipeline.stream_exercise('t', 'prose-report'))
+        
+        completed = events[-1][1]
+        self.assertTrue(completed['fallback'])
+        self.assertTrue(completed['tests'], "Örnek sorular gönderilmedi.")
+        self.assertEqual([name for name, _ in events].count('question'), len(completed['tests']))
+        self.assertIsNone(exercise_pipeline._lookup_exercise(exercise_pipeline._exercise_key('t', 'prose-report')))
+    
+    def test_stream_honors_combined_mode_and_question_limit(self):
+        """
+        Birleşik modda akışın tek Gemini isteği yaptığını ve akış yolunda soru sayısının
+        MAX_QUESTIONS ile sınırlandığını test eder.
+        """
+        transcript = {'gladia_response': [{'speaker': 'A', 'text': 'Hello there', 'duration': 1.0}]}
+        model = mock.MagicMock()
+        model.generate_content.return_value = mock.MagicMock(
+            text='```json\n{"analysis": {"seviye": "B2"}, "questions": '
+                 '[{"question": "Q1?", "correct_answer": "A"}, {"question": "Q2?", "correct_answer": "B"}]}\n```')
+        analyzer = AIAnalyzer(cache=LLMCache(), model=model)
+        with mock.patch.dict(os.environ, {'GEMINI_COMBINED_MODE': '1'}), \
+                mock.patch.object(exercise_pipeline, '_fetch_transcript', return_value=transcript), \
+                mock.patch.object(exercise_pipeline, 'get_analyzer', return_value=analyzer):
+            events = list(exercise_pipeline.stream_exercise('t', 'combined-stream'))
+        
+        self.assertEqual(model.generate_content.call_count, 1, "Birleşik modda birden fazla istek yapıldı.")
+        self.assertEqual([name for name, _ in events],
+                         ['transcript_fetched', 'statistics', 'analysis', 'question', 'question', 'completed'])
+        self.assertEqual([q['question'] for q in events[-1][1]['tests']], ['Q1?', 'Q2?'])
+        
+        model = mock.MagicMock()
+        model.generate_content.side_effect = [
+            mock.MagicMock(text='{"seviye": "B1"}'),
+            [mock.MagicMock(text=self.raw_tests)]
+        ]
+        with mock.patch.object(exercise_pipeline, 'MAX_QUESTIONS', 1), \
+                mock.patch.object(exercise_pipeline, '_fetch_transcript', return_value=transcript), \
+                mock.patch.object(exercise_pipeline, 'get_analyzer', return_value=AIAnalyzer(cache=LLMCache(), model=model)):
+            events = list(exercise_pipeline.stream_exercise('t', 'limited-stream'))
+        self.assertEqual([name for name, _ in events].count('question'), 1)
+        self.assertEqual(len(events[-1][1]['tests']), 1)
+    
+    def test_concurrent_streams_share_one_generation(self):
+        """
+        Aynı rapor için eş zamanlı akışların tek bir üretimi paylaştığını test eder.
+        """
+        release = threading.Event()
+        calls = []
+        
+        def pipeline(auth_token, flai_report):
+            calls.append(flai_report)
+            yield 'analysis', {'analysis': 'B1'}
+            release.wait(5)
+            yield 'question', {'index': 0, 'question': {'question': 'Q?'}}
+            yield 'completed', {'analysis': 'B1', 'tests': [{'question': 'Q?'}], 'fallback': False}
+        
+        results = []
+        with mock.patch.object(exercise_pipeline, '_stream_pipeline', side_effect=pipeline):
+            threads = [threading.Thread(target=lambda: results.append(
+                list(exercise_pipeline.stream_exercise('t', 'shared-stream')))) for _ in range(3)]
+            for thread in threads:
+                thread.start()
+            time.sleep(0.1)
+            release.set()
+            for thread in threads:
+                thread.join(5)
+        
+        self.assertEqual(len(calls), 1, "Eş zamanlı akışlar ayrı ayrı üretim yaptı.")
+        self.assertEqual(len(results), 3)
+        for events in results:
+            self.assertEqual([name for name, _ in events], ['analysis', 'question', 'completed'])
+
+class TestFlalingoClient(unittest.TestCase):
+    """
+    FlalingoService HTTP istemcisinin yeniden deneme ve devre kesici davranışını test eden birim testleri.
+    """
+    
+    def _service(self, responses, threshold=5):
+        session = mock.MagicMock()
+        session.get.side_effect = responses
+        with mock.patch.dict(os.environ, {'FLALINGO_BACKOFF_BASE': '0.001', 'FLALINGO_MAX_RETRIES': '2'}):
+            service = FlalingoService(base_url='http://flalingo.test/api', session=session,
+                                      breaker=CircuitBreaker('test', failure_threshold=threshold, reset_timeout=60))
+        return service, session
+    
+    def test_retries_transient_errors_with_timeout(self):
+        """
+        Geçici hataların yeniden denendiğini ve zaman aşımının iletildiğini test eder.
+        """
+        import requests
+        ok = mock.MagicMock(status_code=200)
+        service, session = self._service([requests.exceptions.ConnectTimeout("timeout"),
+                                          mock.MagicMock(status_code=503), ok])
+        
+        self.assertIs(service._get('http://flalingo.test/api/flai-transcript'), ok)
+        self.assertEqual(session.get.call_count, 3, "Geçici hatalar yeniden denenmedi.")
+        self.assertEqual(session.get.call_args.kwargs['timeout'], service.timeout)
+    
+    def test_client_errors_not_retried(self):
+        """
+        404 yanıtının yeniden denenmeden REPORT_NOT_FOUND hatasına dönüştüğünü test eder.
+        """
+        service, session = self._service([mock.MagicMock(status_code=404)])
+        
+        with self.assertRaises(FlalingoError) as context:
+            service._get('http://flalingo.test/api/flai-transcript')
+        self.assertEqual(context.exception.code, 'REPORT_NOT_FOUND')
+        self.assertEqual(session.get.call_count, 1)
+    
+    def test_breaker_fails_fast_when_degraded(self):
+        """
+        Art arda başarısız çağrılardan sonra devrenin açılıp servise gidilmediğini test eder.
+        """
+        service, session = self._service([mock.MagicMock(status_code=503)] * 6, threshold=2)
+        
+        for _ in range(2):
+            with self.assertRaises(FlalingoError):
+                service._get('http://flalingo.test/api/flai-transcript')
+        calls = session.get.call_count
+        
+        with self.assertRaises(FlalingoError):
+            service._get('http://flalingo.test/api/flai-transcript')
+        self.assertEqual(service.breaker.state, 'open')
+        self.assertEqual(session.get.call_count, calls, "Açık devrede servise istek yapıldı.")
+    
+    def test_unexpected_error_releases_half_open_trial(self):
+        """
+        Yarı açık devrede beklenmeyen bir hatanın deneme hakkını kilitli bırakmadığını test eder.
+        """
+        import requests
+        ok = mock.MagicMock(status_code=200)
+        service, session = self._service([requests.exceptions.InvalidURL("bozuk adres"), ok], threshold=1)
+        service.breaker.reset_timeout = 0
+        service.breaker.record_failure()
+        self.assertEqual(service.breaker.state, 'half_open')
+        
+        with self.assertRaises(requests.exceptions.InvalidURL):
+            service._get('http://flalingo.test/api/flai-transcript')
+        self.assertIs(service._get('http://flalingo.test/api/flai-transcript'), ok,
+                      "Deneme hakkı beklenmeyen hatadan sonra bırakılmadı.")
+        self.assertEqual(service.breaker.state, 'closed')
+    
+    def test_rate_limit_honors_retry_after(self):
+        """
+        429 yanıtından sonra sabit bekleme yerine Retry-After süresinin beklendiğini, süre
+        sınırı aşıyorsa yeniden denenmediğini test eder.
+        """
+        ok = mock.MagicMock(status_code=200)
+        limited = mock.MagicMock(status_code=429, headers={'Retry-After': '3'})
+        service, session = self._service([limited, ok])
+        
+        with mock.patch('app.utils.flalingo_service.time.sleep') as sleep:
+            self.assertIs(service._get('http://flalingo.test/api/flai-transcript'), ok)
+        sleep.assert_called_once_with(3.0)
+        
+        service, session = self._service([mock.MagicMock(status_code=429, headers={'Retry-After': '120'}), ok])
+        with mock.patch('app.utils.flalingo_service.time.sleep') as sleep, self.assertRaises(FlalingoError):
+            service._get('http://flalingo.test/api/flai-transcript')
+        sleep.assert_not_called()
+        self.assertEqual(session.get.call_count, 1)
+
+class TestJSONProvider(unittest.TestCase):
+    """
+    FastJSONProvider'ı test eden birim testleri.
+    """
+    
+    def test_output_compatible_with_default_provider(self):
+        """
+        Hızlı sağlayıcının varsayılan sağlayıcıyla aynı veriyi girintisiz ürettiğini test eder.
+        """
+        import datetime
+        from flask import Flask
+        from flask.json.provider import DefaultJSONProvider
+        from app.utils.json_provider import FastJSONProvider
+        
+        flask_app = Flask(__name__)
+        fast = FastJSONProvider(flask_app)
+        default = DefaultJSONProvider(flask_app)
+        payload = {
+            'b': [1, 2.5, None, True],
+            'a': {'text': 'Öğrenci çok iyi', 'when': datetime.datetime(2024, 1, 2, 3, 4, 5)}
+        }
+        
+        with flask_app.app_context():
+            body = fast.response(payload).get_data()
+        self.assertEqual(body.count(b"\n"), 1, "Yanıt girintili üretildi.")
+        self.assertEqual(json.loads(body), json.loads(default.dumps(payload)))
+        self.assertEqual(fast.dumps({2: 'x', 1: 'y'}), '{"1":"y","2":"x"}')
+        # orjson'un desteklemediği değerlerde standart kodlayıcıya dönülür
+        self.assertEqual(json.loads(fast.dumps({'big': 2 ** 70})), {'big': 2 ** 70})
+
+class TestFakeGemini(unittest.TestCase):
+    """
+    Yerel sahte Gemini modelini test eden birim testleri.
+    """
+    
+    def test_fake_model_drives_zoom_pipeline(self):
+        """
+        GEMINI_FAKE=1 iken AIAnalyzer'ın sahte modelle geçerli analiz ve test ürettiğini test eder.
+        """
+        from app.utils.fake_gemini import FakeGenerativeModel
+        transcript = {'speakers': {'Student': ['I visited the museum']}, 'speaker_counts': {'Student': 1},
+                      'all_text': 'Student: I visited the museum yesterday with my brother'}
+        
+        with mock.patch.dict(os.environ, {'GEMINI_FAKE': '1', 'GEMINI_FAKE_PROFILE': 'instant'}):
+            analyzer = AIAnalyzer(cache=LLMCache())
+        self.assertIsInstance(analyzer.model, FakeGenerativeModel)
+        
+        analysis = analyzer.analyze_zoom_transcript(transcript)
+        self.assertIn(json.loads(analyzer._strip_code_fence(analysis['raw_analysis']))['seviye'],
+                      ('A2', 'B1', 'B2', 'C1'))
+        generator = TestGenerator(analyzer.generate_zoom_tests(analysis, transcript)['raw_tests'])
+        self.assertEqual(len(generator.process_tests()), 5)
+        streamed = list(iter_streamed_questions(analyzer.stream_zoom_tests(analysis, transcript)))
+        self.assertEqual(len(streamed), 5, "Akış modunda sorular alınamadı.")
+    
+    def test_failure_rates(self):
+        """
+        Hata ve bozuk çıktı oranlarının uygulandığını test eder.
+        """
+        from app.utils.fake_gemini import FakeGenerativeModel
+        prompt = "Aşağıdaki Zoom ders transkriptini analiz et."
+        
+        failing = FakeGenerativeModel(error_rate=1.0, seed=1)
+        with self.assertRaises(Exception):
+            failing.generate_content(prompt)
+        with self.assertRaises(Exception):
+            list(failing.generate_content(prompt, stream=True))
+        
+        malformed = FakeGenerativeModel(malformed_rate=1.0, seed=1)
+        for _ in range(5):
+            with self.assertRaises(ValueError):
+                json.loads(AIAnalyzer._strip_code_fence(malformed.generate_content(prompt).text))
+
+class TestMetrics(unittest.TestCase):
+    """
+    Prometheus metriklerini ve /metrics uç noktasını test eden birim testleri.
+    """
+    
+    def test_registry_renders_prometheus_text(self):
+        """
+        Sayaç ve histogramların Prometheus metin biçiminde yazıldığını test eder.
+        """
+        from app.utils.metrics import MetricsRegistry, StageTimer
+        registry = MetricsRegistry()
+        calls = registry.counter('test_calls_total', 'Test çağrıları', ['status'])
+        stages = registry.histogram('test_stage_seconds', 'Test aşamaları', ['pipeline', 'stage'],
+                                    buckets=(0.1, 1.0))
+        calls.inc(status='ok')
+        calls.inc(2, status='ok')
+        timer = StageTimer('demo', histogram=stages)
+        timer.start('first')
+        timer.start('second')
+        timer.stop()
+        
+        text = registry.render()
+        self.assertIn('# TYPE test_calls_total counter', text)
+        self.assertIn('test_calls_total{status="ok"} 3', text)
+        self.assertIn('test_stage_seconds_bucket{pipeline="demo",stage="first",le="+Inf"} 1', text)
+        self.assertIn('test_stage_seconds_count{pipeline="demo",stage="second"} 1', text)
+        with self.assertRaises(ValueError):
+            calls.inc(status='ok', extra='x')
+    
+    def test_exercise_stages_exposed_on_metrics_endpoint(self):
+        """
+        Egzersiz aşamalarının ve örnek test geri dönüşünün /metrics çıktısında göründüğünü test eder.
+        """
+        from app import app
+        from app.utils.metrics import PIPELINE_STAGE_SECONDS, SAMPLE_TEST_FALLBACKS
+        analyzer = AIAnalyzer(model=mock.Mock(), cache=LLMCache())
+        analyzer.model.generate_content.return_value = mock.Mock(text='{"seviye": "B1"}')
+        transcript = {'gladia_response': [{'speaker': 'Student', 'text': 'I visited the museum'}]}
+        before = PIPELINE_STAGE_SECONDS.count(pipeline='exercise', stage='generating_tests')
+        fallbacks = SAMPLE_TEST_FALLBACKS.value()
+        
+        with mock.patch.object(exercise_pipeline, '_fetch_transcript', return_value=transcript), \
+             mock.patch.object(exercise_pipeline, 'get_analyzer', return_value=analyzer), \
+             mock.patch.object(analyzer, 'generate_zoom_tests', side_effect=lambda *a: {
+                 'success': True, 'raw_tests': analyzer._get_sample_tests()}):
+            exercise_pipeline.generate_exercise('token', 'metrics-report')
+        
+        self.assertEqual(PIPELINE_STAGE_SECONDS.count(pipeline='exercise', stage='generating_tests'), before + 1)
+        self.assertEqual(SAMPLE_TEST_FALLBACKS.value(), fallbacks + 1)
+        response = app.test_client().get('/metrics')
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response.content_type.startswith('text/plain; version=0.0.4'))
+        body = response.get_data(as_text=True)
+        self.assertIn('flai_pipeline_stage_seconds_count{pipeline="exercise",stage="analyzing"}', body)
+        self.assertIn('flai_gemini_calls_total{mode="generate",status="ok"}', body)
+
+class TestLogging(unittest.TestCase):
+    """
+    Yapısal loglama yapılandırmasını test eden birim testleri.
+    """
+    
+    def _capture(self, **options):
+        import io
+        import logging
+        from app.utils.logging_config import configure_logging
+        root = logging.getLogger()
+        handlers, level = list(root.handlers), root.level
+        
+        def restore():
+            root.handlers[:] = handlers
+            root.setLevel(level)
+        self.addCleanup(restore)
+        stream = io.StringIO()
+        configure_logging(stream=stream, **options)
+        return stream
+    
+    def test_json_lines_carry_request_id_and_capped_payload(self):
+        """
+        JSON kayıtlarının istek kimliğini taşıdığını ve uzun mesajların kısaltıldığını test eder.
+        """
+        import logging
+        from app import app
+        stream = self._capture(level='INFO', log_format='json', max_chars=50)
+        
+        with app.test_request_context('/', headers={'X-Request-ID': 'req-123'}):
+            app.preprocess_request()
+            logging.getLogger('app.test').info("Testler: %s", 'x' * 500, extra={'stage': 'parsing_tests'})
+            app.do_teardown_request()
+        
+        entry = json.loads(stream.getvalue().splitlines()[-1])
+        self.assertEqual(entry['request_id'], 'req-123')
+        self.assertEqual(entry['stage'], 'parsing_tests')
+        self.assertTrue(entry['message'].startswith('Testler: xxx'))
+        self.assertLess(len(entry['message']), 100, "Uzun mesaj kısaltılmadı.")
+        response = app.test_client().get('/api/health', headers={'X-Request-ID': 'bad id!'})
+        self.assertRegex(response.headers['X-Request-ID'], r'^[0-9a-f]{32}$')
+    
+    def test_debug_sampling_and_lazy_formatting(self):
+        """
+        DEBUG örneklemesinin yalnızca DEBUG kayıtlarını elediğini ve seviye altındaki
+        kayıtların biçimlendirilmediğini test eder.
+        """
+        import logging
+        stream = self._capture(level='DEBUG', debug_sample_rate=0.0)
+        log = logging.getLogger('app.test')
+        log.debug("atlanmalı")
+        log.info("yazılmalı")
+        self.assertNotIn('atlanmalı', stream.getvalue())
+        self.assertIn('yazılmalı', stream.getvalue())
+        
+        self._capture(level='INFO')
+        payload = mock.MagicMock()
+        log.debug("Yük: %s", payload)
+        payload.__str__.assert_not_called()
+        
+        # Uyarı seviyesi kapalıyken geçersiz soru sözlüğü biçimlendirilmez
+        formatted = []
+        
+        class Test(dict):
+            def __repr__(self):
+                formatted.append(True)
+                return dict.__repr__(self)
+            __str__ = __repr__
+        
+        self._capture(level='ERROR')
+        self.assertIsNone(TestGenerator.validate_test(Test(options=['a'] * 1000)))
+        self.assertEqual(formatted, [])
+
+class TestGeminiGovernor(unittest.TestCase):
+    """
+    Gemini çağrı düzenleyicisini test eden birim testleri.
+    """
+    
+    def test_in_flight_cap_shared_through_directory(self):
+        """
+        Aynı dizini paylaşan iki düzenleyicinin toplam eş zamanlı çağrı sınırına uyduğunu test eder.
+        """
+        import tempfile
+        from app.utils.gemini_governor import GeminiGovernor, GovernorTimeout
+        with tempfile.TemporaryDirectory() as directory:
+            first = GeminiGovernor(max_in_flight=1, timeout=0.2, directory=directory)
+            second = GeminiGovernor(max_in_flight=1, timeout=0.2, directory=directory)
+            self.assertTrue(first.shared)
+            permit = first.acquire()
+            with self.assertRaises(GovernorTimeout):
+                second.acquire()
+            first.release(permit)
+            second.release(second.acquire())
+    
+    def test_interactive_calls_served_before_background(self):
+        """
+        Bekleyen etkileşimli çağrıların arka plan çağrılarından önce izin aldığını test eder.
+        """
+        from app.utils.gemini_governor import GeminiGovernor, BACKGROUND, INTERACTIVE, request_priority
+        governor = GeminiGovernor(max_in_flight=1, timeout=5)
+        order = []
+        
+        def call(priority):
+            with request_priority(priority):
+                with governor.slot():
+                    order.append(priority)
+        
+        held = governor.acquire()
+        threads = [threading.Thread(target=call, args=(BACKGROUND,))]
+        threads[0].start()
+        time.sleep(0.05)
+        threads.append(threading.Thread(target=call, args=(INTERACTIVE,)))
+        threads[1].start()
+        time.sleep(0.05)
+        governor.release(held)
+        for thread in threads:
+            thread.join(timeout=5)
+        self.assertEqual(order, [INTERACTIVE, BACKGROUND])
+    
+    def test_token_bucket_and_analyzer_integration(self):
+        """
+        Token kovasının çağrı hızını sınırladığını ve AIAnalyzer'ın izin alıp bıraktığını test eder.
+        """
+        from app.utils.gemini_governor import GeminiGovernor
+        governor = GeminiGovernor(rate=20, burst=1)
+        analyzer = AIAnalyzer(model=mock.Mock(), cache=LLMCache(), governor=governor)
+        analyzer.model.generate_content.return_value = mock.Mock(text='ok')
+        
+        start = time.monotonic()
+        for index in range(3):
+            self.assertEqual(analyzer._generate_text(f"istem {index}"), 'ok')
+        self.assertGreaterEqual(time.monotonic() - start, 0.09, "Token kovası hızı sınırlamadı.")
+        self.assertEqual(governor._backend._in_flight, 0, "İzin bırakılmadı.")
+    
+    def test_backend_tried_outside_queue_lock(self):
+        """
+        İzin denemesinin kuyruk kilidi tutulmadan yapıldığını; paylaşımlı kullanımda
+        acquire_async'in denemeyi olay döngüsü thread'i dışında yaptığını test eder.
+        """
+        import asyncio
+        import tempfile
+        from app.utils.gemini_governor import GeminiGovernor
+        with tempfile.TemporaryDirectory() as directory:
+            governor = GeminiGovernor(max_in_flight=1, timeout=1, directory=directory)
+            try_acquire = governor._backend.try_acquire
+            calls = []
+            
+            def probe():
+                # Başka bir thread kuyruk kilidini hemen alabilmeli
+                outcome = []
+                
+                def check():
+                    locked = governor._condition.acquire(timeout=0.5)
+                    if locked:
+                        governor._condition.release()
+                    outcome.append(locked)
+                
+                checker = threading.Thread(target=check)
+                checker.start()
+                checker.join()
+                calls.append((outcome[0], threading.current_thread().name))
+                return try_acquire()
+            
+            async def acquire_on_loop():
+                return threading.current_thread().name, await governor.acquire_async()
+            
+            with mock.patch.object(governor._backend, 'try_acquire', side_effect=probe):
+                governor.release(governor.acquire())
+                loop_thread, permit = asyncio.run(acquire_on_loop())
+                governor.release(permit)
+        
+        self.assertTrue(all(unlocked for unlocked, _ in calls), "İzin denemesi kuyruk kilidi altında yapıldı.")
+        self.assertEqual(calls[0][1], threading.current_thread().name)
+        self.assertNotEqual(calls[1][1], loop_thread, "Dosya kilidi olay döngüsünü durdurdu.")
+    
+    def test_async_acquire_waits_on_event_loop(self):
+        """
+        acquire_async'in izni thread tutmadan olay döngüsünde beklediğini, süre dolunca
+        GovernorTimeout fırlattığını ve kuyruktan çıktığını test eder.
+        """
+        import asyncio
+        from app.utils.gemini_governor import GeminiGovernor, GovernorTimeout
+        governor = GeminiGovernor(max_in_flight=1, timeout=5)
+        held = governor.acquire()
+        
+        async def scenario():
+            waiters = [asyncio.ensure_future(governor.acquire_async()) for _ in range(3)]
+            await asyncio.sleep(0.1)
+            self.assertEqual(threading.active_count(), threads_before)
+            self.assertEqual(len(governor._waiters), 3)
+            governor.release(held)
+            for waiter in waiters:
+                governor.release(await waiter)
+            with self.assertRaises(GovernorTimeout):
+                blocked = governor.acquire()
+                try:
+                    await governor.acquire_async(timeout=0.1)
+                finally:
+                    governor.release(blocked)
+        
+        threads_before = threading.active_count()
+        asyncio.run(scenario())
+        self.assertEqual(governor._waiters, [])
+        self.assertEqual(governor._backend._in_flight, 0)
+
+class TestPromptBudget(unittest.TestCase):
+    """
+    İstem bütçesine göre transkript sıkıştırmayı test eden birim testleri.
+    """
+    
+    def setUp(self):
+        monologue = " ".join(["we use the past simple for finished actions"] * 12)
+        lines = []
+        for index in range(30):
+            lines.append(f"Teacher: {monologue}")
+            lines.append("Student: um, okay")
+        lines.insert(25, "Student: yesterday I go to the museum with my cousin")
+        lines.insert(40, "Student: what does itinerary mean?")
+        self.all_text = "\n".join(lines)
+    
+    def test_keeps_informative_student_turns_within_budget(self):
+        """
+        Sıkıştırmanın bütçeye uyduğunu, öğrenci hatalarını/sorularını koruduğunu ve
+        dolgu konuşmalarını attığını test eder.
+        """
+        from app.utils.prompt_budget import compress_transcript, estimate_tokens
+        compressed, stats = compress_transcript(self.all_text, 150)
+        
+        self.assertLessEqual(estimate_tokens(compressed), 150)
+        self.assertIn("Student: yesterday I go to the museum with my cousin", compressed)
+        self.assertIn("Student: what does itinerary mean?", compressed)
+        self.assertNotIn("um, okay", compressed)
+        self.assertLess(stats['ratio'], 0.2)
+        self.assertEqual(stats['total'], 62)
+    
+    def test_article_pattern_skips_consonant_sound_words(self):
+        """
+        "a" + ünlü kalıbının doğru İngilizceyi ("a university", "a user") hata saymadığını test eder.
+        """
+        from app.utils.prompt_budget import _ERROR_PATTERNS
+        for text in ("I study at a university", "she is a user", "a one-way ticket", "a euro", "a useful tip"):
+            self.assertIsNone(_ERROR_PATTERNS.search(text), text)
+        for text in ("I ate a apple", "it was a umbrella", "a idea", "a orange"):
+            self.assertIsNotNone(_ERROR_PATTERNS.search(text), text)
+    
+    def test_analyzer_uses_budget_instead_of_truncation(self):
+        """
+        GEMINI_PROMPT_BUDGET_TOKENS verildiğinde istemin ilk 8000 karakter yerine sıkıştırılmış
+        transkripti içerdiğini test eder.
+        """
+        analyzer = AIAnalyzer(model=mock.Mock(), cache=LLMCache())
+        analyzer.model.generate_content.return_value = mock.Mock(text='{"seviye": "B1"}')
+        transcript = {'speakers': {}, 'speaker_counts': {}, 'all_text': self.all_text}
+        
+        with mock.patch.dict(os.environ, {'GEMINI_PROMPT_BUDGET_TOKENS': '200'}):
+            analyzer.analyze_zoom_transcript(transcript)
+        prompt = analyzer.model.generate_content.call_args[0][0]
+        self.assertIn("what does itinerary mean?", prompt)
+        self.assertIn("[...]", prompt)
+        self.assertLess(len(prompt), 8000)
+
+class TestLessonWebhook(unittest.TestCase):
+    """
+    Ders bitiş bildirimiyle egzersiz ön üretimini ve kalıcı depoyu test eden birim testleri.
+    """
+    
+    def setUp(self):
+        import tempfile
+        from app.utils.exercise_store import ExerciseStore
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.store = ExerciseStore(os.path.join(directory.name, 'exercises.db'), ttl=60)
+        patcher = mock.patch.object(exercise_pipeline, '_exercise_store', self.store)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+    
+    def test_store_round_trip_and_expiry(self):
+        """
+        Deponun egzersizi saklayıp döndürdüğünü ve süresi dolan kaydı sildiğini test eder.
+        """
+        exercise = {'analysis': 'B1', 'tests': [{'question': 'Soru?'}]}
+        self.store.set('key', 'report', exercise)
+        self.assertEqual(self.store.get('key'), exercise)
+        
+        with mock.patch('app.utils.exercise_store.time.time', return_value=time.time() + 120):
+            self.assertIsNone(self.store.get('key'), "Süresi dolan kayıt döndürüldü.")
+        self.assertIsNone(self.store.get('key'))
+    
+    def test_periodic_purge_counts_writes_from_all_threads(self):
+        """
+        Birçok thread'den yapılan yazmaların sayılıp her 100 yazmada bir temizlik yapıldığını test eder.
+        """
+        with mock.patch.object(self.store, 'purge_expired') as purge:
+            threads = [threading.Thread(target=lambda n=n: [self.store.set(f'key-{n}-{i}', 'report', {'i': i})
+                                                            for i in range(25)]) for n in range(8)]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join(10)
+        self.assertEqual(purge.call_count, 2)
+    
+    def test_webhook_pregenerates_exercise_for_later_lookup(self):
+        """
+        İmzalı bildirimin egzersizi arka planda ürettiğini, imzasız bildirimin reddedildiğini ve
+        sonraki GET isteğinin pipeline'ı çalıştırmadan depodan yanıtlandığını test eder.
+        """
+        import hmac
+        import hashlib
+        from app import app
+        client = app.test_client()
+        exercise = {'analysis': 'B1', 'tests': [{'question': 'Soru?'}]}
+        body = json.dumps({'auth_token': 'token', 'flai_report': 'webhook-report'}).encode('utf-8')
+        signature = hmac.new(b'secret', body, hashlib.sha256).hexdigest()
+        
+        with mock.patch.dict(os.environ, {'LESSON_WEBHOOK_SECRET': 'secret'}), \
+             mock.patch.object(exercise_pipeline, 'generate_exercise', return_value=exercise) as generate:
+            rejected = client.post('/api/webhooks/lesson-ended', data=body, content_type='application/json',
+                                   headers={'X-Flalingo-Signature': 'sha256=' + '0' * 64})
+            self.assertEqual(rejected.status_code, 401)
+            
+            response = client.post('/api/webhooks/lesson-ended', data=body, content_type='application/json',
+                                   headers={'X-Flalingo-Signature': 'sha256=' + signature})
+            self.assertEqual(response.status_code, 202)
+            job_url = response.get_json()['data']['status_url']
+            for _ in range(100):
+                if client.get(job_url).get_json()['data']['status'] == 'completed':
+                    break
+                time.sleep(0.02)
+            
+            # Başka bir worker: bellek önbelleği boş, depo dolu
+            exercise_pipeline._exercise_cache.delete(exercise_pipeline._exercise_key('token', 'webhook-report'))
+            result = client.get('/api/flai-exercise?auth_token=token&flai_report=webhook-report')
+        
+        self.assertEqual(result.get_json()['data'], exercise)
+        self.assertEqual(generate.call_count, 1, "Egzersiz depodan değil yeniden üretildi.")
+    
+    def test_webhook_fails_closed_and_skips_fallback(self):
+        """
+        Gizli anahtar veya depo yoksa bildirimin reddedildiğini, örnek sorularla biten
+        ön üretimin ise saklanmayıp iş olarak başarısız sayıldığını test eder.
+        """
+        import hmac
+        import hashlib
+        from app import app
+        client = app.test_client()
+        body = json.dumps({'auth_token': 'token', 'flai_report': 'fallback-webhook'}).encode('utf-8')
+        headers = {'X-Flalingo-Signature': hmac.new(b'secret', body, hashlib.sha256).hexdigest()}
+        
+        with mock.patch.dict(os.environ, {'LESSON_WEBHOOK_SECRET': ''}):
+            response = client.post('/api/webhooks/lesson-ended', data=body, content_type='application/json',
+                                   headers=headers)
+            self.assertEqual(response.status_code, 503, "Gizli anahtar olmadan bildirim kabul edildi.")
+        with mock.patch.dict(os.environ, {'LESSON_WEBHOOK_SECRET': 'secret'}), \
+             mock.patch.object(exercise_pipeline, '_exercise_store', None):
+            response = client.post('/api/webhooks/lesson-ended', data=body, content_type='application/json',
+                                   headers=headers)
+            self.assertEqual(response.status_code, 503, "Depo olmadan bildirim kabul edildi.")
+        
+        fallback = {'analysis': '', 'tests': [], 'fallback': True}
+        with mock.patch.dict(os.environ, {'LESSON_WEBHOOK_SECRET': 'secret'}), \
+             mock.patch.object(exercise_pipeline, 'generate_exercise', return_value=fallback):
+            response = client.post('/api/webhooks/lesson-ended', data=body, content_type='application/json',
+                                   headers=headers)
+            self.assertEqual(response.status_code, 202)
+            job_url = response.get_json()['data']['status_url']
+            for _ in range(100):
+                job = client.get(job_url).get_json()['data']
+                if job['status'] in ('completed', 'failed'):
+                    break
+                time.sleep(0.02)
+        
+        self.assertEqual(job['status'], 'failed')
+        self.assertIsNone(self.store.get(exercise_pipeline._exercise_key('token', 'fallback-webhook')))
+
+class TestBatchExercise(unittest.TestCase):
+    """
+    Toplu egzersiz uç noktasını (NDJSON akışı) test eden birim testleri.
+    """
+    
+    def test_batch_streams_one_line_per_report_and_summary(self):
+        """
+        Her rapor için bir satır, tekrarlanan raporlar için tek üretim ve
+        sonda özet satırı döndürüldüğünü test eder.
+        """
+        from app import app
+        client = app.test_client()
+        
+        def generate(auth_token, flai_report, progress=None):
+            if flai_report == 'batch-missing':
+                raise exercise_pipeline.PipelineError('Transkript bulunamadı', 404)
+            return {'analysis': flai_report, 'tests': []}
+        
+        with mock.patch.object(exercise_pipeline, '_exercise_store', None), \
+             mock.patch.object(exercise_pipeline, 'generate_exercise', side_effect=generate) as generate_mock:
+            response = client.post('/api/flai-exercise/batch', json={
+                'auth_token': 'token',
+                'flai_reports': ['batch-a', 'batch-b', 'batch-a', 'batch-missing']
+            })
+            lines = [json.loads(line) for line in response.get_data(as_text=True).splitlines()]
+        
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.mimetype, 'application/x-ndjson')
+        self.assertEqual(generate_mock.call_count, 3, "Tekrarlanan rapor yeniden üretildi.")
+        results = {line['flai_report']: line for line in lines[:-1]}
+        self.assertEqual(set(results), {'batch-a', 'batch-b', 'batch-missing'})
+        self.assertEqual(results['batch-a']['data']['analysis'], 'batch-a')
+        self.assertFalse(results['batch-missing']['success'])
+        self.assertEqual(results['batch-missing']['status_code'], 404)
+        self.assertEqual(lines[-1], {'summary': {'total': 3, 'succeeded': 2, 'failed': 1}})
+    
+    def test_batch_rejects_invalid_requests(self):
+        """
+        Eksik, hatalı veya sınırı aşan istek gövdelerinin reddedildiğini test eder.
+        """
+        from app import app
+        client = app.test_client()
+        self.assertEqual(client.post('/api/flai-exercise/batch', json={'auth_token': 'token'}).status_code, 400)
+        self.assertEqual(client.post('/api/flai-exercise/batch',
+                                     json={'auth_token': 'token', 'flai_reports': [1, 2]}).status_code, 400)
+        with mock.patch.dict(os.environ, {'BATCH_EXERCISE_MAX_REPORTS': '2'}):
+            response = client.post('/api/flai-exercise/batch',
+                                   json={'auth_token': 'token', 'flai_reports': ['a', 'b', 'c']})
+        self.assertEqual(response.status_code, 413)
+
+class TestAsyncPipeline(unittest.TestCase):
+    """
+    Asenkron egzersiz pipeline'ını (aiohttp istemcisi, async Gemini, olay döngüsü) test eden birim testleri.
+    """
+    
+    def test_async_pipeline_matches_sync_pipeline(self):
+        """
+        Asenkron pipeline'ın aynı transkript ve model çıktılarıyla senkron pipeline ile
+        aynı egzersizi ürettiğini test eder.
+        """
+        from app.utils import async_runtime
+        from app.utils.fake_gemini import FakeGenerativeModel
+        transcript = {'gladia_response': [{'speaker': 'Teacher', 'text': 'What did you do yesterday?'},
+                                          {'speaker': 'Student', 'text': 'Yesterday I go to the museum'}]}
+        
+        async def fetch(auth_token, flai_report):
+            return transcript
+        
+        results = []
+        for run in (lambda: exercise_pipeline.generate_exercise('token', 'report'),
+                    lambda: async_runtime.run(exercise_pipeline.generate_exercise_async, 'token', 'report')):
+            analyzer = AIAnalyzer(cache=LLMCache(), model=FakeGenerativeModel(seed=7))
+            with mock.patch.object(exercise_pipeline, '_fetch_transcript', return_value=transcript), \
+                 mock.patch.object(exercise_pipeline, '_fetch_transcript_async', side_effect=fetch), \
+                 mock.patch.object(exercise_pipeline, 'get_analyzer', return_value=analyzer):
+                results.append(run())
+        
+        self.assertTrue(results[0]['tests'])
+        self.assertEqual(results[0], results[1])
+    
+    def test_async_flalingo_client_retries_and_parses_transcript(self):
+        """
+        Asenkron Flalingo istemcisinin 503 yanıtını yeniden denediğini ve transkripti döndürdüğünü test eder.
+        """
+        import asyncio
+        from aiohttp import web
+        from aiohttp.test_utils import TestServer
+        from app.utils.flalingo_service import get_async_session
+        calls = []
+        
+        async def handler(request):
+            calls.append(request.query['flai_report'])
+            if len(calls) == 1:
+                return web.Response(status=503)
+            return web.json_response({'success': True, 'data': {'gladia_response': [
+                {'speaker': 'Student', 'text': 'I visited the museum', 'duration': 1.0}]}})
+        
+        async def scenario():
+            server_app = web.Application()
+            server_app.router.add_get('/api/flai-transcript', handler)
+            async with TestServer(server_app) as server:
+                with mock.patch.dict(os.environ, {'FLALINGO_BACKOFF_BASE': '0.001'}):
+                    service = FlalingoService(base_url=str(server.make_url('/api')),
+                                              breaker=CircuitBreaker('async-test', failure_threshold=5, reset_timeout=60))
+                try:
+                    with mock.patch.object(service, '_generate_questions', return_value={'multiple_choice': []}) as generate:
+                        return await service.get_transcript_async('token', 'async-report'), generate
+                finally:
+                    await get_async_session().close()
+        
+        result, generate = asyncio.run(scenario())
+        self.assertEqual(result, {'success': True, 'data': {'questions': {'multiple_choice': []}}})
+        self.assertEqual(generate.call_args[0][0]['gladia_response'][0]['text'], 'I visited the museum')
+        self.assertEqual(calls, ['async-report', 'async-report'])
+    
+    def test_batch_runs_reports_concurrently_on_event_loop(self):
+        """
+        EXERCISE_ASYNC_PIPELINE=1 iken toplu isteğin raporları thread havuzu boyutundan
+        fazla sayıda aynı anda, tek olay döngüsü thread'inde ürettiğini test eder.
+        """
+        import asyncio
+        active, peak, threads = [0], [0], set()
+        
+        async def generate(auth_token, flai_report, progress=None):
+            threads.add(threading.current_thread().name)
+            active[0] += 1
+            peak[0] = max(peak[0], active[0])
+            await asyncio.sleep(0.05)
+            active[0] -= 1
+            return {'analysis': flai_report, 'tests': []}
+        
+        reports = [f'async-batch-{index}' for index in range(20)]
+        with mock.patch.dict(os.environ, {'EXERCISE_ASYNC_PIPELINE': '1', 'BATCH_EXERCISE_WORKERS': '4'}), \
+             mock.patch.object(exercise_pipeline, '_exercise_store', None), \
+             mock.patch.object(exercise_pipeline, 'generate_exercise_async', side_effect=generate):
+            results = list(exercise_pipeline.generate_exercises('token', reports))
+        
+        self.assertEqual(sorted(result['flai_report'] for result in results), sorted(reports))
+        self.assertTrue(all(result['success'] for result in results))
+        self.assertEqual(threads, {'async-pipeline'})
+        self.assertEqual(peak[0], len(reports))
+    
+    def test_cancelled_submit_future_notifies_waiters(self):
+        """
+        async_runtime.submit ile alınan Future iptal edildiğinde as_completed bekleyenlerine
+        bildirildiğini test eder.
+        """
+        import asyncio
+        from concurrent.futures import as_completed
+        from app.utils import async_runtime
+        
+        async def slow():
+            await asyncio.sleep(0.2)
+            return 'slow'
+        
+        async def fast():
+            return 'fast'
+        
+        cancelled = async_runtime.submit(slow)
+        cancelled.cancel()
+        done = async_runtime.submit(fast)
+        finished = list(as_completed([cancelled, done], timeout=5))
+        self.assertEqual(len(finished), 2)
+        self.assertTrue(cancelled.cancelled())
+        self.assertEqual(done.result(), 'fast')
+
+class TestBenchmarkSuite(unittest.TestCase):
+    """
+    benchmarks/run_suite.py gerileme karşılaştırmasını (--compare/--threshold) test eden birim testleri.
+    """
+    
+    def setUp(self):
+        # run_suite içe aktarılırken LLM_CACHE_ENABLED=0 yazar; diğer testler etkilenmesin
+        with mock.patch.dict(os.environ):
+            from benchmarks import run_suite
+        self.run_suite = run_suite
+        self.baseline = {
+            'process_transcript': {'100': {'median_s': 0.010}, '1000': {'median_s': 0.100}},
+            'process_tests': {'fenced': {'median_s': 0.002}, 'prose': {'median_s': 0.0}}
+        }
+    
+    def test_compare_lists_only_slowdowns_over_threshold(self):
+        """
+        Yalnızca eşikten fazla yavaşlayan ölçümlerin listelendiğini; baseline'da olmayan veya
+        sıfır süreli ölçümlerin atlandığını test eder.
+        """
+        results = {
+            'process_transcript': {'100': {'median_s': 0.013}, '1000': {'median_s': 0.115}},
+            'process_tests': {'fenced': {'median_s': 0.001}, 'prose': {'median_s': 0.5},
+                              'truncated': {'median_s': 0.5}}
+        }
+        regressions = self.run_suite.compare(results, self.baseline, threshold=0.2)
+        self.assertEqual(regressions, [{'suite': 'process_transcript', 'case': '100', 'ratio': 1.3,
+                                        'median_s': 0.013, 'baseline_median_s': 0.010}])
+        self.assertEqual(len(self.run_suite.compare(results, self.baseline, threshold=0.1)), 2)
+    
+    def test_main_exits_with_1_on_regression(self):
+        """
+        --compare verildiğinde gerileme varsa betiğin 1 çıkış koduyla bittiğini, yoksa normal
+        bittiğini ve raporda gerilemelerin yer aldığını test eder.
+        """
+        import logging
+        import tempfile
+        
+        def run(median):
+            timings = {'100': {'median_s': median}, '1000': {'median_s': 0.100}}
+            with tempfile.TemporaryDirectory() as directory:
+                baseline_path = os.path.join(directory, 'baseline.json')
+                output_path = os.path.join(directory, 'results.json')
+                with open(baseline_path, 'w', encoding='utf-8') as f:
+                    json.dump({'benchmark': 'suite', 'results': {'commit': 'abc1234', 'suites': self.baseline}}, f)
+                argv = ['run_suite', '--compare', baseline_path, '--threshold', '0.2', '--output', output_path]
+                with mock.patch('sys.argv', argv), \
+                     mock.patch('builtins.print'), \
+                     mock.patch.object(self.run_suite, 'bench_process_transcript', return_value=timings), \
+                     mock.patch.object(self.run_suite, 'bench_process_tests', return_value={}), \
+                     mock.patch.object(self.run_suite, 'bench_get_exercise', return_value={}), \
+                     mock.patch.object(self.run_suite, 'bench_prompt_budget', return_value={}):
+                    try:
+                        self.run_suite.main()
+                        code = 0
+                    except SystemExit as e:
+                        code = e.code
+                    finally:
+                        logging.disable(logging.NOTSET)
+                with open(output_path, encoding='utf-8') as f:
+                    return code, json.load(f)['results']
+        
+        code, report = run(0.011)
+        self.assertEqual((code, report['regressions'], report['compared_to']), (0, [], 'abc1234'))
+        code, report = run(0.030)
+        self.assertEqual(code, 1)
+        self.assertEqual([(r['suite'], r['case'], r['ratio']) for r in report['regressions']],
+                         [('process_transcript', '100', 3.0)])
+
+class TestGunicornConfig(unittest.TestCase):
+    """
+    gunicorn.conf.py üretim yapılandırmasını test eden birim testleri.
+    """
+    
+    def test_config_reads_environment_and_warms_up_after_fork(self):
+        """
+        Worker/thread sayılarının ortamdan okunduğunu, uygulamanın önceden yüklendiğini ve
+        Gemini ısınmasının yalnızca GEMINI_WARMUP=1 ile, post_fork'ta yapıldığını test eder.
+        """
+        import runpy
+        path = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'gunicorn.conf.py')
+        with mock.patch.dict(os.environ, {'GUNICORN_WORKERS': '3', 'GUNICORN_THREADS': '24',
+                                          'GEMINI_WARMUP': '1', 'GEMINI_FAKE': '0'}):
+            config = runpy.run_path(path)
+        
+        self.assertEqual((config['workers'], config['threads'], config['worker_class']), (3, 24, 'gthread'))
+        with mock.patch.dict(os.environ, {'GEMINI_FAKE': '1', 'GEMINI_WARMUP': '1'}):
+            self.assertFalse(runpy.run_path(path)['_warm_up'], "Sahte modelle ısınma yapıldı.")
+        with mock.patch.dict(os.environ):
+            os.environ.pop('GUNICORN_WORKERS', None)
+            os.environ.pop('GEMINI_WARMUP', None)
+            defaults = runpy.run_path(path)
+            self.assertEqual(defaults['workers'], 1, "Birden fazla worker varsayılan olarak açıldı.")
+            self.assertFalse(defaults['_warm_up'], "Isınma varsayılan olarak açık.")
+        self.assertTrue(config['preload_app'])
+        self.assertGreater(config['keepalive'], 60)
+        with mock.patch('app.utils.ai_analyzer.warm_up_analyzer') as warm_up:
+            config['post_fork'](None, None)
+            for _ in range(100):
+                if warm_up.called:
+                    break
+                time.sleep(0.01)
+        warm_up.assert_called_once_with()
+
+class TestLazyImports(unittest.TestCase):
+    """
+    Açılışta ağır modüllerin yüklenmediğini test eden birim testleri.
+    """
+    
+    def test_app_import_does_not_load_gemini_sdk(self):
+        """
+        Uygulamanın içe aktarılmasının ve sağlık kontrolünün google.generativeai'yi yüklemediğini,
+        modülün yalnızca gerçek model oluşturulurken yüklendiğini test eder.
+        """
+        import sys
+        import subprocess
+        probe = (
+            "import sys, app\n"
+            "assert app.app.test_client().get('/api/health').status_code == 200\n"
+            "print('google.generativeai' in sys.modules)\n"
+            "from app.utils.ai_analyzer import AIAnalyzer\n"
+            "AIAnalyzer()\n"
+            "print('google.generativeai' in sys.modules)\n"
+        )
+        env = dict(os.environ, GEMINI_API_KEY='test-key', GEMINI_FAKE='0', GEMINI_WARMUP='0', LOG_LEVEL='WARNING')
+        output = subprocess.run([sys.executable, '-c', probe], env=env, check=True, capture_output=True, text=True,
+                                cwd=os.path.dirname(os.path.abspath(__file__))).stdout.split()
+        self.assertEqual(output[-2:], ['False', 'True'])
+
 if __name__ == '__main__':
-    unittest.main() 
\ No newline at end of file
+    unittest.main() 